@@ -2,37 +2,44 @@
 """
 Single script:
 1. Create Players_TransferPortal table
-2. Fetch & insert 2025 portal data
-3. Enrich with Players_Basic (optional)
-4. Add originLogo & destinationLogo from Teams (school name → logo_main)
+2. Fetch portal data
+3. Resolve origin & destination to Teams.id (Team_Aliases) and their logos
    → BOTH origin & destination use same logic
+4. Enrich with Players_Basic through a name index partitioned by (teamID, season)
+5. Upsert the entries that are new or changed, in one pass over the payload
 """
 
-import sqlite3
+import sys
 import os
+import time
 import requests
-import re
 from pathlib import Path
 from dotenv import load_dotenv
-from fuzzywuzzy import fuzz
+
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from pipeline.config import DB_FILE
+from pipeline.db import connect
+from pipeline.names import build_name_index, match_names
+from pipeline.teams import load_team_index, resolve_team
 
 # Load environment
 load_dotenv()
 API_KEY = os.getenv("API_KEY", "xPVVHT3+7AMkH/gk2Rbnpin03CxVlm6HyGgL2yNiPL1riWLPRUQGS5nE1AXEBMmV")
 YEAR = int(os.getenv("YEAR", 2025))
-DB_FILE = Path("/Users/christianberry/Desktop/Perennial Data/perennial-data-app/server/data/db/cfb_database.db")
-
-# -----------------------------------------------------------------------
-# Helper: Normalize string
-# -----------------------------------------------------------------------
-def normalize(s):
-    return re.sub(r'[^a-z0-9]', '', str(s).lower().strip()) if s else ""
 
-def clean_name(s):
-    return re.sub(r'\b(jr|sr|ii|iii|iv)\b', '', s, flags=re.I).strip()
+PORTAL_COLUMNS = ["season", "name", "position", "origin", "destination", "transferDate", "rating", "stars",
+                  "eligibility"]
+BASIC_COLUMNS = ["playerId", "team", "school", "teamID", "height", "weight",
+                 "homeCity", "homeState", "homeCountry", "homeProvince",
+                 "homeLatitude", "homeLongitude", "jersey", "redshirt",
+                 "player_id_PFF", "headshotURL"]
+LOGO_COLUMNS = ["originLogo", "destinationLogo"]
+ROW_COLUMNS = PORTAL_COLUMNS + BASIC_COLUMNS + LOGO_COLUMNS
 
 # Connect
-conn = sqlite3.connect(DB_FILE)
+conn = connect(DB_FILE, bulk=False)
 cursor = conn.cursor()
 
 # -----------------------------------------------------------------------
@@ -98,243 +105,99 @@ if not portal_data:
     conn.close()
     exit(0)
 
-# -----------------------------------------------------------------------
-# 3. Insert portal data
-# -----------------------------------------------------------------------
-insert_portal_sql = """
-INSERT OR IGNORE INTO Players_TransferPortal 
-(season, name, position, origin, destination, transferDate, rating, stars, eligibility)
-VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-"""
-
-portal_values = []
-for p in portal_data:
-    first = p.get("firstName", "").strip()
-    last = p.get("lastName", "").strip()
-    name = f"{first} {last}".strip()
-    if not name:
-        continue
-    portal_values.append((
-        p.get("season"),
-        name,
-        p.get("position"),
-        p.get("origin"),
-        p.get("destination"),
-        p.get("transferDate"),
-        p.get("rating"),
-        p.get("stars"),
-        p.get("eligibility")
-    ))
-
-if portal_values:
-    print(f"Inserting {len(portal_values)} portal records...")
-    cursor.executemany(insert_portal_sql, portal_values)
-    conn.commit()
-    print(f"Inserted {cursor.rowcount} new portal records.")
-else:
-    print("No valid portal records to insert.")
+start = time.time()
 
 # -----------------------------------------------------------------------
-# 4. Load Teams for logos (school → logo_main)
+# 3. Team identity and logos (teamID → logo_main)
 # -----------------------------------------------------------------------
-print("Loading Teams for logo lookup...")
-cursor.execute("SELECT school, logo_main FROM Teams WHERE year = ?", (YEAR,))
-teams_rows = cursor.fetchall()
-
-team_logo_by_school = {}
-for school, logo in teams_rows:
-    if school:
-        key = normalize(school)
-        team_logo_by_school[key] = logo
-        print(f"Logo mapped: {school} → {key} → {logo}")  # DEBUG
+print("Loading team aliases and logos...")
+team_index = load_team_index(cursor)
+cursor.execute("SELECT id, logo_main FROM Teams WHERE year = ?", (YEAR,))
+team_logo_by_id = dict(cursor.fetchall())
 
 # -----------------------------------------------------------------------
-# 5. Load Players_Basic for metadata (optional)
+# 4. Name index over Players_Basic, partitioned by (teamID, season)
 # -----------------------------------------------------------------------
-print("Loading Players_Basic for metadata enrichment...")
-cursor.execute("""
-SELECT playerId, year, name, team, school, teamID, position, height, weight,
-       homeCity, homeState, homeCountry, homeProvince,
-       homeLatitude, homeLongitude, jersey, redshirt,
-       player_id_PFF, headshotURL
+print("Indexing Players_Basic names for metadata enrichment...")
+cursor.execute(f"""
+SELECT year, name, position, {', '.join(BASIC_COLUMNS)}
 FROM Players_Basic
 WHERE year IN (?, ?)
 """, (YEAR, YEAR - 1))
 
-basic_rows = cursor.fetchall()
-print(f"Loaded {len(basic_rows)} Players_Basic rows.")
+basic_entries = []
+for year, name, position, *basic in cursor.fetchall():
+    player = dict(zip(BASIC_COLUMNS, basic), position=position)
+    team_id = player["teamID"] if player["teamID"] is not None else resolve_team(team_index, player["school"])
+    if name and team_id is not None:
+        basic_entries.append(((team_id, year), name, player))
+name_index = build_name_index(basic_entries)
+print(f"  ✓ Indexed {len(basic_entries):,} Players_Basic rows into {len(name_index['partitions'])} team-seasons")
 
 # -----------------------------------------------------------------------
-# 6. Fuzzy match Players_Basic
+# 5. One pass over the payload: resolve teams, match players, build rows
 # -----------------------------------------------------------------------
-basic_by_school = {YEAR: {}, YEAR - 1: {}}
-for row in basic_rows:
-    (
-        playerId, y, name, team, school, teamID, pos, height, weight,
-        homeCity, homeState, homeCountry, homeProvince,
-        homeLat, homeLng, jersey, redshirt, pff_id, headshot
-    ) = row
-
-    if not name or not school:
+entries, queries = [], []
+for p in portal_data:
+    first = (p.get("firstName") or "").strip()
+    last = (p.get("lastName") or "").strip()
+    name = f"{first} {last}".strip()
+    if not name:
         continue
-
-    n_school = normalize(school)
-    clean_n = clean_name(name)
-    n_name = normalize(clean_n)
-
-    year_dict = basic_by_school[y]
-    school_list = year_dict.setdefault(n_school, [])
-    school_list.append((
-        n_name,
-        {
-            "playerId": playerId,
-            "team": team,
-            "school": school,
-            "teamID": teamID,
-            "position": pos,
-            "height": height,
-            "weight": weight,
-            "homeCity": homeCity,
-            "homeState": homeState,
-            "homeCountry": homeCountry,
-            "homeProvince": homeProvince,
-            "homeLatitude": homeLat,
-            "homeLongitude": homeLng,
-            "jersey": jersey,
-            "redshirt": redshirt,
-            "player_id_PFF": pff_id,
-            "headshotURL": headshot
-        }
-    ))
-
-# -----------------------------------------------------------------------
-# 7. Enrich: Players_Basic + Logos (both from school name)
-# -----------------------------------------------------------------------
-print("Starting enrichment with Players_Basic + Team Logos...")
-cursor.execute("""
-SELECT id, name, origin, destination, season
-FROM Players_TransferPortal 
-WHERE season = ?
-""", (YEAR,))
-
-to_enrich = cursor.fetchall()
-print(f"Found {len(to_enrich)} portal entries to enrich.")
-
-update_sql = """
-UPDATE Players_TransferPortal
-SET
-    playerId = ?, team = ?, school = ?, teamID = ?, position = ?, height = ?, weight = ?,
-    homeCity = ?, homeState = ?, homeCountry = ?, homeProvince = ?,
-    homeLatitude = ?, homeLongitude = ?, jersey = ?, redshirt = ?,
-    player_id_PFF = ?, headshotURL = ?,
-    originLogo = ?, destinationLogo = ?
-WHERE id = ?
-"""
-
-updates = []
-match_count = 0
-miss_count = 0
-
-for pid, p_name, origin, dest, season in to_enrich:
-    clean_p = clean_name(p_name)
-    n_p_name = normalize(clean_p)
-    match = None
-    match_score = 0
-
-    # CASE 1: destination → current year
-    if dest:
-        n_dest = normalize(dest)
-        candidates = basic_by_school.get(season, {}).get(n_dest, [])
-        for n_name, data in candidates:
-            score = fuzz.ratio(n_p_name, n_name)
-            if score >= 90 and score > match_score:
-                match = data
-                match_score = score
-            elif score >= 80 and score > match_score and not match:
-                match = data
-                match_score = score
-
-    # CASE 2: no destination → origin + prev year
-    if not match and origin:
-        prev_year = season - 1
-        n_origin = normalize(origin)
-        candidates = basic_by_school.get(prev_year, {}).get(n_origin, [])
-        for n_name, data in candidates:
-            score = fuzz.ratio(n_p_name, n_name)
-            if score >= 90 and score > match_score:
-                match = data
-                match_score = score
-            elif score >= 80 and score > match_score and not match:
-                match = data
-                match_score = score
-
-    # Resolve logos — SAME LOGIC FOR BOTH
-    origin_key = normalize(origin)
-    dest_key = normalize(dest)
-
-    origin_logo = team_logo_by_school.get(origin_key)
-    destination_logo = team_logo_by_school.get(dest_key)
-
-    print(f"LOGO LOOKUP: origin='{origin}' → '{origin_key}' → {origin_logo}")
-    print(f"LOGO LOOKUP: dest='{dest}' → '{dest_key}' → {destination_logo}")
-
+    season = p.get("season") or YEAR
+    origin_id = resolve_team(team_index, p.get("origin"))
+    destination_id = resolve_team(team_index, p.get("destination"))
+    entries.append((p, name, season, origin_id, destination_id))
+    # Destination roster of this season first, then origin roster of the season before
+    queries.append(([(destination_id, season), (origin_id, season - 1)], name))
+
+matches = match_names(name_index, queries)
+
+rows = []
+match_count = logo_count = 0
+for (p, name, season, origin_id, destination_id), (match, _) in zip(entries, matches):
+    portal = [season, name, p.get("position"), p.get("origin"), p.get("destination"), p.get("transferDate"),
+              p.get("rating"), p.get("stars"), p.get("eligibility")]
     if match:
-        updates.append((
-            match["playerId"],
-            match["team"],
-            match["school"],
-            match["teamID"],
-            match["position"],
-            match["height"],
-            match["weight"],
-            match["homeCity"],
-            match["homeState"],
-            match["homeCountry"],
-            match["homeProvince"],
-            match["homeLatitude"],
-            match["homeLongitude"],
-            match["jersey"],
-            match["redshirt"],
-            match["player_id_PFF"],
-            match["headshotURL"],
-            origin_logo,
-            destination_logo,
-            pid
-        ))
+        portal[2] = match["position"]
         match_count += 1
-    else:
-        updates.append((
-            None, None, None, None, None, None, None,
-            None, None, None, None, None, None, None, None,
-            None, None,
-            origin_logo, destination_logo,
-            pid
-        ))
-        miss_count += 1
-
-# -----------------------------------------------------------------------
-# 8. Apply updates
-# -----------------------------------------------------------------------
-if updates:
-    print(f"Updating {len(updates)} records with metadata + logos...")
-    cursor.executemany(update_sql, updates)
-    conn.commit()
-    print(f"Updated {cursor.rowcount} rows.")
-else:
-    print("No updates needed.")
+    logos = (team_logo_by_id.get(origin_id), team_logo_by_id.get(destination_id))
+    logo_count += any(logos)
+    rows.append(tuple(portal) + tuple(match[col] if match else None for col in BASIC_COLUMNS) + logos)
+
+# -----------------------------------------------------------------------
+# 6. Apply upserts
+# -----------------------------------------------------------------------
+# Unchanged entries fail the WHERE and are not rewritten, so refreshes during the portal windows only
+# touch the rows whose payload or enrichment actually moved
+updated = [col for col in ROW_COLUMNS if col not in ("season", "name", "origin")]
+upsert_sql = f"""
+INSERT INTO Players_TransferPortal ({', '.join(ROW_COLUMNS)})
+VALUES ({', '.join('?' * len(ROW_COLUMNS))})
+ON CONFLICT(season, name, origin) DO UPDATE SET
+    {', '.join(f'{col} = excluded.{col}' for col in updated)}
+WHERE ({', '.join(updated)}) IS NOT ({', '.join(f'excluded.{col}' for col in updated)})
+"""
+print(f"Upserting {len(rows)} portal records...")
+changes_before = conn.total_changes
+cursor.executemany(upsert_sql, rows)
+conn.commit()
+written = conn.total_changes - changes_before
 
 # -----------------------------------------------------------------------
-# 9. Final Summary
+# 7. Final Summary
 # -----------------------------------------------------------------------
 print("\n" + "="*60)
 print("TRANSFER PORTAL + LOGOS COMPLETE")
 print("="*60)
 print(f"Year: {YEAR}")
 print(f"Portal Records: {len(portal_data)}")
-print(f"Inserted: {len(portal_values) if 'portal_values' in locals() else 0}")
+print(f"Written (new or changed): {written}")
+print(f"Unchanged: {len(rows) - written}")
 print(f"Matched (player): {match_count}")
-print(f"Logos Added: {len([u for u in updates if u[-3] or u[-2]])}")
+print(f"Logos Added: {logo_count}")
+print(f"Time: {time.time() - start:.2f}s")
 print("="*60)
 
 conn.close()
-print("Done. Table ready: Players_TransferPortal (with originLogo + destinationLogo)")
\ No newline at end of file
+print("Done. Table ready: Players_TransferPortal (with originLogo + destinationLogo)")
@@ -0,0 +1,40 @@
+import os
+import sys
+import shutil
+import argparse
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from pipeline.config import DB_FILE
+
+WEEKLY_LOADER = SCRIPTS_DIR / "populate" / "populate_pff_weekly.py"
+
+
+def timed_rebuild(db_copy, reports, bulk):
+    """Run a --full weekly rebuild against db_copy; returns wall-clock seconds."""
+    env = dict(os.environ, CFB_DB_FILE=str(db_copy))
+    cmd = [sys.executable, str(WEEKLY_LOADER), *reports, "--full"] + ([] if bulk else ["--no-bulk"])
+    start = time.time()
+    subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL)
+    return time.time() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time a full weekly rebuild with and without the bulk-load session.")
+    parser.add_argument("reports", nargs="*", help="Reports to rebuild (default: all)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for label, bulk in (("default connection", False), ("bulk-load session", True)):
+            db_copy = Path(tmp) / f"{'bulk' if bulk else 'default'}.db"
+            shutil.copy(DB_FILE, db_copy)
+            results[label] = timed_rebuild(db_copy, args.reports, bulk)
+            print(f"  {label:<20} {results[label]:8.1f}s")
+        before, after = results["default connection"], results["bulk-load session"]
+        print(f"  Speedup: {before / after:.2f}x")
@@ -0,0 +1,42 @@
+import sys
+import sqlite3
+import argparse
+from pathlib import Path
+
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipeline import headshots
+from pipeline.headshots import DEFAULT_CONCURRENCY, validate_headshots
+
+
+def timed_run(player_ids, concurrency, refresh=False, conn=None):
+    conn = conn or sqlite3.connect(":memory:")
+    found, stats = validate_headshots(conn.cursor(), player_ids, concurrency=concurrency, stub=True, refresh=refresh)
+    conn.commit()
+    return conn, found, stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Offline headshot validation against the stub CDN: one request at a time (the old loop) vs "
+                    "bounded concurrency, then a rerun served from Headshot_Cache.")
+    parser.add_argument("--players", type=int, default=1000, help="Synthetic roster size")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--latency", type=float, default=headshots.STUB_LATENCY, help="Simulated round-trip in seconds")
+    args = parser.parse_args()
+
+    headshots.STUB_LATENCY = args.latency
+    player_ids = [str(4_000_000 + i) for i in range(args.players)]
+
+    _, sequential, one = timed_run(player_ids, 1)
+    conn, concurrent, many = timed_run(player_ids, args.concurrency)
+    _, cached, rerun = timed_run(player_ids, args.concurrency, conn=conn)
+    assert sequential == concurrent == cached
+
+    print(f"  {'run':<28}{'checked':>10}{'cached':>10}{'seconds':>10}")
+    for label, stats in (("sequential", one), (f"concurrency {args.concurrency}", many), ("rerun (cache)", rerun)):
+        checked = stats['found'] + stats['missing'] + stats['failed']
+        print(f"  {label:<28}{checked:>10}{stats['cached']:>10}{stats['seconds']:>10.2f}")
+    print(f"  Speedup (concurrency {args.concurrency} vs sequential): {one['seconds'] / max(many['seconds'], 1e-6):.1f}x")
+    print(f"  Speedup (rerun vs sequential): {one['seconds'] / max(rerun['seconds'], 1e-6):.0f}x")
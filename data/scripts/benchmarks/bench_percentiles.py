@@ -0,0 +1,84 @@
+import sys
+import shutil
+import sqlite3
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipeline.config import DB_FILE
+from pipeline.db import table_exists
+from pipeline.reports import PERCENTILE_TABLES
+from pipeline.distributions import DISTRIBUTIONS_SOURCE_TABLE
+from pipeline.percentiles import PERCENTILE_MODES, compute_percentiles, percentile_columns
+
+
+def sql_percentiles(cursor, table):
+    """The old per-script loop: a MIN/MAX query and a full-table UPDATE for every (metric, year) pair."""
+    spec = PERCENTILE_TABLES[table]
+    qualifier, threshold, digits, flat_value = spec['qualifier'], spec['threshold'], spec['digits'], spec['flat_value']
+    cursor.execute(f"SELECT DISTINCT year FROM {table}")
+    for year in [row[0] for row in cursor.fetchall()]:
+        for metric, pct_col in percentile_columns(cursor, table):
+            cursor.execute(f"""
+                SELECT MIN({metric}), MAX({metric}) FROM {table}
+                WHERE {metric} IS NOT NULL AND year = {year} AND {qualifier} > {threshold}
+            """)
+            min_value, max_value = cursor.fetchone()
+            if min_value is None or (min_value == max_value and flat_value is None):
+                continue
+            value = (flat_value if min_value == max_value
+                     else f"ROUND(({metric} - {min_value}) * 100.0 / ({max_value} - {min_value}), {digits})")
+            cursor.execute(f"""
+                UPDATE {table} SET {pct_col} = {value}
+                WHERE {metric} IS NOT NULL AND year = {year} AND {qualifier} > {threshold}
+            """)
+
+
+def timed(db_copy, table, compute):
+    conn = sqlite3.connect(db_copy)
+    cursor = conn.cursor()
+    start = time.time()
+    compute(cursor, table)
+    conn.commit()
+    elapsed = time.time() - start
+    conn.close()
+    return elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Time the old per-(metric, year) SQL UPDATE percentiles against the vectorized engine "
+                    "in each percentile mode.")
+    parser.add_argument("tables", nargs="*", help="Tables to time (default: all)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_copy = Path(tmp) / "percentiles.db"
+        shutil.copy(DB_FILE, db_copy)
+        conn = sqlite3.connect(db_copy)
+        cursor = conn.cursor()
+        tables = [table for table in (args.tables or PERCENTILE_TABLES) if table_exists(cursor, table)]
+        # Start from no stored fingerprints, so the first engine pass summarizes every year
+        if table_exists(cursor, DISTRIBUTIONS_SOURCE_TABLE):
+            cursor.execute(f"DELETE FROM {DISTRIBUTIONS_SOURCE_TABLE}")
+            conn.commit()
+        conn.close()
+
+        # Later passes find each year's pool unchanged and read its stats back from Metric_Distributions
+        methods = [("sql update", sql_percentiles)] + [
+            (mode, lambda cursor, table, mode=mode: compute_percentiles(cursor, table, mode)) for mode in PERCENTILE_MODES] + [
+            ("rerun", lambda cursor, table: compute_percentiles(cursor, table, PERCENTILE_MODES[0]))]
+        totals = dict.fromkeys((label for label, _ in methods), 0.0)
+        print(f"  {'table':<40}" + "".join(f"{label:>12}" for label, _ in methods))
+        for table in tables:
+            times = {label: timed(db_copy, table, compute) for label, compute in methods}
+            for label, seconds in times.items():
+                totals[label] += seconds
+            print(f"  {table:<40}" + "".join(f"{times[label]:11.2f}s" for label, _ in methods))
+        print(f"  {'total':<40}" + "".join(f"{totals[label]:11.2f}s" for label, _ in methods))
+        for label, _ in methods[1:]:
+            print(f"  Speedup ({label} vs sql update): {totals['sql update'] / max(totals[label], 1e-6):.1f}x")
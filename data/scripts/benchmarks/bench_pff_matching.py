@@ -0,0 +1,105 @@
+import sys
+import sqlite3
+import random
+import argparse
+import time
+from pathlib import Path
+
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipeline.config import DB_FILE
+from pipeline.matching import MATCH_THRESHOLD, allowed_positions, load_pff_candidates, match_teams, normalize_name
+from pipeline.teams import load_team_index
+
+try:
+    from fuzzywuzzy.fuzz import ratio
+except ImportError:
+    from difflib import SequenceMatcher
+
+    def ratio(left, right):
+        """fuzzywuzzy's own fallback when it is not installed with python-Levenshtein."""
+        return round(100 * SequenceMatcher(None, left, right).ratio()) if left and right else 0
+
+
+def greedy_team(players, candidates):
+    """The old attach_pff_ids loop: one ratio() call per pair, first come first served via used_pff_ids."""
+    by_position = {}
+    for candidate in candidates:
+        by_position.setdefault(candidate[2], []).append(candidate)
+    matches, used_pff_ids = {}, set()
+    for key, name, position in players:
+        best_match, best_score = None, 0
+        for pos in allowed_positions(position):
+            for candidate in by_position.get(pos, []):
+                if candidate[0] in used_pff_ids:
+                    continue
+                score = ratio(name, candidate[1])
+                if score >= 95:
+                    best_match, best_score = candidate, score
+                    break
+                if score > best_score and score >= MATCH_THRESHOLD:
+                    best_match, best_score = candidate, score
+            if best_score >= 95:
+                break
+        if best_match:
+            used_pff_ids.add(best_match[0])
+            matches[key] = (best_match[0], best_match[2], best_score)
+    return matches
+
+
+def greedy_season(rosters, candidates):
+    matches = {}
+    for team, players in rosters.items():
+        matches.update(greedy_team(players, candidates.get(team, [])))
+    return matches
+
+
+def run(matcher, rosters, candidates, reverse=False):
+    if reverse:
+        rosters = {team: players[::-1] for team, players in rosters.items()}
+    start = time.time()
+    matches = matcher(rosters, candidates)
+    return matches, time.time() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Match every roster of a season to PFF IDs: the old greedy fuzz.ratio loop vs the blocked, "
+                    "vectorized optimal-assignment matcher.")
+    parser.add_argument("--year", type=int, default=2024)
+    parser.add_argument("--typo-rate", type=float, default=0.0,
+                        help="Share of roster names with one character dropped, to mimic roster/PFF spelling drift")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DB_FILE)
+    rows = conn.execute("SELECT playerId, name, teamID, position, player_id_PFF FROM Players_Basic "
+                        "WHERE year = ? AND teamID IS NOT NULL", (args.year,)).fetchall()
+    team_index = load_team_index(conn.cursor())
+    conn.commit()
+    conn.close()
+    candidates = load_pff_candidates(args.year, team_index)
+    rosters, stored = {}, {}
+    typos = random.Random(0)
+    for player_id, name, team_id, position, pff_id in rows:
+        name = " ".join(normalize_name(name))
+        if len(name) > 1 and typos.random() < args.typo_rate:
+            cut = typos.randrange(len(name))
+            name = name[:cut] + name[cut + 1:]
+        rosters.setdefault(team_id, []).append((player_id, name, position))
+        if pff_id:
+            stored[player_id] = pff_id
+    print(f"  {len(rows):,} roster players on {len(rosters)} teams, "
+          f"{sum(team in candidates for team in rosters)} with PFF candidates")
+
+    print(f"  {'matcher':<24}{'seconds':>10}{'matched':>10}{'= stored':>10}{'!= stored':>10}{'order-dependent':>17}")
+    results = {}
+    for label, matcher in (("greedy loop", greedy_season), ("blocked assignment", match_teams)):
+        matches, seconds = run(matcher, rosters, candidates)
+        reversed_matches, _ = run(matcher, rosters, candidates, reverse=True)
+        agree = sum(stored.get(key) == match[0] for key, match in matches.items())
+        disagree = sum(key in stored and stored[key] != match[0] for key, match in matches.items())
+        unstable = sum(matches.get(key) != reversed_matches.get(key) for key in matches.keys() | reversed_matches.keys())
+        results[label] = seconds
+        print(f"  {label:<24}{seconds:>10.2f}{len(matches):>10,}{agree:>10,}{disagree:>10,}{unstable:>17,}")
+    print(f"  Speedup: {results['greedy loop'] / max(results['blocked assignment'], 1e-6):.1f}x")
@@ -0,0 +1,54 @@
+import sys
+import sqlite3
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipeline.config import DB_FILE
+from pipeline.reports import PERCENTILE_TABLES
+from pipeline.sketches import load_sketch
+
+
+def exact_values(cursor, table, metric):
+    """Every qualified value of a metric across all seasons, straight from the table."""
+    spec = PERCENTILE_TABLES[table]
+    cursor.execute(f"SELECT {metric} FROM {table} WHERE {spec['qualifier']} > {spec['threshold']} "
+                   f"AND {metric} IS NOT NULL")
+    return np.array([row[0] for row in cursor.fetchall()], dtype='float64')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="All-season percentile lookups: scanning the percentile table vs merging Metric_Sketches.")
+    parser.add_argument("table", nargs="?", default="Players_Full_Percentiles_QB")
+    parser.add_argument("metrics", nargs="*", default=["btt_rate", "twp_rate", "grades_pass", "yards"])
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(DB_FILE)
+    cursor = conn.cursor()
+    print(f"  {'metric':<24}{'values':>8}{'scan':>12}{'sketch':>12}{'max error':>12}{'mean error':>12}")
+    for metric in args.metrics:
+        start = time.perf_counter()
+        values = exact_values(cursor, args.table, metric)
+        scan = time.perf_counter() - start
+
+        if not len(values):
+            print(f"  {metric:<24} no qualified values")
+            continue
+        start = time.perf_counter()
+        load_sketch(cursor, args.table, metric).cdf(values[0])
+        lookup = time.perf_counter() - start
+        sketch = load_sketch(cursor, args.table, metric)
+
+        # Exact percentile with ties counted half, the convention QuantileSketch.cdf follows
+        ordered = np.sort(values)
+        exact = (np.searchsorted(ordered, values, 'left') + np.searchsorted(ordered, values, 'right')) / 2 / len(values)
+        error = np.abs(sketch.cdf(values) - exact) * 100
+        print(f"  {metric:<24}{len(values):>8}{scan * 1e3:>10.2f}ms{lookup * 1e6:>10.0f}us"
+              f"{error.max():>11.3f}%{error.mean():>11.3f}%")
+    conn.close()
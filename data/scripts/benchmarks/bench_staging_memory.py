@@ -0,0 +1,91 @@
+import gc
+import sys
+import argparse
+import tracemalloc
+from pathlib import Path
+
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipeline.reports import WEEKLY_REPORTS
+from pipeline.catalog import load_catalog, metric_columns, parse_schema
+from pipeline.staging import StagingBuffer
+from pipeline.weekly_loader import report_files, parse_report_file
+
+# Every export row is staged (no Players_Basic filter), keyed like the weekly tables but on the PFF id
+STAGE_BASE_COLS = ['player_id_PFF', 'year', 'week', 'seasonType', 'player_game_count']
+
+
+def parsed_files(name):
+    report = WEEKLY_REPORTS[name]
+    catalog = load_catalog(name)
+    schema, metric_cols = parse_schema(catalog), metric_columns(catalog, report['excluded_cols'], report.get('projection'))
+    for f in report_files(name, report):
+        result = parse_report_file((*f, metric_cols, schema))
+        if not result['error']:
+            yield result
+
+
+def stage_dicts(name):
+    """The old staging: one dict per player-week holding every non-null metric."""
+    pff_data = {}
+    for result in parsed_files(name):
+        year, week, seasonType = result['year'], result['week'], result['seasonType']
+        for pff_id, game_count, values in zip(result['player_ids'], result['game_counts'], result['values'].tolist()):
+            record = pff_data.get((pff_id, year, week, seasonType))
+            if record is None:
+                record = pff_data[(pff_id, year, week, seasonType)] = {
+                    'player_id_PFF': pff_id, 'year': year, 'week': week, 'seasonType': seasonType,
+                    'player_game_count': int(game_count) if game_count is not None and game_count >= 0 else 0
+                }
+            for col, value in zip(result['metric_cols'], values):
+                if value == value:
+                    record[col] = value
+    return pff_data
+
+
+def stage_buffer(name):
+    report = WEEKLY_REPORTS[name]
+    staged = StagingBuffer(STAGE_BASE_COLS, metric_columns(load_catalog(name), report['excluded_cols'], report.get('projection')))
+    for result in parsed_files(name):
+        year, week, seasonType = result['year'], result['week'], result['seasonType']
+        rows = [staged.row_for((pff_id, year, week, seasonType),
+                               (pff_id, year, week, seasonType,
+                                int(game_count) if game_count is not None and game_count >= 0 else 0))
+                for pff_id, game_count in zip(result['player_ids'], result['game_counts'])]
+        staged.merge(rows, result['metric_cols'], result['values'])
+    return staged
+
+
+def measure(stage, name):
+    """(rows staged, MB still held once staging is done, peak MB while staging) under tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    staged = stage(name)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rows = len(staged)
+    del staged
+    return rows, current / 1e6, peak / 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare dict-per-row staging with the column-oriented StagingBuffer.")
+    parser.add_argument("reports", nargs="*",
+                        default=[name for name, report in WEEKLY_REPORTS.items() if report['family'] == "Receiving"],
+                        help="Weekly reports to stage (default: the Receiving family)")
+    args = parser.parse_args()
+
+    print(f"  {'Report':<20} | {'Rows':>8} | {'Dicts MB':>9} | {'Peak MB':>9} | {'Buffer MB':>9} | {'Peak MB':>9} | Held")
+    print("  " + "-" * 84)
+    totals = [0.0, 0.0, 0.0, 0.0]
+    for name in args.reports:
+        rows, dict_mb, dict_peak = measure(stage_dicts, name)
+        _, buffer_mb, buffer_peak = measure(stage_buffer, name)
+        for i, value in enumerate((dict_mb, dict_peak, buffer_mb, buffer_peak)):
+            totals[i] += value
+        print(f"  {name:<20} | {rows:>8,} | {dict_mb:>9.1f} | {dict_peak:>9.1f} | {buffer_mb:>9.1f} | {buffer_peak:>9.1f} | "
+              f"{dict_mb / max(buffer_mb, 1e-6):>4.1f}x less")
+    print("  " + "-" * 84)
+    print(f"  {'Total':<20} | {'':>8} | {totals[0]:>9.1f} | {totals[1]:>9.1f} | {totals[2]:>9.1f} | {totals[3]:>9.1f} | "
+          f"{totals[0] / max(totals[2], 1e-6):>4.1f}x less")
@@ -0,0 +1,60 @@
+import sys
+import csv
+import time
+import argparse
+from pathlib import Path
+
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipeline.reports import WEEKLY_REPORTS
+from pipeline.catalog import load_catalog, metric_columns, parse_schema
+from pipeline.weekly_loader import report_files, parse_report_file
+
+
+def legacy_parse_file(csv_file, excluded_cols):
+    """The old per-cell decode: csv.DictReader plus the replace('.')/replace('-')/isdigit() check."""
+    rows = []
+    with open(csv_file, 'r', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        if not reader.fieldnames or "player_id" not in reader.fieldnames:
+            return rows
+        metric_cols = [col for col in reader.fieldnames if col not in excluded_cols]
+        for row in reader:
+            values = {}
+            for col in metric_cols:
+                value = row.get(col)
+                if value and value.replace('.', '').replace('-', '').isdigit():
+                    values[col] = float(value)
+            rows.append((row.get("player_id"), values))
+    return rows
+
+
+def bench(name):
+    report = WEEKLY_REPORTS[name]
+    files = list(report_files(name, report))
+
+    start = time.time()
+    legacy_rows = sum(len(legacy_parse_file(f[0], report['excluded_cols'])) for f in files)
+    legacy_seconds = time.time() - start
+
+    start = time.time()
+    catalog = load_catalog(name)
+    schema, metric_cols = parse_schema(catalog), metric_columns(catalog, report['excluded_cols'], report.get('projection'))
+    typed_rows = sum(len(parse_report_file((*f, metric_cols, schema))['player_ids']) for f in files)
+    typed_seconds = time.time() - start
+
+    print(f"  {name:<20} | {len(files):>5} | {legacy_rows:>9,} | {legacy_seconds:>8.2f}s | {typed_rows:>9,} | "
+          f"{typed_seconds:>8.2f}s | {legacy_seconds / max(typed_seconds, 1e-6):>5.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the legacy per-cell PFF decode with the typed column-wise parser.")
+    parser.add_argument("reports", nargs="*", default=["ReceivingDepth", "ReceivingGrades", "DefenseGrades", "CoverageScheme"],
+                        help="Weekly reports to time")
+    args = parser.parse_args()
+
+    print(f"  {'Report':<20} | Files | {'Legacy':>9} | {'Time':>9} | {'Typed':>9} | {'Time':>9} | Speedup")
+    print("  " + "-" * 84)
+    for name in args.reports:
+        bench(name)
@@ -28,44 +28,8 @@ script_order = [
     # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/teams/populate_teams_stats.py", #3.3 (Run once after stats populated)
 
     # Batch update of all PFF Data # 4.X
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/passing/season/populate_passing_concept_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/passing/season/populate_passing_depth_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/passing/season/populate_passing_grades_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/passing/season/populate_passing_pressure_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/passing/season/populate_passing_time_in_pocket_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/passing/weekly/populate_passing_concept_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/passing/weekly/populate_passing_depth_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/passing/weekly/populate_passing_grades_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/passing/weekly/populate_passing_pressure_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/passing/weekly/populate_passing_time_in_pocket_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/rushing/season/populate_rushing_grades_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/rushing/weekly/populate_rushing_grades_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/receiving/season/populate_receiving_concept_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/receiving/season/populate_receiving_depth_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/receiving/season/populate_receiving_grades_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/receiving/season/populate_receiving_scheme_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/receiving/weekly/populate_receiving_concept_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/receiving/weekly/populate_receiving_depth_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/receiving/weekly/populate_receiving_grades_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/receiving/weekly/populate_receiving_scheme_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/blocking/season/populate_blocking_grades_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/blocking/season/populate_pass_blocking_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/blocking/season/populate_run_blocking_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/blocking/weekly/populate_blocking_grades_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/blocking/weekly/populate_pass_blocking_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/blocking/weekly/populate_run_blocking_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/defense/season/populate_coverage_grades_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/defense/season/populate_coverage_scheme_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/defense/season/populate_defense_grades_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/defense/season/populate_pass_rush_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/defense/season/populate_run_defense_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/defense/season/populate_slot_coverage_season.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/defense/weekly/populate_coverage_grades_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/defense/weekly/populate_coverage_scheme_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/defense/weekly/populate_defense_grades_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/defense/weekly/populate_pass_rush_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/defense/weekly/populate_run_defense_weekly.py",
-    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/defense/weekly/populate_slot_coverage_weekly.py",
+    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/populate_pff_season.py", # all Players_*_Season tables in one pass (reloads only seasons whose exports changed; --year 2025 to force one season)
+    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/populate_pff_weekly.py", # all Players_*_Weekly tables in one pass (pass report names to limit; in season run with --year 2025 --week 8 to reload just that week)
 
     # Batch update of all PFF Percentiles
     # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/passing/season/populate_full_percentiles_qb.py",
@@ -83,6 +47,7 @@ script_order = [
     # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/defense/season/populate_full_percentiles_dl.py",
     # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/defense/season/populate_full_percentiles_lbe.py",
     # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/defense/season/populate_full_percentiles_s.py",
+    # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/populate_full_ratings.py", # only to recompute QBR/WRR/CBR/... after editing RATING_TABLES in pipeline/reports.py (the scripts above already rate)
 
     # Batch update of all grades
     # "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/scripts/populate/players/populate_players_basic_grades.py", #no need for all teams
@@ -0,0 +1 @@
+"""Shared building blocks for the PFF population pipeline."""
@@ -0,0 +1,163 @@
+import re
+import json
+from fnmatch import translate
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+import pyarrow as pa
+
+from pipeline.parsing import TEXT_COLS, TEXT, INT, FLOAT, read_typed
+
+# One JSON file per PFF report (the filename suffix: PassingDepth, DefenseGrades, ...), generated from the
+# exports by populate/build_schema_catalog.py and checked in. Each file lists every column PFF ships for the
+# report, in export order, with a narrow SQLite type: INTEGER for counts, REAL for grades and rates, TEXT
+# for the identity columns. The version is bumped whenever the column list or a type changes.
+SCHEMA_DIR = Path(__file__).resolve().parent / "schemas"
+# Which catalog version each PFF-derived table was created from
+CATALOG_TABLE = "Schema_Catalog"
+
+SQL_TYPES = {TEXT: "TEXT", INT: "INTEGER", FLOAT: "REAL"}
+PARSE_KINDS = {sql_type: kind for kind, sql_type in SQL_TYPES.items()}
+
+
+# ============================================================================
+# Reading the catalog
+# ============================================================================
+
+@lru_cache(maxsize=None)
+def load_catalog(report):
+    """{'report', 'version', 'columns': {column: SQL type}} for a report, read once per process."""
+    path = SCHEMA_DIR / f"{report}.json"
+    if not path.exists():
+        raise ValueError(f"No schema catalog for {report}; run populate/build_schema_catalog.py {report}")
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {'report': data['report'], 'version': data['version'], 'columns': dict(data['columns'])}
+
+
+@lru_cache(maxsize=None)
+def _pattern(globs):
+    # One alternation per glob list, so a column is tested against the whole spec in a single match
+    return re.compile('|'.join(translate(glob) for glob in globs)) if globs else None
+
+
+def projected(col, projection):
+    """Whether a column survives a report's projection spec ({'include': globs, 'exclude': globs}).
+
+    Globs use fnmatch syntax and are case-sensitive. A column must match some include glob (no include
+    list keeps everything) and no exclude glob.
+    """
+    if not projection:
+        return True
+    include, exclude = _pattern(tuple(projection.get('include', ()))), _pattern(tuple(projection.get('exclude', ())))
+    return (include is None or include.match(col) is not None) and (exclude is None or exclude.match(col) is None)
+
+
+def metric_columns(catalog, excluded_cols, projection=None):
+    """Catalog columns a table stores as metrics, in catalog order, narrowed by the report's projection."""
+    return [col for col in catalog['columns'] if col not in excluded_cols and projected(col, projection)]
+
+
+@lru_cache(maxsize=None)
+def _column_defs(report, columns):
+    types = load_catalog(report)['columns']
+    return ',\n        '.join(f"{col} {types[col]}" for col in columns)
+
+
+def column_defs(catalog, columns):
+    """'col TYPE' definitions for a CREATE TABLE, compiled once per report/column list."""
+    return _column_defs(catalog['report'], tuple(columns))
+
+
+def parse_schema(catalog):
+    """column -> 'text' | 'int' | 'float' for parsing.read_typed(), straight from the catalog."""
+    return {col: PARSE_KINDS[sql_type] for col, sql_type in catalog['columns'].items()}
+
+
+def unknown_columns(schema, fieldnames):
+    """Export columns a parse_schema() schema does not declare (skipped until the catalog is rebuilt)."""
+    return [col for col in fieldnames if col not in schema]
+
+
+# ============================================================================
+# Tables built from a catalog
+# ============================================================================
+
+def ensure_catalog_table(cursor):
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {CATALOG_TABLE} (
+            table_name TEXT PRIMARY KEY,
+            report TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    """)
+
+
+def table_version(cursor, table):
+    """Catalog version a table was created from (None if unknown, e.g. built before the catalog existed)."""
+    ensure_catalog_table(cursor)
+    cursor.execute(f"SELECT version FROM {CATALOG_TABLE} WHERE table_name = ?", (table,))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def record_table_version(cursor, table, catalog):
+    ensure_catalog_table(cursor)
+    cursor.execute(f"INSERT OR REPLACE INTO {CATALOG_TABLE} (table_name, report, version, created_at) VALUES (?, ?, ?, ?)",
+                   (table, catalog['report'], catalog['version'], datetime.now().isoformat(timespec='seconds')))
+
+
+# ============================================================================
+# Building the catalog from PFF exports
+# ============================================================================
+
+def infer_column_types(csv_files):
+    """column -> SQL type over every export of a report, columns in first-seen export order.
+
+    A column is INTEGER only if every export that has values for it parses as integers; all-empty columns
+    in one export say nothing about the type. Identity columns are always TEXT.
+    """
+    kinds = {}
+    for csv_file in csv_files:
+        try:
+            table = read_typed(csv_file)
+        except (pa.ArrowInvalid, OSError):
+            continue  # Empty export
+        for field in table.schema:
+            seen = kinds.setdefault(field.name, set())
+            if field.name in TEXT_COLS:
+                seen.add(TEXT)
+            elif pa.types.is_integer(field.type):
+                seen.add(INT)
+            elif pa.types.is_floating(field.type):
+                seen.add(FLOAT)
+            elif not pa.types.is_null(field.type):
+                seen.add(TEXT)
+    types = {}
+    for col, seen in kinds.items():
+        if seen == {TEXT}:
+            types[col] = SQL_TYPES[TEXT]
+        elif seen == {INT}:
+            types[col] = SQL_TYPES[INT]
+        else:
+            types[col] = SQL_TYPES[FLOAT]  # Rates, mixed int/float, stray text in a numeric column, all-empty
+    return types
+
+
+def write_catalog(report, columns):
+    """Write a report's catalog, bumping the version if the columns or types changed. Returns the version."""
+    path = SCHEMA_DIR / f"{report}.json"
+    version = 1
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            previous = json.load(f)
+        if dict(previous['columns']) == columns and list(dict(previous['columns'])) == list(columns):
+            return previous['version']
+        version = previous['version'] + 1
+    # One column per line keeps catalog changes readable in diffs
+    lines = ',\n'.join(f"    {json.dumps([col, sql_type])}" for col, sql_type in columns.items())
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'{{\n  "report": {json.dumps(report)},\n  "version": {version},\n  "columns": [\n{lines}\n  ]\n}}\n')
+    return version
@@ -0,0 +1,177 @@
+import time
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.ipc as ipc
+
+from pipeline.config import PFF_DATA_DIR, PFF_COLUMNAR_DIR
+from pipeline.parsing import TEXT_COLS, parse_week_token, read_typed
+
+# Identity columns are kept as text; everything else is typed by Arrow's CSV inference (int64 counts, double rates).
+IDENTITY_TYPES = {col: pa.string() for col in TEXT_COLS}
+SEASON_PARTITION = "season"
+
+
+# ============================================================================
+# Layout: <PFF_Columnar>/<report>/year=<year>/week=<token>.arrow  (weekly exports; token as in the
+#                                                                   filename: 7, CC, 2ndPO...)
+#         <PFF_Columnar>/<report>/year=<year>/season.arrow       (season exports)
+# Files are uncompressed Arrow IPC so readers can memory-map them without decoding. The raw week token
+# is kept so CC files do not collide with week 15; readers map it to (week, seasonType).
+# ============================================================================
+
+def partition_path(report, year, token=None, base_dir=PFF_COLUMNAR_DIR):
+    name = SEASON_PARTITION if token is None else f"week={token}"
+    return base_dir / report / f"year={year}" / f"{name}.arrow"
+
+
+def discover_exports(pff_dir=PFF_DATA_DIR):
+    """Yield {'report', 'year', 'token', 'path'} for every weekly and season CSV under PFF_Data (token None for season)."""
+    for family_dir in sorted(p for p in pff_dir.iterdir() if p.is_dir()):
+        for csv_file in sorted((family_dir / "WeeklyReports").rglob("*.csv")):
+            parts = csv_file.stem.split('_')
+            if len(parts) < 3 or not parts[0].isdigit():
+                print(f"  Skipping {csv_file.name}: Invalid filename format")
+                continue
+            if parse_week_token(parts[1]) is None:
+                print(f"  Skipping {csv_file.name}: Unsupported game type {parts[1]}")
+                continue
+            yield {'report': parts[-1], 'year': int(parts[0]), 'token': parts[1], 'path': csv_file}
+        for csv_file in sorted((family_dir / "SeasonReports").glob("*.csv")):
+            parts = csv_file.stem.split('_')
+            if len(parts) != 2 or not parts[0].isdigit():
+                print(f"  Skipping {csv_file.name}: Invalid filename format")
+                continue
+            yield {'report': parts[1], 'year': int(parts[0]), 'token': None, 'path': csv_file}
+
+
+def read_csv_typed(csv_file):
+    """Parse one PFF CSV into a typed Arrow table."""
+    table = pacsv.read_csv(csv_file, convert_options=pacsv.ConvertOptions(column_types=IDENTITY_TYPES))
+    for i, field in enumerate(table.schema):
+        # Columns that are empty in this export come back as the null type; give them a real type
+        if pa.types.is_null(field.type):
+            table = table.set_column(i, pa.field(field.name, pa.float64()), table.column(i).cast(pa.float64()))
+        # PFF counts fit comfortably in 32 bits; halves the mirror size for count-heavy reports
+        elif pa.types.is_int64(field.type):
+            table = table.set_column(i, pa.field(field.name, pa.int32()), table.column(i).cast(pa.int32()))
+    return table
+
+
+def write_partition(table, target):
+    """Write an uncompressed Arrow IPC file atomically."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".arrow.tmp")
+    with pa.OSFile(str(tmp), 'wb') as sink, ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    tmp.replace(target)
+
+
+def convert_all(reports=None, force=False, pff_dir=PFF_DATA_DIR, base_dir=PFF_COLUMNAR_DIR):
+    """Mirror PFF_Data into the columnar layout. Partitions newer than their CSV are left alone unless force."""
+    start = time.time()
+    converted = skipped = 0
+    expected = set()
+    for export in discover_exports(pff_dir):
+        if reports and export['report'] not in reports:
+            continue
+        target = partition_path(export['report'], export['year'], export['token'], base_dir)
+        if target in expected:
+            print(f"  ⚠ {export['path'].name} maps to an existing partition {target.relative_to(base_dir)}; later file wins")
+        expected.add(target)
+        if not force and current_partition(export['path'], export['report'], export['year'], export['token'], base_dir):
+            skipped += 1
+            continue
+        try:
+            write_partition(read_csv_typed(export['path']), target)
+            converted += 1
+        except (pa.ArrowInvalid, OSError) as e:
+            print(f"  Error converting {export['path'].name}: {e}")
+
+    # Drop partitions whose source CSV is gone
+    removed = 0
+    if base_dir.exists():
+        for arrow_file in base_dir.rglob("*.arrow"):
+            report = arrow_file.relative_to(base_dir).parts[0]
+            if (not reports or report in reports) and arrow_file not in expected:
+                arrow_file.unlink()
+                removed += 1
+
+    print(f"  ✓ Converted {converted} files, {skipped} already current, {removed} stale partitions removed "
+          f"in {time.time() - start:.1f}s")
+    return converted
+
+
+# ============================================================================
+# Reader API
+# ============================================================================
+
+def list_partitions(report, years=None, weeks=None, season=False, base_dir=PFF_COLUMNAR_DIR):
+    """(path, year, week, seasonType) for a report's mirrored partitions, filtered by year/week."""
+    partitions = []
+    for year_dir in sorted((base_dir / report).glob("year=*")):
+        year = int(year_dir.name.split('=')[1])
+        if years and year not in years:
+            continue
+        for arrow_file in sorted(year_dir.glob("*.arrow")):
+            if arrow_file.stem == SEASON_PARTITION:
+                if season:
+                    partitions.append((arrow_file, year, None, None))
+                continue
+            if season:
+                continue
+            week, seasonType = parse_week_token(arrow_file.stem.split('=', 1)[1])
+            if weeks and week not in weeks:
+                continue
+            partitions.append((arrow_file, year, week, seasonType))
+    return partitions
+
+
+def read_columns(report, columns=None, years=None, weeks=None, season=False, base_dir=PFF_COLUMNAR_DIR):
+    """Memory-map a report's partitions and return one Arrow table holding only the requested columns.
+
+    year (and week/seasonType for weekly data) are appended from the partition path. Columns missing from
+    a partition come back as nulls; int/double differences between partitions are promoted.
+    """
+    tables = []
+    for path, year, week, seasonType in list_partitions(report, years, weeks, season, base_dir):
+        table = ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+        if columns is not None:
+            names = set(table.column_names)
+            present = [col for col in columns if col in names]
+            table = table.select(present)
+            for col in columns:
+                if col not in present:
+                    table = table.append_column(col, pa.nulls(table.num_rows, pa.float64()))
+        table = table.append_column("year", pa.repeat(pa.scalar(year, pa.int32()), table.num_rows))
+        if not season:
+            table = table.append_column("week", pa.repeat(pa.scalar(week, pa.int32()), table.num_rows))
+            table = table.append_column("seasonType", pa.repeat(pa.scalar(seasonType, pa.string()), table.num_rows))
+        tables.append(table)
+    if not tables:
+        return None
+    return pa.concat_tables(tables, promote_options="permissive")
+
+
+def current_partition(csv_file, report, year, token=None, base_dir=PFF_COLUMNAR_DIR):
+    """The export's mirror partition if it exists and is at least as new as the CSV (convert_all's rule), else None."""
+    target = partition_path(report, year, token, base_dir)
+    try:
+        return target if target.stat().st_mtime >= csv_file.stat().st_mtime else None
+    except OSError:
+        return None
+
+
+def read_season_export(csv_file, schema=None, columns=None, base_dir=PFF_COLUMNAR_DIR):
+    """One {year}_{report}.csv season export as an Arrow table: read_columns() on its mirror partition when that
+    is current, else read_typed() on the CSV.
+
+    The mirror keeps Arrow's inferred types rather than the catalog's, so callers go through numeric_block()
+    for metric values either way; identity columns are text in both. The mirror table also carries a year column.
+    """
+    year, _, report = csv_file.stem.partition('_')
+    if year.isdigit() and report and current_partition(csv_file, report, int(year), base_dir=base_dir):
+        table = read_columns(report, columns, years=[int(year)], season=True, base_dir=base_dir)
+        if table is not None:
+            return table
+    return read_typed(csv_file, schema, columns)
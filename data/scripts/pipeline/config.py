@@ -0,0 +1,10 @@
+import os
+from pathlib import Path
+
+# Database and PFF export locations (override with env vars when running outside the main workstation)
+DB_FILE = Path(os.getenv("CFB_DB_FILE", "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/server/data/db/cfb_database.db"))
+PFF_DATA_DIR = Path(os.getenv("PFF_DATA_DIR", "/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/PFF_Data"))
+# Typed Arrow mirror of PFF_Data (built by populate/convert_pff_columnar.py)
+PFF_COLUMNAR_DIR = Path(os.getenv("PFF_COLUMNAR_DIR", str(PFF_DATA_DIR.parent / "PFF_Columnar")))
+# (player_id_PFF, year) -> Players_Basic identity map shared by every loader (built by pipeline/identity.py)
+PLAYER_IDENTITY_FILE = Path(os.getenv("PLAYER_IDENTITY_FILE", str(DB_FILE.with_suffix(".identity.arrow"))))
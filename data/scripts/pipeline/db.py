@@ -0,0 +1,80 @@
+import atexit
+import sqlite3
+from contextlib import contextmanager
+
+from pipeline.config import DB_FILE
+
+# Bulk-load session settings. WAL lets the server keep reading while a loader writes, and with
+# synchronous=NORMAL commits no longer wait on fsync (WAL stays consistent on crash; only the last
+# transactions can be lost, and every loader can simply be rerun).
+BULK_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -262144,      # KiB when negative: 256 MB page cache
+    "mmap_size": 1 << 30,       # Map up to 1 GB of the database file
+    "temp_store": "MEMORY",
+}
+
+
+def connect(db_file=DB_FILE, bulk=True):
+    """Open the database; bulk=True applies BULK_PRAGMAS for the life of the connection.
+
+    WAL mode sticks to the database file, and the server deploys by copying cfb_database.db alone, so a
+    bulk session also checkpoints the WAL back into the main file when the script exits, including on an
+    uncaught exception (scripts that end with finish_bulk() have already done so).
+    """
+    conn = sqlite3.connect(db_file)
+    if bulk:
+        for pragma, value in BULK_PRAGMAS.items():
+            conn.execute(f"PRAGMA {pragma} = {value}")
+        atexit.register(_checkpoint_at_exit, conn)
+    return conn
+
+
+def _checkpoint_at_exit(conn):
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    except sqlite3.ProgrammingError:
+        pass  # Already closed, and the last connection to close checkpoints the WAL itself
+
+
+def table_exists(cursor, table):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+    return cursor.fetchone() is not None
+
+
+def secondary_indexes(cursor, table):
+    """(name, sql) for the explicitly created indexes on a table (not PRIMARY KEY/UNIQUE autoindexes)."""
+    cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                   (table,))
+    return cursor.fetchall()
+
+
+@contextmanager
+def deferred_indexes(cursor, table):
+    """Drop a table's secondary indexes for the duration of a load and recreate them afterwards.
+
+    The saved definitions are replayed even if the table was dropped and recreated inside the block, so
+    indexes added by hand (e.g. for the server) survive full rebuilds. An index whose columns no longer
+    exist is reported and skipped.
+    """
+    indexes = secondary_indexes(cursor, table)
+    for name, _ in indexes:
+        cursor.execute(f'DROP INDEX IF EXISTS "{name}"')
+    try:
+        yield
+    finally:
+        for name, sql in indexes:
+            try:
+                cursor.execute(sql)
+            except sqlite3.OperationalError as e:
+                print(f"  ⚠ Could not recreate index {name} on {table}: {e}")
+        if indexes:
+            print(f"  ✓ Rebuilt {len(indexes)} index(es) on {table}")
+
+
+def finish_bulk(conn):
+    """Commit, refresh planner statistics and fold the WAL back into the main file."""
+    conn.commit()
+    conn.execute("PRAGMA optimize")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
@@ -0,0 +1,206 @@
+import hashlib
+import json
+from datetime import datetime
+
+import numpy as np
+
+from pipeline.reports import PERCENTILE_TABLES
+
+DISTRIBUTIONS_TABLE = "Metric_Distributions"
+# Fingerprint of the pool each (position, year, engine) slice of Metric_Distributions was summarized from
+DISTRIBUTIONS_SOURCE_TABLE = "Metric_Distributions_Source"
+TABLE_PREFIX = "Players_Full_Percentiles_"
+# Percentiles stored for every distribution
+QUANTILE_GRID = tuple(range(0, 101, 5))
+# year of the rows pooled over every season (the rating engine's historical stats)
+ALL_SEASONS = 0
+
+
+# ============================================================================
+# Metric_Distributions: count, mean, std, min, max and a quantile grid per (position, metric, year,
+# qualification rule). The percentile and rating engines summarize each slice while they compute it and
+# replace just those rows, so the table tracks the data as it loads. Each slice is stored with a sha256
+# fingerprint of the pool it came from; when an engine's pool still matches, refresh_distributions() reads
+# the stored stats back instead of summarizing and rewriting them. On-demand lookups (load_distribution(),
+# percentile_of(), z_score() and the server's /api/metric_distribution) are one primary-key read instead
+# of a scan of the Players_Full_Percentiles_* table.
+# ============================================================================
+
+def ensure_distributions_table(cursor):
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DISTRIBUTIONS_TABLE} (
+            position TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            rule TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            mean REAL,
+            std REAL,
+            min REAL,
+            max REAL,
+            quantiles TEXT,
+            PRIMARY KEY (position, metric, year, rule)
+        )
+    """)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {DISTRIBUTIONS_SOURCE_TABLE} (
+            position TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            engine TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            built_at TEXT NOT NULL,
+            PRIMARY KEY (position, year, engine)
+        )
+    """)
+
+
+def position_of(table):
+    """'Players_Full_Percentiles_RB_Rushing' -> 'RB_Rushing'."""
+    return table[len(TABLE_PREFIX):] if table.startswith(TABLE_PREFIX) else table
+
+
+def percentile_rule(table):
+    """Qualification rule of the percentile engine for a table, e.g. 'attempts > 40'."""
+    spec = PERCENTILE_TABLES[table]
+    return f"{spec['qualifier']} > {spec['threshold']}"
+
+
+def rating_rule(table, per_game=False):
+    """Qualification rule of the rating engine, e.g. 'attempts >= 40' or 'attempts >= 40, per game'."""
+    spec = PERCENTILE_TABLES[table]
+    return f"{spec['qualifier']} >= {spec['threshold']}" + (", per game" if per_game else "")
+
+
+def summarize(pool):
+    """Distribution of every column of a (rows x metrics) array whose NaN cells are left out.
+
+    Returns a dict of per-column arrays: count, mean, std, min, max and quantiles (len(QUANTILE_GRID) x
+    metrics, linear interpolation). Mean and std use the formulas the old SQL used, AVG(x) and
+    (AVG(x*x) - AVG(x)^2) * n / (n - 1), with rows added in order, so they match it exactly. std is NaN
+    below two values; mean, min, max and quantiles are NaN for an empty column.
+    """
+    present = ~np.isnan(pool)
+    count = present.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # cumsum adds rows left to right like SQLite's SUM (np.sum adds pairwise); zeros leave sums unchanged
+        total = np.cumsum(np.where(present, pool, 0.0), axis=0)[-1] if len(pool) else np.zeros(pool.shape[1])
+        squares = np.cumsum(np.where(present, pool * pool, 0.0), axis=0)[-1] if len(pool) else np.zeros(pool.shape[1])
+        mean = np.where(count > 0, total / count, np.nan)
+        variance = (squares / count - mean ** 2) * count / (count - 1)
+    std = np.where(count > 1, np.sqrt(np.maximum(variance, 0.0)), np.nan)
+
+    # NaN sorts last, so the first `count` entries of each sorted column are its values
+    ordered = np.sort(pool, axis=0)
+    last = np.maximum(count - 1, 0)
+    position = np.outer(np.array(QUANTILE_GRID) / 100.0, last)
+    below = np.floor(position).astype(np.intp)
+    above = np.minimum(below + 1, last)
+    if len(pool):
+        low, high = np.take_along_axis(ordered, below, axis=0), np.take_along_axis(ordered, above, axis=0)
+        quantiles = low + (high - low) * (position - below)
+        quantiles[:, count == 0] = np.nan
+        minimum, maximum = ordered[0], ordered[last, np.arange(pool.shape[1])]
+    else:
+        quantiles = np.full(position.shape, np.nan)
+        minimum = maximum = np.full(pool.shape[1], np.nan)
+    return {'count': count, 'mean': mean, 'std': std, 'min': np.where(count > 0, minimum, np.nan),
+            'max': np.where(count > 0, maximum, np.nan), 'quantiles': quantiles}
+
+
+def store_distributions(cursor, position, year, rules, metrics, summary):
+    """Replace the stored distributions of one position-year under the given rule(s).
+
+    rules is one rule for every metric or a list with one rule per metric. Metrics without any qualified
+    value are not stored.
+    """
+    rules = [rules] * len(metrics) if isinstance(rules, str) else list(rules)
+    for rule in set(rules):
+        cursor.execute(f"DELETE FROM {DISTRIBUTIONS_TABLE} WHERE position = ? AND year = ? AND rule = ?",
+                       (position, year, rule))
+
+    def cell(value):
+        return None if np.isnan(value) else float(value)
+
+    rows = []
+    for j, (metric, rule) in enumerate(zip(metrics, rules)):
+        if summary['count'][j] == 0:
+            continue
+        rows.append((position, metric, year, rule, int(summary['count'][j]), cell(summary['mean'][j]),
+                     cell(summary['std'][j]), cell(summary['min'][j]), cell(summary['max'][j]),
+                     json.dumps([round(float(q), 6) for q in summary['quantiles'][:, j]])))
+    cursor.executemany(f"INSERT INTO {DISTRIBUTIONS_TABLE} VALUES ({', '.join('?' * 10)})", rows)
+    return len(rows)
+
+
+def pool_fingerprint(rules, metrics, pool, extra=()):
+    """sha256 over a (rows x metrics) pool and what it is summarized under (rules, metric names, extra keys)."""
+    digest = hashlib.sha256()
+    digest.update(repr((rules, list(metrics), list(extra))).encode())
+    digest.update(np.ascontiguousarray(pool, dtype='float64').tobytes())
+    return digest.hexdigest()
+
+
+def load_summary(cursor, position, year, rules, metrics):
+    """Stored count, mean, std, min and max arrays in summarize()'s layout (no quantiles).
+
+    rules is one rule for every metric or a list with one rule per metric. A metric without a stored row had
+    no qualified value, so it reads back as count 0 with NaN statistics, as summarize() returns it.
+    """
+    rules = [rules] * len(metrics) if isinstance(rules, str) else list(rules)
+    cursor.execute(f"SELECT metric, rule, count, mean, std, min, max FROM {DISTRIBUTIONS_TABLE} "
+                   f"WHERE position = ? AND year = ?", (position, year))
+    stored = {(metric, rule): values for metric, rule, *values in cursor.fetchall()}
+    cells = np.array([stored.get(key, (0, None, None, None, None)) for key in zip(metrics, rules)],
+                     dtype='float64').reshape(len(metrics), 5)
+    return {'count': cells[:, 0].astype(np.int64), 'mean': cells[:, 1], 'std': cells[:, 2],
+            'min': cells[:, 3], 'max': cells[:, 4]}
+
+
+def refresh_distributions(cursor, position, year, engine, rules, metrics, pool, extra=()):
+    """Summary of a pool, read back from Metric_Distributions when the pool is unchanged since it was stored.
+
+    engine names the caller ("percentile", "rating"); extra holds anything else the caller derives from the
+    pool (the percentile engine's conferences). Returns (summary, written): written is the number of
+    distributions stored, or None when the stored ones were reused (their summary has no quantiles).
+    """
+    fingerprint = pool_fingerprint(rules, metrics, pool, extra)
+    cursor.execute(f"SELECT fingerprint FROM {DISTRIBUTIONS_SOURCE_TABLE} WHERE position = ? AND year = ? AND engine = ?",
+                   (position, year, engine))
+    row = cursor.fetchone()
+    if row and row[0] == fingerprint:
+        return load_summary(cursor, position, year, rules, metrics), None
+    summary = summarize(pool)
+    written = store_distributions(cursor, position, year, rules, metrics, summary)
+    cursor.execute(f"INSERT OR REPLACE INTO {DISTRIBUTIONS_SOURCE_TABLE} (position, year, engine, fingerprint, built_at) "
+                   f"VALUES (?, ?, ?, ?, ?)", (position, year, engine, fingerprint, datetime.now().isoformat(timespec='seconds')))
+    return summary, written
+
+
+def load_distribution(cursor, table, metric, year, rule=None):
+    """Stored distribution of a metric for a table and year (ALL_SEASONS for the pooled rating stats).
+
+    rule defaults to the table's percentile rule. Returns None when nothing is stored.
+    """
+    cursor.execute(f"""
+        SELECT count, mean, std, min, max, quantiles FROM {DISTRIBUTIONS_TABLE}
+        WHERE position = ? AND metric = ? AND year = ? AND rule = ?
+    """, (position_of(table), metric, year, rule or percentile_rule(table)))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    count, mean, std, minimum, maximum, quantiles = row
+    return {'count': count, 'mean': mean, 'std': std, 'min': minimum, 'max': maximum,
+            'quantiles': json.loads(quantiles)}
+
+
+def percentile_of(distribution, value):
+    """Approximate percentile (0-100) of value within a stored distribution, read off its quantile grid."""
+    if distribution['min'] == distribution['max']:
+        return 50.0
+    return float(np.interp(value, distribution['quantiles'], QUANTILE_GRID))
+
+
+def z_score(distribution, value):
+    """Standard score of value against a stored distribution (0 when its std is missing or zero)."""
+    std = distribution['std']
+    return (value - distribution['mean']) / std if std else 0.0
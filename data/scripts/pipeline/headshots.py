@@ -0,0 +1,129 @@
+import asyncio
+import time
+import zlib
+
+HEADSHOT_URL = "https://a.espncdn.com/combiner/i?img=/i/headshots/college-football/players/full/{player_id}.png&w=350&h=254"
+HEADSHOTS_TABLE = "Headshot_Cache"
+# Seconds a check is trusted: headshots rarely disappear, missing ones show up as rosters settle
+FOUND_TTL = 30 * 86400
+MISSING_TTL = 7 * 86400
+# HEAD requests in flight at once (and pooled connections to the CDN)
+DEFAULT_CONCURRENCY = 32
+REQUEST_TIMEOUT = 5
+# Tries per URL on timeouts, connection errors and 429/5xx, waiting 1s, 2s, ... in between
+ATTEMPTS = 3
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Stub mode: simulated round-trip and share of players without a headshot (chosen by hashing the URL)
+STUB_LATENCY = 0.05
+STUB_MISSING_PERCENT = 15
+# Player ids per cache lookup (keeps IN (...) under SQLite's variable limit)
+LOOKUP_CHUNK = 500
+
+
+# ============================================================================
+# Headshot validation: the roster loader used to send one blocking HEAD request to espncdn per player on
+# every run. Here only players without a fresh entry in Headshot_Cache are checked, concurrently over one
+# pooled session, and every definite answer (found or missing) is cached with its check time. stub=True
+# swaps the CDN for a local simulation so the validator can be exercised and benchmarked offline; stub
+# answers are cached like real ones, so only use it against a scratch database.
+# ============================================================================
+
+def headshot_url(player_id):
+    return HEADSHOT_URL.format(player_id=player_id)
+
+
+def ensure_headshots_table(cursor):
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {HEADSHOTS_TABLE} (
+            playerId TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            found INTEGER NOT NULL,
+            checked_at REAL NOT NULL
+        )
+    """)
+
+
+def cached_headshots(cursor, player_ids, now=None):
+    """{playerId: url, or None if known missing} for the players whose last check has not expired."""
+    now = time.time() if now is None else now
+    player_ids = list(player_ids)
+    fresh = {}
+    for start in range(0, len(player_ids), LOOKUP_CHUNK):
+        chunk = player_ids[start:start + LOOKUP_CHUNK]
+        cursor.execute(f"SELECT playerId, url, found, checked_at FROM {HEADSHOTS_TABLE} "
+                       f"WHERE playerId IN ({', '.join('?' * len(chunk))})", chunk)
+        for player_id, url, found, checked_at in cursor.fetchall():
+            if now - checked_at < (FOUND_TTL if found else MISSING_TTL):
+                fresh[player_id] = url if found else None
+    return fresh
+
+
+async def _live_status(session, url):
+    async with session.head(url) as response:
+        return response.status
+
+
+async def _stub_status(session, url):
+    await asyncio.sleep(STUB_LATENCY)
+    return 404 if zlib.crc32(url.encode()) % 100 < STUB_MISSING_PERCENT else 200
+
+
+async def _check(session, semaphore, status_of, errors, url):
+    """True if the URL answers below 400, False if it does not, None when no definite answer came back.
+
+    The semaphore is held per attempt only, so URLs waiting out a retry backoff leave their slot to others.
+    """
+    for attempt in range(ATTEMPTS):
+        if attempt:
+            await asyncio.sleep(2 ** (attempt - 1))
+        async with semaphore:
+            try:
+                status = await status_of(session, url)
+            except errors:
+                continue
+        if status not in RETRY_STATUSES:
+            return status < 400
+    return None
+
+
+async def _check_all(urls, concurrency, stub):
+    semaphore = asyncio.Semaphore(concurrency)
+    if stub:
+        return await asyncio.gather(*(_check(None, semaphore, _stub_status, (), url) for url in urls))
+    # Only live checks need aiohttp, so stub runs and cache lookups work without it
+    import aiohttp
+    errors = (aiohttp.ClientError, asyncio.TimeoutError)
+    connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector,
+                                     timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)) as session:
+        return await asyncio.gather(*(_check(session, semaphore, _live_status, errors, url) for url in urls))
+
+
+def validate_headshots(cursor, player_ids, concurrency=DEFAULT_CONCURRENCY, stub=False, refresh=False):
+    """Headshot URL (None when there is none) of every player; returns (headshots, stats).
+
+    Fresh Headshot_Cache entries are used as they are (refresh=True rechecks everyone); the rest are checked
+    with at most concurrency requests in flight and cached. Players whose check failed outright come back
+    as None and are not cached, so the next run tries them again.
+    """
+    start = time.time()
+    ensure_headshots_table(cursor)
+    player_ids = list(dict.fromkeys(str(player_id) for player_id in player_ids))
+    headshots = {} if refresh else cached_headshots(cursor, player_ids)
+    stats = {'players': len(player_ids), 'cached': len(headshots), 'found': 0, 'missing': 0, 'failed': 0}
+
+    pending = [player_id for player_id in player_ids if player_id not in headshots]
+    urls = [headshot_url(player_id) for player_id in pending]
+    results = asyncio.run(_check_all(urls, concurrency, stub)) if urls else []
+    checked_at = time.time()
+    rows = []
+    for player_id, url, found in zip(pending, urls, results):
+        headshots[player_id] = url if found else None
+        if found is None:
+            stats['failed'] += 1
+            continue
+        stats['found' if found else 'missing'] += 1
+        rows.append((player_id, url, int(found), checked_at))
+    cursor.executemany(f"INSERT OR REPLACE INTO {HEADSHOTS_TABLE} VALUES (?, ?, ?, ?)", rows)
+    stats['seconds'] = time.time() - start
+    return headshots, stats
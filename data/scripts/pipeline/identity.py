@@ -0,0 +1,134 @@
+import json
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from pipeline.config import PLAYER_IDENTITY_FILE
+
+# Players_Basic columns the loaders key PFF rows on. player_id_PFF is always set (rows without one are
+# never matched); rowid keeps the original table order so last-row-wins lookups stay the same.
+IDENTITY_SCHEMA = pa.schema([
+    ("rowid", pa.int64()),
+    ("playerId", pa.string()),
+    ("player_id_PFF", pa.string()),
+    ("name", pa.string()),
+    ("team", pa.string()),
+    ("teamID", pa.int64()),
+    ("year", pa.int64()),
+    ("position", pa.string()),
+])
+IDENTITY_COLUMNS = tuple(name for name in IDENTITY_SCHEMA.names if name != "rowid")
+
+
+# ============================================================================
+# Artifact: one uncompressed Arrow IPC file sorted by (position, rowid), so a loader that needs a few
+# positions memory-maps the file and slices out just those rows. The schema metadata holds
+#   signature  - cheap Players_Basic summary used to detect a stale file
+#   positions  - [[position, start, stop], ...] row ranges (the position-group index)
+# populate_players_basic.py rebuilds it after every roster load; readers rebuild it themselves if the
+# signature no longer matches, e.g. after a manual edit of a player's PFF id, position or team.
+# ============================================================================
+
+def players_basic_signature(cursor):
+    """Row counts plus rowid-weighted checksums of the keyed columns, cheap enough to check on every load.
+
+    Catches inserts, deletes, team moves and in-place edits of player_id_PFF, position (first three
+    letters and length) and year, including values swapped between rows. Name and team text are not
+    checksummed; populate_players_basic.py rebuilds the map explicitly after every roster load.
+    """
+    cursor.execute("""
+        SELECT COUNT(*), MAX(rowid), COUNT(player_id_PFF), TOTAL(teamID),
+               TOTAL(rowid * CAST(player_id_PFF AS INTEGER)), TOTAL(rowid * length(player_id_PFF)),
+               TOTAL(rowid * unicode(position)), TOTAL(rowid * unicode(substr(position, 2))),
+               TOTAL(rowid * unicode(substr(position, 3))), TOTAL(rowid * length(position)),
+               TOTAL(rowid * year)
+        FROM Players_Basic
+    """)
+    return json.dumps(cursor.fetchone())
+
+
+def _column(values, field):
+    # Players_Basic has TEXT affinity on ids but older rows can hold integers; normalise before Arrow typing
+    if pa.types.is_string(field.type):
+        values = [None if v is None else str(v) for v in values]
+    return pa.array(values, type=field.type)
+
+
+def build_player_identity(cursor, path=PLAYER_IDENTITY_FILE, signature=None):
+    """Write the identity artifact from Players_Basic and return the freshly built table."""
+    signature = signature or players_basic_signature(cursor)
+    cursor.execute(f"""
+        SELECT {', '.join(IDENTITY_SCHEMA.names)}
+        FROM Players_Basic
+        WHERE player_id_PFF IS NOT NULL
+        ORDER BY position, rowid
+    """)
+    rows = cursor.fetchall()
+    columns = list(zip(*rows)) if rows else [[] for _ in IDENTITY_SCHEMA]
+    table = pa.Table.from_arrays([_column(values, field) for values, field in zip(columns, IDENTITY_SCHEMA)],
+                                 schema=IDENTITY_SCHEMA)
+
+    positions = []
+    for i, (*_, position) in enumerate(rows):
+        if positions and positions[-1][0] == position:
+            positions[-1][2] = i + 1
+        else:
+            positions.append([position, i, i + 1])
+    table = table.replace_schema_metadata({
+        "signature": signature,
+        "positions": json.dumps(positions),
+        "built_at": datetime.now().isoformat(timespec='seconds'),
+    })
+
+    try:
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with pa.OSFile(str(tmp), 'wb') as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        tmp.replace(path)
+        print(f"  ✓ Built player identity map ({len(rows)} rows, {len(positions)} positions) at {path}")
+    except OSError as e:
+        print(f"  ⚠ Could not write player identity map to {path}: {e}; using it in memory only")
+    return table
+
+
+def load_player_identity(cursor, path=PLAYER_IDENTITY_FILE):
+    """Memory-map the identity artifact, rebuilding it first if it is missing or Players_Basic changed.
+
+    Returns {'table': Arrow table, 'positions': {position: (start, stop)}} for select_players().
+    """
+    signature = players_basic_signature(cursor)
+    table = None
+    if path.exists():
+        try:
+            table = ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+        except (pa.ArrowInvalid, OSError):
+            table = None
+        if table is not None and (table.schema.metadata or {}).get(b"signature", b"").decode() != signature:
+            table = None
+    if table is None:
+        table = build_player_identity(cursor, path, signature)
+    positions = json.loads(table.schema.metadata[b"positions"])
+    return {
+        'table': table,
+        'positions': {position: (start, stop) for position, start, stop in positions},
+    }
+
+
+def select_players(identity, columns=IDENTITY_COLUMNS, positions=None):
+    """Rows (tuples in the order of columns) for the given positions (all by default), in Players_Basic order.
+
+    Mirrors `SELECT <columns> FROM Players_Basic WHERE position IN (<positions>)` restricted to rows with a
+    PFF id, so dict comprehensions keyed on the result keep the same last-row-wins behaviour.
+    """
+    table = identity['table']
+    if positions is None:
+        table = table.sort_by("rowid")
+    else:
+        ranges = [identity['positions'][p] for p in dict.fromkeys(positions) if p in identity['positions']]
+        if not ranges:
+            return []
+        table = pa.concat_tables([table.slice(start, stop - start) for start, stop in ranges])
+        if len(ranges) > 1:
+            table = table.sort_by("rowid")
+    return list(zip(*(table.column(col).to_pylist() for col in columns)))
@@ -0,0 +1,93 @@
+import hashlib
+from datetime import datetime
+
+# Every PFF CSV we ingest is recorded here so reruns can skip files that have not changed.
+MANIFEST_TABLE = "Ingest_Manifest"
+
+
+def ensure_manifest_table(cursor):
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+            report TEXT NOT NULL,
+            path TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime REAL NOT NULL,
+            sha256 TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            week INTEGER,
+            seasonType TEXT,
+            ingested_at TEXT NOT NULL,
+            PRIMARY KEY (report, path)
+        )
+    """)
+
+
+def file_hash(path):
+    """sha256 of a file's contents, read in 1 MB chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(cursor, report):
+    """path -> {'size', 'mtime', 'sha256', 'partition'} for everything previously ingested for a report."""
+    cursor.execute(f"""
+        SELECT path, size, mtime, sha256, year, week, seasonType
+        FROM {MANIFEST_TABLE}
+        WHERE report = ?
+    """, (report,))
+    return {
+        path: {'size': size, 'mtime': mtime, 'sha256': sha, 'partition': (year, week, seasonType)}
+        for path, size, mtime, sha, year, week, seasonType in cursor.fetchall()
+    }
+
+
+def diff_files(manifest, files):
+    """Compare current files against the manifest.
+
+    files is a list of (path, partition). Size+mtime matches are trusted without hashing; otherwise the
+    content hash decides, so a touched-but-identical export is not re-ingested.
+    Returns (entries, changed_partitions, removed_paths) where entries are the manifest rows to write
+    for new/changed files.
+    """
+    entries = []
+    changed_partitions = set()
+    seen = set()
+    for path, partition in files:
+        key = str(path)
+        seen.add(key)
+        stat = path.stat()
+        previous = manifest.get(key)
+        if previous and previous['size'] == stat.st_size and previous['mtime'] == stat.st_mtime \
+                and previous['partition'] == partition:
+            continue
+        sha = file_hash(path)
+        entries.append((key, stat.st_size, stat.st_mtime, sha, partition))
+        if previous and previous['sha256'] == sha and previous['partition'] == partition:
+            continue  # Touched but identical; just refresh size/mtime
+        changed_partitions.add(partition)
+        if previous and previous['partition'] != partition:
+            changed_partitions.add(previous['partition'])
+
+    removed_paths = [path for path in manifest if path not in seen]
+    for path in removed_paths:
+        changed_partitions.add(manifest[path]['partition'])
+    return entries, changed_partitions, removed_paths
+
+
+def record_files(cursor, report, entries, removed_paths=()):
+    """Upsert manifest rows for ingested files and forget files that disappeared."""
+    ingested_at = datetime.now().isoformat(timespec='seconds')
+    cursor.executemany(f"""
+        INSERT OR REPLACE INTO {MANIFEST_TABLE} (report, path, size, mtime, sha256, year, week, seasonType, ingested_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(report, path, size, mtime, sha, *partition, ingested_at) for path, size, mtime, sha, partition in entries])
+    cursor.executemany(f"DELETE FROM {MANIFEST_TABLE} WHERE report = ? AND path = ?",
+                       [(report, path) for path in removed_paths])
+
+
+def reset_manifest(cursor, report):
+    """Forget everything recorded for a report (used before a full rebuild)."""
+    cursor.execute(f"DELETE FROM {MANIFEST_TABLE} WHERE report = ?", (report,))
@@ -0,0 +1,360 @@
+import time
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+from pipeline.config import PFF_DATA_DIR
+from pipeline.parsing import read_header
+from pipeline.columnar import read_season_export
+from pipeline.teams import resolve_team
+
+# Season grade reports whose players are PFF-ID candidates, read in this order
+CANDIDATE_REPORTS = ("Rushing/SeasonReports/{year}_RushingGrades.csv",
+                     "Passing/SeasonReports/{year}_PassingGrades.csv",
+                     "Receiving/SeasonReports/{year}_ReceivingGrades.csv",
+                     "Blocking/SeasonReports/{year}_BlockingGrades.csv",
+                     "Defense/SeasonReports/{year}_DefenseGrades.csv")
+IDENTITY_COLS = ("player", "team_name", "player_id", "position")
+# Lowest fuzz.ratio-style name score (0-100) accepted as a match
+MATCH_THRESHOLD = 80
+
+POSITION_ALIASES = {
+    "hb": ["rb", "hb"],
+    "rb": ["rb", "hb"],
+    "ol": ["ol", "c", "g", "t", "og", "ot"],
+    "c": ["c", "ol"], "g": ["g", "ol", "og"],
+    "t": ["t", "ol", "ot"], "og": ["og", "g", "ol"],
+    "ot": ["ot", "t", "ol"],
+    "qb": ["qb", "te"],
+    "wr": ["wr", "qb"],
+    "te": ["te", "qb", "wr"],
+    "fb": ["fb"],
+    "lb": ["lb", "ilb", "olb"],
+    "ilb": ["ilb", "lb"],
+    "olb": ["olb", "lb"],
+    "s": ["s", "fs", "ss"],
+    "fs": ["fs", "s"],
+    "ss": ["ss", "s"],
+    "cb": ["cb"],
+    "db": ["db", "cb", "s"],
+    "de": ["ed"],
+    "dt": ["dt", "di"],
+    "dl": ["dl", "de", "dt", "di"],
+    "k": ["k"],
+    "p": ["p"],
+    "edge": ["ed"]
+}
+
+def allowed_positions(position):
+    """PFF positions a roster position may match (itself when it has no aliases)."""
+    position = position.lower().strip() if position else "unknown"
+    return POSITION_ALIASES.get(position, [position])
+
+
+def _position_groups():
+    """Position -> group id, where a group is every position linked through POSITION_ALIASES."""
+    parent = {}
+
+    def root(position):
+        parent.setdefault(position, position)
+        while parent[position] != position:
+            parent[position] = parent[parent[position]]
+            position = parent[position]
+        return position
+
+    for position, aliases in POSITION_ALIASES.items():
+        for alias in aliases:
+            parent[root(alias)] = root(position)
+    return {position: root(position) for position in parent}
+
+
+POSITION_GROUPS = _position_groups()
+
+
+def position_group(position):
+    position = position.lower().strip() if position else "unknown"
+    return POSITION_GROUPS.get(position, position)
+
+
+@lru_cache(maxsize=10000)
+def normalize_name(name):
+    """Normalize a player name for fuzzy matching."""
+    return tuple(
+        name.lower().strip()
+        .replace(".", "").replace("'", "").replace("-", " ")
+        .replace("jr", "").replace("sr", "")
+        .replace("ii", "").replace("iii", "")
+        .replace("dj ", "d j ").replace("aj ", "a j ")
+        .replace("ollie ", "o ")
+        .split()
+    )
+
+
+_PFF_CANDIDATES = {}
+
+
+def load_pff_candidates(year, team_index):
+    """{teamID: [(pff_id, normalized name, pff position), ...]} from the season grade CSVs.
+
+    team_name values resolve through team_index (pipeline/teams.py); players of teams it does not know are
+    skipped and the names reported. Loaded once per year. A player listed in several reports is a candidate
+    once, with the position of the first report that lists the player.
+    """
+    if year in _PFF_CANDIDATES:
+        return _PFF_CANDIDATES[year]
+
+    print(f"Loading PFF data for year {year}...")
+    start_time = time.time()
+    candidates, seen, unknown = {}, set(), set()
+    for report in CANDIDATE_REPORTS:
+        csv_path = PFF_DATA_DIR / report.format(year=year)
+        if not csv_path.exists():
+            continue
+        if not set(IDENTITY_COLS).issubset(read_header(csv_path)):
+            print(f"Invalid CSV format in {csv_path}: missing required columns")
+            continue
+        table = read_season_export(csv_path, columns=list(IDENTITY_COLS))
+        for player_name, team_name, player_id, position in zip(*(table.column(col).to_pylist() for col in IDENTITY_COLS)):
+            player_name = (player_name or "").strip()
+            team_name = (team_name or "").strip()
+            position = (position or "").lower().strip()
+            if not (player_name and player_id and position and team_name) or player_id in seen:
+                continue
+            team_id = resolve_team(team_index, team_name)
+            if team_id is None:
+                unknown.add(team_name)
+                continue
+            seen.add(player_id)
+            candidates.setdefault(team_id, []).append((player_id, " ".join(normalize_name(player_name)), position))
+
+    print(f"  ✓ Loaded PFF data in {time.time() - start_time:.2f}s")
+    if unknown:
+        print(f"  ℹ {len(unknown)} PFF team(s) not in Team_Aliases: {', '.join(sorted(unknown))}")
+    _PFF_CANDIDATES[year] = candidates
+    return candidates
+
+
+# ============================================================================
+# Blocked matching: rosters and PFF candidates are split by (teamID, position group), where a
+# group is every position linked by POSITION_ALIASES. Unambiguous exact names pair up, every remaining
+# allowed pair of a season is scored in one vectorized pass, and each block keeps the one-to-one assignment
+# with the highest total score. The old loop scored pairs one fuzz.ratio call at a time and assigned
+# greedily through used_pff_ids, so the result depended on roster order.
+# ============================================================================
+
+# Set bits per byte value, for popcounts of uint64 arrays
+_BYTE_BITS = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+# Longest name the bit-parallel scorer handles in full; longer names are cut to this many characters
+MAX_NAME_LENGTH = 64
+
+
+def _popcount(words):
+    return _BYTE_BITS[words.view(np.uint8)].reshape(*words.shape, 8).sum(axis=-1)
+
+
+def _char_codes(names, width):
+    """(names x width) array of code points, 0 past the end of each name."""
+    padded = "".join(name.ljust(width, "\0") for name in names)
+    return np.frombuffer(padded.encode("utf-32-le"), dtype=np.uint32).reshape(len(names), width)
+
+
+def name_scores(left, right, pairs=None):
+    """fuzz.ratio scores, round(100 * 2 * LCS / (len(a) + len(b))), of left against right names.
+
+    Returns the (len(left) x len(right)) matrix, or with pairs=(left indices, right indices) just those
+    pairs as a flat array. The longest common subsequences are computed together with the bit-parallel LCS
+    recurrence (one uint64 bit per character of the left name), walking the right names a character at a
+    time. This is the Indel ratio python-Levenshtein and rapidfuzz compute, so scores equal fuzz.ratio with
+    either of them installed. Empty names score 0.
+    """
+    left = [name[:MAX_NAME_LENGTH] for name in left]
+    right = [name[:MAX_NAME_LENGTH] for name in right]
+    left_lengths = np.array([len(name) for name in left], dtype=np.int64)
+    right_lengths = np.array([len(name) for name in right], dtype=np.int64)
+    left_codes = _char_codes(left, int(left_lengths.max(initial=0)))
+    right_codes = _char_codes(right, int(right_lengths.max(initial=0)))
+    alphabet, index = np.unique(np.concatenate([left_codes.ravel(), right_codes.ravel(), [0]]), return_inverse=True)
+    left_index = index[:left_codes.size].reshape(left_codes.shape)
+    right_index = index[left_codes.size:-1].reshape(right_codes.shape)
+
+    # match[i, c]: bits of left name i where character c sits; padding (code 0, column 0) never matches
+    match = np.zeros((len(left), len(alphabet)), dtype=np.uint64)
+    everyone = np.arange(len(left))
+    for k in range(left_codes.shape[1]):
+        match[everyone, left_index[:, k]] |= np.uint64(1 << k)
+    match[:, 0] = 0
+
+    if pairs is None:
+        lefts, rights = np.repeat(np.arange(len(left)), len(right)), np.tile(np.arange(len(right)), len(left))
+    else:
+        lefts, rights = (np.asarray(indices, dtype=np.intp) for indices in pairs)
+    rows = np.full(len(lefts), np.iinfo(np.uint64).max, dtype=np.uint64)
+    for k in range(right_codes.shape[1]):
+        matched = match[lefts, right_index[rights, k]]
+        rows = (rows + (rows & matched)) | (rows & ~matched)
+
+    masks = np.array([(1 << len(name)) - 1 for name in left], dtype=np.uint64)
+    common = _popcount(~rows & masks[lefts])
+    total = left_lengths[lefts] + right_lengths[rights]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = np.where((left_lengths[lefts] == 0) | (right_lengths[rights] == 0), 0,
+                          np.round(200.0 * common / total)).astype(np.int64)
+    return scores.reshape(len(left), len(right)) if pairs is None else scores
+
+
+def _hungarian(weights):
+    """(row, column) pairs maximizing the total weight of a dense matrix, each row and column used once.
+
+    Hungarian method with shortest augmenting paths (O(n^2 m) for n <= m), the column scans vectorized.
+    """
+    transposed = weights.shape[0] > weights.shape[1]
+    cost = -(weights.T if transposed else weights)
+    n, m = cost.shape
+    u, v = np.zeros(n + 1), np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=np.intp)  # owner[j]: 1-based row holding column j (0 = free)
+    way = np.zeros(m + 1, dtype=np.intp)
+    for i in range(1, n + 1):
+        owner[0], column = i, 0
+        slack = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while owner[column]:
+            used[column] = True
+            row = owner[column]
+            free = ~used
+            reduced = cost[row - 1] - u[row] - v[1:]
+            better = free[1:] & (reduced < slack[1:])
+            slack[1:][better] = reduced[better]
+            way[1:][better] = column
+            candidates = np.where(free[1:], slack[1:], np.inf)
+            column = int(np.argmin(candidates)) + 1
+            delta = candidates[column - 1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            slack[free] -= delta
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+
+    pairs = [(int(owner[j]) - 1, j - 1) for j in range(1, m + 1) if owner[j]]
+    return [(column, row) for row, column in pairs] if transposed else pairs
+
+
+def best_assignment(weights):
+    """(row, column) pairs that maximize the total weight, each row and column used at most once.
+
+    Only positive weights can pair. Rows and columns linked through positive weights form independent
+    sub-problems: a lone pair is taken as is, a single row or column takes its best partner (ties to the
+    lowest index) and anything larger goes to the Hungarian method. Name blocks are sparse, so most
+    sub-problems are a single pair.
+    """
+    weights = np.asarray(weights, dtype='float64')
+    n = weights.shape[0]
+    positive = weights > 0
+    # A pair that is the only positive weight in both its row and its column is a sub-problem of its own
+    alone = positive & (positive.sum(axis=1) == 1)[:, None] & (positive.sum(axis=0) == 1)[None, :]
+    pairs = list(zip(*(indices.tolist() for indices in np.nonzero(alone))))
+    rows, columns = np.nonzero(positive & ~alone)
+    # Union-find over rows 0..n-1 and columns n..n+m-1
+    parent = list(range(n + weights.shape[1]))
+
+    def root(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for row, column in zip(rows.tolist(), columns.tolist()):
+        parent[root(n + column)] = root(row)
+    components = {}
+    for row, column in zip(rows.tolist(), columns.tolist()):
+        members = components.setdefault(root(row), (set(), set()))
+        members[0].add(row)
+        members[1].add(column)
+
+    for component_rows, component_columns in components.values():
+        component_rows, component_columns = sorted(component_rows), sorted(component_columns)
+        block = weights[np.ix_(component_rows, component_columns)]
+        if len(component_rows) == 1:
+            pairs.append((component_rows[0], component_columns[int(np.argmax(block[0]))]))
+        elif len(component_columns) == 1:
+            pairs.append((component_rows[int(np.argmax(block[:, 0]))], component_columns[0]))
+        else:
+            pairs += [(component_rows[row], component_columns[column]) for row, column in _hungarian(block)
+                      if block[row, column] > 0]
+    return sorted(pairs)
+
+
+def _allowed_pairs(players, candidates):
+    """(player indices, candidate indices) of the pairs whose PFF position is an alias of the roster position."""
+    # Positions repeat a lot within a block, so the alias check runs once per distinct pair of positions
+    player_positions, player_index = np.unique([player[2] or "" for player in players], return_inverse=True)
+    candidate_positions, candidate_index = np.unique([candidate[2] for candidate in candidates], return_inverse=True)
+    allowed = np.array([[position in allowed_positions(roster_position) for position in candidate_positions]
+                        for roster_position in player_positions])
+    return np.nonzero(allowed[np.ix_(player_index, candidate_index)])
+
+
+def match_teams(rosters, candidates, threshold=MATCH_THRESHOLD):
+    """Optimal one-to-one PFF matches for many teams; returns {player key: (pff_id, pff position, score)}.
+
+    rosters maps each teamID to its players, (key, normalized name, roster position); candidates
+    maps it to (pff_id, normalized name, pff position) tuples. A pair can match only if the PFF position is
+    one of the roster position's aliases. Names that are unique on both sides and identical pair up
+    directly; the rest need a name score of at least threshold, and among those the assignment with the
+    highest total margin over the threshold wins.
+    """
+    blocks = {}
+    for team, players in rosters.items():
+        for player in sorted(players, key=lambda player: str(player[0])):
+            blocks.setdefault((team, position_group(player[2])), ([], []))[0].append(player)
+    for team, team_candidates in candidates.items():
+        for candidate in sorted(team_candidates):
+            if (team, position_group(candidate[2])) in blocks:
+                blocks[team, position_group(candidate[2])][1].append(candidate)
+
+    matches, scored = {}, []
+    for block_players, block_candidates in blocks.values():
+        # A name found exactly once among the block's players and once among its candidates, at an allowed
+        # position, is taken as is
+        player_names = Counter(player[1] for player in block_players)
+        candidate_names = {}
+        for candidate in block_candidates:
+            candidate_names.setdefault(candidate[1], []).append(candidate)
+        exact = set()
+        for key, name, position in block_players:
+            found = candidate_names.get(name, [])
+            if player_names[name] == 1 and len(found) == 1 and found[0][2] in allowed_positions(position):
+                matches[key] = (found[0][0], found[0][2], 100)
+                exact.add(found[0][0])
+        block_players = [player for player in block_players if player[0] not in matches]
+        block_candidates = [candidate for candidate in block_candidates if candidate[0] not in exact]
+        if block_players and block_candidates:
+            scored.append((block_players, block_candidates, *_allowed_pairs(block_players, block_candidates)))
+    if not scored:
+        return matches
+
+    # Every remaining allowed pair of every block, scored in one pass over the flattened name lists
+    left_offsets = np.cumsum([0] + [len(block[0]) for block in scored])
+    right_offsets = np.cumsum([0] + [len(block[1]) for block in scored])
+    scores = name_scores([player[1] for block in scored for player in block[0]],
+                         [candidate[1] for block in scored for candidate in block[1]],
+                         (np.concatenate([block[2] + offset for block, offset in zip(scored, left_offsets)]),
+                          np.concatenate([block[3] + offset for block, offset in zip(scored, right_offsets)])))
+    pair_offsets = np.cumsum([0] + [len(block[2]) for block in scored])
+
+    for (block_players, block_candidates, rows, columns), start, end in zip(scored, pair_offsets, pair_offsets[1:]):
+        block_scores = scores[start:end]
+        # A match is worth its margin over the threshold, so one exact name outweighs two borderline ones
+        weights = np.zeros((len(block_players), len(block_candidates)))
+        weights[rows, columns] = np.where(block_scores >= threshold, block_scores - threshold + 1, 0)
+        for row, column in best_assignment(weights):
+            pff_id, _, pff_position = block_candidates[column]
+            matches[block_players[row][0]] = (pff_id, pff_position, int(weights[row, column] + threshold - 1))
+    return matches
+
+
+def match_team(players, candidates, threshold=MATCH_THRESHOLD):
+    """match_teams() for a single team's players and PFF candidates."""
+    return match_teams({None: players}, {None: candidates}, threshold)
@@ -0,0 +1,116 @@
+import re
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+
+from pipeline.matching import MATCH_THRESHOLD, name_scores
+
+NAME_SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv", "v"})
+# Fuzzy fallback: candidates sharing the most trigrams with the query that get fully scored
+SHORTLIST = 8
+
+
+# ============================================================================
+# Name index: entries (a Players_Basic row, say) are grouped into partitions such as (teamID, season), and
+# each partition keeps two maps from its names to entry slots. The exact map is keyed on the
+# normalized name; the trigram map is keyed on character trigrams of it and is only consulted when the
+# exact key misses. Lookups then touch a handful of shortlisted names instead of scoring every name on the
+# roster, and match_names() scores all shortlisted pairs of a batch in one name_scores() call.
+# ============================================================================
+
+@lru_cache(maxsize=None)
+def name_tokens(name):
+    """Lower-case ascii tokens of a person's name, with apostrophes, periods and suffixes (Jr., III) dropped.
+
+    "D'Andre Swift-Jones Jr." becomes ('dandre', 'swift', 'jones').
+    """
+    text = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode().casefold()
+    tokens = re.sub(r"[^a-z0-9]+", " ", re.sub(r"['.]", "", text)).split()
+    return tuple(token for token in tokens if token not in NAME_SUFFIXES)
+
+
+def name_key(name):
+    """Exact-match key: the name's tokens run together, so 'De Andre' and 'DeAndre' share it."""
+    return "".join(name_tokens(name))
+
+
+def trigrams(key):
+    """Character trigrams of a name key, padded so that the first and last letters carry weight."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def build_name_index(entries):
+    """Index (partition, name, value) entries; returns the index match_names() and lookup_name() read.
+
+    Entries keep their input order within a partition, and that order breaks ties between equal scores.
+    """
+    index = {'keys': [], 'values': [], 'partitions': {}}
+    for partition, name, value in entries:
+        key = name_key(name)
+        if not key:
+            continue
+        slot = len(index['keys'])
+        index['keys'].append(key)
+        index['values'].append(value)
+        part = index['partitions'].setdefault(partition, {'slots': [], 'exact': {}, 'grams': {}})
+        part['slots'].append(slot)
+        part['exact'].setdefault(key, []).append(slot)
+        for gram in trigrams(key):
+            part['grams'].setdefault(gram, []).append(slot)
+    return index
+
+
+def _shortlist(part, key):
+    """Slots of the partition worth scoring against key: all of a small partition, else the top trigram hits."""
+    if len(part['slots']) <= SHORTLIST:
+        return part['slots']
+    shared = Counter()
+    for gram in trigrams(key):
+        shared.update(part['grams'].get(gram, ()))
+    return sorted(shared, key=lambda slot: (-shared[slot], slot))[:SHORTLIST]
+
+
+def match_names(index, queries, threshold=MATCH_THRESHOLD):
+    """Best entry for each (partitions, name) query; returns a [(value, score) or (None, 0)] list.
+
+    partitions is tried in order and the first one holding a name scoring at least threshold (fuzz.ratio on
+    name keys) wins. A name key found in a partition's exact map scores 100 without any fuzzy scoring.
+    """
+    results = [(None, 0)] * len(queries)
+    query_keys, pending = [], []
+    for position, (partitions, name) in enumerate(queries):
+        key = name_key(name)
+        parts = [index['partitions'][partition] for partition in partitions if partition in index['partitions']]
+        if not key or not parts:
+            continue
+        if key in parts[0]['exact']:
+            results[position] = (index['values'][parts[0]['exact'][key][0]], 100)
+            continue
+        # Later partitions are only used when earlier ones hold no fuzzy match, so they are scored too
+        query_keys.append(key)
+        pending.append((position, [part['exact'][key][:1] if key in part['exact'] else _shortlist(part, key)
+                                   for part in parts]))
+
+    lefts, rights = [], []
+    for row, (_, shortlists) in enumerate(pending):
+        for slots in shortlists:
+            lefts.extend([row] * len(slots))
+            rights.extend(slots)
+    scores = iter(name_scores(query_keys, index['keys'], pairs=(lefts, rights)).tolist() if lefts else [])
+
+    for position, shortlists in pending:
+        for slots in shortlists:
+            best_slot, best_score = None, 0
+            for slot in slots:
+                score = next(scores)
+                if score >= threshold and (score > best_score or score == best_score and slot < best_slot):
+                    best_slot, best_score = slot, score
+            if best_slot is not None and results[position][0] is None:
+                results[position] = (index['values'][best_slot], best_score)
+    return results
+
+
+def lookup_name(index, partitions, name, threshold=MATCH_THRESHOLD):
+    """match_names() for a single query."""
+    return match_names(index, [(partitions, name)], threshold)[0]
@@ -0,0 +1,103 @@
+import hashlib
+from datetime import datetime
+
+# One row per team per game week, so opponent lookups are a primary-key probe instead of an
+# OR scan over Teams_Games (where a team can sit in either homeId or awayId).
+OPPONENTS_TABLE = "Team_Game_Opponents"
+# Fingerprint of the Teams_Games rows the table was built from
+OPPONENTS_SOURCE_TABLE = "Team_Game_Opponents_Source"
+
+
+def teams_games_fingerprint(cursor):
+    """sha256 over the Teams_Games columns the opponent table is derived from."""
+    digest = hashlib.sha256()
+    cursor.execute("""
+        SELECT id, season, week, seasonType, homeId, awayId
+        FROM Teams_Games
+        ORDER BY id, homeId, awayId
+    """)
+    for row in cursor.fetchall():
+        digest.update(repr(row).encode())
+    return digest.hexdigest()
+
+
+def rebuild_team_game_opponents(cursor, fingerprint=None):
+    """Rebuild Team_Game_Opponents from Teams_Games.
+
+    If a team shows up in two games for the same (season, week, seasonType), the lowest game id wins,
+    matching the first-match behaviour of the old correlated opponentID UPDATE.
+    """
+    fingerprint = fingerprint or teams_games_fingerprint(cursor)
+    cursor.execute(f"DROP TABLE IF EXISTS {OPPONENTS_TABLE}")
+    cursor.execute(f"""
+        CREATE TABLE {OPPONENTS_TABLE} (
+            teamId INTEGER NOT NULL,
+            season INTEGER NOT NULL,
+            week INTEGER NOT NULL,
+            seasonType TEXT NOT NULL,
+            opponentId INTEGER,
+            gameId INTEGER NOT NULL,
+            isHome INTEGER NOT NULL,
+            PRIMARY KEY (teamId, season, week, seasonType),
+            FOREIGN KEY (teamId) REFERENCES Teams(id),
+            FOREIGN KEY (opponentId) REFERENCES Teams(id),
+            FOREIGN KEY (gameId) REFERENCES Teams_Games(id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute(f"""
+        INSERT OR IGNORE INTO {OPPONENTS_TABLE} (teamId, season, week, seasonType, opponentId, gameId, isHome)
+        SELECT teamId, season, week, seasonType, opponentId, gameId, isHome
+        FROM (
+            SELECT homeId AS teamId, season, week, seasonType, awayId AS opponentId, id AS gameId, 1 AS isHome
+            FROM Teams_Games
+            UNION ALL
+            SELECT awayId, season, week, seasonType, homeId, id, 0
+            FROM Teams_Games
+        )
+        WHERE teamId IS NOT NULL AND season IS NOT NULL AND week IS NOT NULL AND seasonType IS NOT NULL
+        ORDER BY gameId, isHome DESC
+    """)
+    cursor.execute(f"SELECT COUNT(*) FROM {OPPONENTS_TABLE}")
+    count = cursor.fetchone()[0]
+
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {OPPONENTS_SOURCE_TABLE} (fingerprint TEXT NOT NULL, built_at TEXT NOT NULL)")
+    cursor.execute(f"DELETE FROM {OPPONENTS_SOURCE_TABLE}")
+    cursor.execute(f"INSERT INTO {OPPONENTS_SOURCE_TABLE} (fingerprint, built_at) VALUES (?, ?)",
+                   (fingerprint, datetime.now().isoformat(timespec='seconds')))
+    print(f"  ✓ Rebuilt {OPPONENTS_TABLE} ({count} team-games)")
+    return count
+
+
+def ensure_team_game_opponents(cursor):
+    """Rebuild Team_Game_Opponents if it is missing or Teams_Games changed since it was built."""
+    fingerprint = teams_games_fingerprint(cursor)
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name IN (?, ?)",
+                   (OPPONENTS_TABLE, OPPONENTS_SOURCE_TABLE))
+    if len(cursor.fetchall()) == 2:
+        cursor.execute(f"SELECT fingerprint FROM {OPPONENTS_SOURCE_TABLE}")
+        row = cursor.fetchone()
+        if row and row[0] == fingerprint:
+            return False
+    rebuild_team_game_opponents(cursor, fingerprint)
+    return True
+
+
+def load_opponent_index(cursor):
+    """(teamID, season, week, seasonType) -> opponent teamID for insert-time resolution."""
+    cursor.execute(f"SELECT teamId, season, week, seasonType, opponentId FROM {OPPONENTS_TABLE}")
+    return {(team_id, season, week, seasonType): opponent_id
+            for team_id, season, week, seasonType, opponent_id in cursor.fetchall()}
+
+
+def refresh_opponent_ids(cursor, table):
+    """Re-resolve opponentID on an existing weekly table through a keyed join; returns rows changed."""
+    opponent = f"""(
+        SELECT o.opponentId
+        FROM {OPPONENTS_TABLE} o
+        WHERE o.teamId = {table}.teamID
+          AND o.season = {table}.year
+          AND o.week = {table}.week
+          AND o.seasonType = {table}.seasonType
+    )"""
+    cursor.execute(f"UPDATE {table} SET opponentID = {opponent} WHERE opponentID IS NOT {opponent}")
+    return cursor.rowcount
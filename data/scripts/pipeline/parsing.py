@@ -0,0 +1,78 @@
+import csv
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+# Identity columns are always text (player_id matches Players_Basic.player_id_PFF, which is TEXT)
+TEXT_COLS = ("player", "player_id", "position", "team_name")
+# Cells that mean "no value". Anything else that is not a number becomes NaN by coercion, never an error.
+NULL_TOKENS = ["", "NA", "N/A", "NaN", "nan", "null", "NULL", "None"]
+
+TEXT, INT, FLOAT = "text", "int", "float"
+PLAYOFF_ROUNDS = ['1stPO', '2ndPO', '3rdPO', '4thPO']
+
+
+# ============================================================================
+# Column-wise PFF CSV parsing: the type of each column comes from the report's schema catalog
+# (pipeline/catalog.py), then every file of that report is decoded straight into float64 columns by
+# Arrow's CSV reader. Accepts anything float() does ('1e-3', '+2.5', '1.0e3'), unlike the old
+# val.replace('.', '').replace('-', '').isdigit() check which silently dropped those cells.
+# ============================================================================
+
+def _read_csv(csv_file, column_types, columns):
+    return pacsv.read_csv(csv_file, convert_options=pacsv.ConvertOptions(
+        column_types=column_types, null_values=NULL_TOKENS, strings_can_be_null=True,
+        include_columns=columns or []))
+
+
+def read_header(csv_file):
+    """Column names of a PFF CSV, in export order, without reading past the header line ([] if empty)."""
+    with open(csv_file, 'r', encoding='utf-8-sig', newline='') as f:
+        return next(csv.reader(f), [])
+
+
+def read_typed(csv_file, schema=None, columns=None):
+    """Read one PFF CSV as an Arrow table with text columns as strings and numeric columns as float64.
+
+    Columns not in schema are typed by inference (schema=None infers every column, as the catalog builder
+    does). columns, if given, is the projection: only those columns (each must be in the header) are
+    decoded, the rest of every line is skipped by the tokenizer. If a column the schema calls numeric holds
+    stray text in this export, the file is re-read with inference so numeric_block() can coerce the bad
+    cells to NaN instead of failing the whole file.
+    """
+    column_types = {col: pa.string() for col in TEXT_COLS}
+    column_types.update({col: (pa.string() if kind == TEXT else pa.float64())
+                         for col, kind in (schema or {}).items() if col not in column_types})
+    try:
+        return _read_csv(csv_file, column_types, columns)
+    except pa.ArrowInvalid:
+        if not schema:
+            raise
+        return _read_csv(csv_file, {col: pa.string() for col in TEXT_COLS}, columns)
+
+
+def numeric_block(table, cols):
+    """(rows x cols) float64 matrix with NaN for nulls; text columns are coerced so non-numbers become NaN."""
+    block = np.empty((table.num_rows, len(cols)), dtype='float64')
+    for j, col in enumerate(cols):
+        column = table.column(col)
+        if pa.types.is_string(column.type) or pa.types.is_large_string(column.type):
+            block[:, j] = pd.to_numeric(column.to_pandas(), errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+        else:
+            if not pa.types.is_floating(column.type):
+                column = column.cast(pa.float64())
+            block[:, j] = column.to_numpy()
+    return block
+
+
+def parse_week_token(game_type):
+    """Map the week part of a PFF filename (1, 15, CC, 2ndPO...) to (week, seasonType), or None if unsupported."""
+    if game_type.isdigit():
+        return int(game_type), 'regular'
+    if game_type == 'CC':
+        return 15, 'regular'
+    if game_type in PLAYOFF_ROUNDS:
+        return int(''.join(filter(str.isdigit, game_type))), 'postseason'
+    return None
@@ -0,0 +1,141 @@
+import time
+
+from pipeline.config import PFF_DATA_DIR
+from pipeline.reports import PERCENTILE_SOURCES, PERCENTILE_TABLES, RATING_TABLES
+from pipeline.db import deferred_indexes
+from pipeline.catalog import load_catalog, metric_columns, column_defs, parse_schema, unknown_columns
+from pipeline.parsing import read_header, numeric_block
+from pipeline.columnar import read_season_export
+from pipeline.identity import load_player_identity, select_players
+from pipeline.staging import StagingBuffer
+from pipeline.writer import write_rows
+
+
+# ============================================================================
+# Players_Full_Percentiles_* loading: every season export of the table's PFF family is parsed column-wise
+# with the report's catalog types (pipeline/parsing.py), the rows of the table's positions are merged per
+# (playerId, year) in a StagingBuffer, and the table is recreated with the columns and types of those
+# reports' schema catalogs and written in one pass. The populate_full_percentiles_*.py scripts then fill the
+# percentile_* columns and the rating.
+# ============================================================================
+
+def percentile_files(source):
+    """(csv_file, year, report) for every season export of the source's family, in merge order.
+
+    Seasons in order, and within a season the family's overall <family>Grades export last, so its counts
+    (tackles, player_game_count, ...) win over the situational reports that share those columns.
+    """
+    files = []
+    for csv_file in (PFF_DATA_DIR / source['family'] / "SeasonReports").glob("*.csv"):
+        year, _, report = csv_file.stem.partition('_')
+        if not year.isdigit() or not report:
+            print(f"  Skipping {csv_file.name}: Invalid filename format")
+            continue
+        files.append((csv_file, int(year), report))
+    grades = f"{source['family']}Grades"
+    return sorted(files, key=lambda file: (file[1], file[2] == grades, file[2]))
+
+
+def base_columns(source):
+    return ['playerId', 'year', 'name', 'team'] + (['teamID'] if source.get('team_id', True) else [])
+
+
+def players_for_source(cursor, source):
+    """player_id_PFF (or (player_id_PFF, year) for by_season sources) -> base values; the last row wins."""
+    players_basic = {}
+    for player_id, pff_id, year, name, team, team_id in select_players(
+            load_player_identity(cursor), ("playerId", "player_id_PFF", "year", "name", "team", "teamID"),
+            source['positions']):
+        key = (pff_id, year) if source.get('by_season') else pff_id
+        players_basic[key] = (player_id, name.lower(), team) + ((team_id,) if source.get('team_id', True) else ())
+    return players_basic
+
+
+def catalog_metrics(source, reports):
+    """metric column -> catalog declaring it: each report's catalog columns in catalog order, reports by name.
+
+    A column several reports ship keeps its first report's catalog (types agree within a family).
+    """
+    metric_cols = {}
+    for report in sorted(reports):
+        catalog = load_catalog(report)
+        for col in metric_columns(catalog, source['excluded_cols'], source.get('projection')):
+            metric_cols.setdefault(col, catalog)
+    return metric_cols
+
+
+def create_table(cursor, table, source, metric_cols):
+    """Drop and recreate the table: base columns, the qualifier and rating, then each metric with its percentile.
+
+    metric_cols comes from catalog_metrics(), so metrics keep their catalog types (counts are INTEGER).
+    """
+    qualifier = PERCENTILE_TABLES[table]['qualifier']
+    rating_col = f"{RATING_TABLES[table]['rating']} REAL,\n            " if table in RATING_TABLES else ""
+    team_id_col = "teamID INTEGER,\n            " if source.get('team_id', True) else ""
+    team_fk = ",\n            FOREIGN KEY (teamID) REFERENCES Teams(id)" if source.get('team_id', True) else ""
+    metric_defs = ''.join(f"{column_defs(catalog, [col])},\n            percentile_{col} INTEGER,\n            "
+                          for col, catalog in metric_cols.items() if col != qualifier)
+    cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            playerId INTEGER NOT NULL,
+            year INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            team TEXT NOT NULL,
+            {team_id_col}{column_defs(metric_cols[qualifier], [qualifier])},
+            percentile_{qualifier} INTEGER,
+            {rating_col}{metric_defs}PRIMARY KEY (playerId, year),
+            FOREIGN KEY (playerId) REFERENCES Players_Basic(playerId){team_fk}
+        )
+    """)
+    print(f"  ✓ Created {table} with {len(metric_cols)} metric columns")
+
+
+def load_percentile_table(cursor, table):
+    """Rebuild a Players_Full_Percentiles_* table from its PERCENTILE_SOURCES exports; returns load stats.
+
+    Cells that are not numbers are stored as NULL; secondary indexes are dropped for the load and
+    recreated after it. The caller commits.
+    """
+    source = PERCENTILE_SOURCES[table]
+    start = time.time()
+    files = percentile_files(source)
+    if not files:
+        raise FileNotFoundError(f"No season exports under {PFF_DATA_DIR / source['family'] / 'SeasonReports'}")
+    players_basic = players_for_source(cursor, source)
+
+    headers = {}
+    for csv_file, year, report in files:
+        header = read_header(csv_file)
+        if "player_id" not in header:
+            print(f"  Skipping {csv_file.name}: Missing player_id column")
+            continue
+        headers[(csv_file, year, report)] = header
+    metric_cols = catalog_metrics(source, {report for _, _, report in headers})
+
+    staged = StagingBuffer(base_columns(source), metric_cols)
+    unknown_cols = set()
+    for (csv_file, year, report), header in headers.items():
+        schema = parse_schema(load_catalog(report))
+        unknown_cols.update(unknown_columns(schema, header))
+        cols = [col for col in dict.fromkeys(header) if col in staged.metric_index]
+        if not cols:
+            continue
+        data = read_season_export(csv_file, schema, ["player_id"] + cols)
+        matched, staged_rows = [], []
+        for i, pff_id in enumerate(data.column("player_id").to_pylist()):
+            player = players_basic.get((pff_id, year) if source.get('by_season') else pff_id)
+            if player is None:
+                continue  # Not one of the table's positions
+            matched.append(i)
+            staged_rows.append(staged.row_for((player[0], year), (player[0], year) + player[1:]))
+        staged.merge(staged_rows, cols, numeric_block(data, cols)[matched])
+
+    if unknown_cols:
+        print(f"  ⚠ Skipped {len(unknown_cols)} column(s) not in the {source['family']} catalogs: "
+              f"{', '.join(sorted(unknown_cols))}; rerun populate/build_schema_catalog.py to pick them up")
+    # Indexes added to the table by hand survive the rebuild and are built once, after the rows are in
+    with deferred_indexes(cursor, table):
+        create_table(cursor, table, source, metric_cols)
+        written = write_rows(cursor, table, staged.base_cols + staged.metric_cols, staged.rows())
+    return {'files': len(headers), 'rows': written, 'metrics': len(metric_cols), 'seconds': time.time() - start}
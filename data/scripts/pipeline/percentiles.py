@@ -0,0 +1,210 @@
+import time
+
+import numpy as np
+
+from pipeline.config import DB_FILE
+from pipeline.db import connect, finish_bulk, table_exists
+from pipeline.distributions import (DISTRIBUTIONS_TABLE, DISTRIBUTIONS_SOURCE_TABLE, ensure_distributions_table,
+                                    percentile_rule, position_of, refresh_distributions)
+from pipeline.reports import LOWER_IS_BETTER_METRICS, PERCENTILE_TABLES
+from pipeline.sketches import (SKETCHES_TABLE, UNKNOWN_CONFERENCE, ensure_sketches_table, store_sketches,
+                               team_conferences)
+from pipeline.teams import load_team_index, resolve_team
+
+PERCENTILE_PREFIX = "percentile_"
+PERCENTILE_MODES = ("min_max", "rank")
+TIE_RULES = ("mid", "min", "max")
+
+
+# ============================================================================
+# Vectorized percentile engine for the Players_Full_Percentiles_* tables. The per-position scripts used to
+# run a MIN/MAX query and a full-table UPDATE for every (metric, year) pair; here each table is read once,
+# every (year, metric) slice is scaled with NumPy, and all percentile columns go back in one executemany.
+# Tables can instead use rank percentiles, where one outlier no longer compresses everyone else.
+# ============================================================================
+
+def lower_is_better(metric):
+    """True for LOWER_IS_BETTER_METRICS and their split variants (deep_twp_rate, man_missed_tackle_rate, ...)."""
+    return any(metric == name or metric.endswith("_" + name) for name in LOWER_IS_BETTER_METRICS)
+
+
+def percentile_columns(cursor, table):
+    """(metric, percentile column) pairs for every metric that has a percentile_ twin, in table order."""
+    columns = [row[1] for row in cursor.execute(f"PRAGMA table_info({table})")]
+    present = set(columns)
+    return [(col[len(PERCENTILE_PREFIX):], col) for col in columns
+            if col.startswith(PERCENTILE_PREFIX) and col[len(PERCENTILE_PREFIX):] in present]
+
+
+def min_max_percentiles(values, qualified, flat_value=None, bounds=None):
+    """Scale each column of a (players x metrics) slice to 0-100 over its qualified, non-null values.
+
+    Same arithmetic as the old SQL, (x - min) * 100.0 / (max - min), so results match it bit for bit before
+    rounding. Cells that are null or belong to unqualified rows are NaN. A metric whose qualified values are
+    all equal gets flat_value (NaN when None). bounds, when given, are the per-column (min, max) already
+    known for the slice.
+    """
+    pool = np.where(qualified[:, None], values, np.nan)
+    if bounds is None:
+        # fmin/fmax skip NaN; a column with no qualified values stays NaN
+        bounds = np.fmin.reduce(pool, axis=0), np.fmax.reduce(pool, axis=0)
+    low, high = bounds
+    span = high - low
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scaled = (pool - low) * 100.0 / span
+    flat = span == 0
+    if flat.any():
+        scaled[:, flat] = np.where(np.isnan(pool[:, flat]), np.nan, np.nan if flat_value is None else flat_value)
+    return scaled
+
+
+def rank_percentiles(values, qualified, inverted=None, ties="mid"):
+    """Rank each column of a (players x metrics) slice among its qualified, non-null values, on a 0-100 scale.
+
+    Each column is sorted once and every value is placed with searchsorted, so a slice costs O(n log n) per
+    metric. The lowest value scores 0 and the highest 100; with ties="mid" tied values share the average of
+    the ranks they span, "min"/"max" give them the lowest/highest. Columns flagged in inverted are ranked
+    in reverse. A metric with a single qualified value scores 50. Null and unqualified cells are NaN.
+    """
+    if ties not in TIE_RULES:
+        raise ValueError(f"Unknown tie rule {ties!r}; expected one of {', '.join(TIE_RULES)}")
+    pool = np.where(qualified[:, None], values, np.nan)
+    if inverted is not None:
+        pool[:, inverted] = -pool[:, inverted]
+    ranked = np.full(pool.shape, np.nan)
+    # NaN sorts last, so the first `count` entries of each sorted column are its qualified values
+    ordered = np.sort(pool, axis=0)
+    counts = np.count_nonzero(~np.isnan(pool), axis=0)
+    for j in np.flatnonzero(counts):
+        present = ~np.isnan(pool[:, j])
+        column, pool_sorted = pool[present, j], ordered[:counts[j], j]
+        if counts[j] == 1:
+            ranked[present, j] = 50.0
+            continue
+        below = np.searchsorted(pool_sorted, column, side='left')
+        if ties == "min":
+            position = below
+        else:
+            last = np.searchsorted(pool_sorted, column, side='right') - 1
+            position = last if ties == "max" else (below + last) / 2.0
+        ranked[present, j] = position * 100.0 / (counts[j] - 1)
+    return ranked
+
+
+def compute_percentiles(cursor, table, mode=None):
+    """Recompute every percentile_ column of a registered table for all years; returns a stats dict.
+
+    mode overrides the table's registered mode. Unqualified rows and null metrics get NULL percentiles.
+    Rounding is left to SQLite's ROUND() so values round exactly as they did when the scripts computed
+    them in SQL. Each year's qualified distributions are stored in Metric_Distributions, and per-conference
+    quantile sketches in Metric_Sketches, on the way; a year whose pool is unchanged since they were stored
+    takes its min-max bounds from Metric_Distributions and rewrites neither (stats['reused'] years).
+    """
+    spec = PERCENTILE_TABLES[table]
+    mode = mode or spec.get('mode', "min_max")
+    if mode not in PERCENTILE_MODES:
+        raise ValueError(f"Unknown percentile mode {mode!r}; expected one of {', '.join(PERCENTILE_MODES)}")
+    start = time.time()
+    pairs = percentile_columns(cursor, table)
+    metrics = [metric for metric, _ in pairs]
+    # Tables loaded with a stamped teamID skip name resolution; older ones resolve team through Team_Aliases
+    has_team_id = any(row[1] == "teamID" for row in cursor.execute(f"PRAGMA table_info({table})"))
+    cursor.execute(f"SELECT playerId, year, {'teamID' if has_team_id else 'NULL'}, team, {spec['qualifier']}, "
+                   f"{', '.join(metrics)} FROM {table}")
+    rows = cursor.fetchall()
+    stats = {'rows': len(rows), 'metrics': len(metrics), 'years': 0, 'mode': mode, 'distributions': 0,
+             'sketches': 0, 'reused': 0, 'seconds': 1e-6}
+    position, rule = position_of(table), percentile_rule(table)
+    ensure_distributions_table(cursor)
+    ensure_sketches_table(cursor)
+    if not rows:
+        for summary_table in (DISTRIBUTIONS_TABLE, SKETCHES_TABLE):
+            cursor.execute(f"DELETE FROM {summary_table} WHERE position = ? AND rule = ?", (position, rule))
+        cursor.execute(f"DELETE FROM {DISTRIBUTIONS_SOURCE_TABLE} WHERE position = ? AND engine = 'percentile'",
+                       (position,))
+        return stats
+
+    keys = [row[:2] for row in rows]
+    years = np.array([row[1] for row in rows])
+    team_index, conference_of = load_team_index(cursor), team_conferences(cursor)
+    conferences = np.array([conference_of.get((row[2] if row[2] is not None else resolve_team(team_index, row[3]),
+                                               row[1]), UNKNOWN_CONFERENCE) for row in rows], dtype=object)
+    # None becomes NaN
+    matrix = np.array([row[4:] for row in rows], dtype='float64')
+    qualified = matrix[:, 0] > spec['threshold']
+    values = matrix[:, 1:]
+
+    inverted = np.array([lower_is_better(metric) for metric in metrics], dtype=bool)
+
+    percentiles = np.full(values.shape, np.nan)
+    seasons = [int(year) for year in np.unique(years)]
+    for year in seasons:
+        in_year = years == year
+        pool = np.where(qualified[in_year, None], values[in_year], np.nan)
+        summary, written = refresh_distributions(cursor, position, year, "percentile", rule, metrics, pool,
+                                                 conferences[in_year].tolist())
+        if written is None:
+            stats['reused'] += 1
+        else:
+            stats['distributions'] += written
+            stats['sketches'] += store_sketches(cursor, position, year, rule, metrics, pool, conferences[in_year])
+        if mode == "rank":
+            percentiles[in_year] = rank_percentiles(values[in_year], qualified[in_year], inverted,
+                                                    spec.get('ties', "mid"))
+        else:
+            percentiles[in_year] = min_max_percentiles(values[in_year], qualified[in_year], spec['flat_value'],
+                                                       (summary['min'], summary['max']))
+        stats['years'] += 1
+    # Seasons no longer in the table keep no distributions or sketches
+    for summary_table in (DISTRIBUTIONS_TABLE, SKETCHES_TABLE):
+        cursor.execute(f"DELETE FROM {summary_table} WHERE position = ? AND rule = ? "
+                       f"AND year NOT IN ({', '.join('?' * len(seasons))})", (position, rule, *seasons))
+    cursor.execute(f"DELETE FROM {DISTRIBUTIONS_SOURCE_TABLE} WHERE position = ? AND engine = 'percentile' "
+                   f"AND year NOT IN ({', '.join('?' * len(seasons))})", (position, *seasons))
+
+    cells = percentiles.astype(object)
+    cells[np.isnan(percentiles)] = None
+    digits = spec['digits']
+    query = (f"UPDATE {table} SET {', '.join(f'{col} = ROUND(?, {digits})' for _, col in pairs)} "
+             f"WHERE playerId = ? AND year = ?")
+    cursor.executemany(query, (values_row + list(key) for values_row, key in zip(cells.tolist(), keys)))
+    stats['qualified'] = int(qualified.sum())
+    stats['seconds'] = max(time.time() - start, 1e-6)
+    return stats
+
+
+def main(tables=None, bulk=True, mode=None):
+    """Recompute the percentile columns of the requested tables (every registered table by default).
+
+    mode, when given, overrides every table's registered mode for this run.
+    """
+    tables = tables or list(PERCENTILE_TABLES)
+    unknown = [table for table in tables if table not in PERCENTILE_TABLES]
+    if unknown:
+        raise ValueError(f"Unknown percentile table(s): {', '.join(unknown)}")
+
+    conn = connect(DB_FILE, bulk=bulk)
+    cursor = conn.cursor()
+
+    print("=" * 80)
+    print(f"PERCENTILE ENGINE - {len(tables)} TABLE(S)")
+    print("=" * 80)
+
+    total = time.time()
+    try:
+        for table in tables:
+            if not table_exists(cursor, table):
+                print(f"  ✗ {table} does not exist; run its populate_full_percentiles script first")
+                continue
+            stats = compute_percentiles(cursor, table, mode)
+            conn.commit()
+            print(f"  ✓ {table} ({stats['mode']}): {stats['metrics']} metrics x {stats['rows']:,} rows over {stats['years']} year(s) "
+                  f"({stats.get('qualified', 0):,} qualified, {stats['reused']} from stored stats) in {stats['seconds']:.2f}s")
+        if bulk:
+            finish_bulk(conn)
+    finally:
+        conn.close()
+
+    print("\n" + "=" * 80)
+    print(f"✓ PERCENTILES COMPLETE in {time.time() - total:.1f}s")
+    print("=" * 80)
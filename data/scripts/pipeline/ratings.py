@@ -0,0 +1,109 @@
+import time
+
+import numpy as np
+
+from pipeline.config import DB_FILE
+from pipeline.db import connect, finish_bulk, table_exists
+from pipeline.distributions import ALL_SEASONS, ensure_distributions_table, position_of, rating_rule, refresh_distributions
+from pipeline.reports import PERCENTILE_TABLES, RATING_TABLES
+
+# The weighted z-score sum is mapped from [-Z_RANGE, Z_RANGE] onto 0-100
+Z_RANGE = 3.0
+
+
+# ============================================================================
+# Composite ratings (QBR, WRR, CBR, ...) for the Players_Full_Percentiles_* tables, driven by RATING_TABLES.
+# The per-position scripts used to run a mean/variance query per metric and then one UPDATE per player;
+# here each table is read once, every metric is standardized as a column, and all ratings go back in one
+# executemany.
+# ============================================================================
+
+def compute_ratings(cursor, table):
+    """Recompute the composite rating of a registered table for every row; returns a stats dict.
+
+    Rows that do not qualify (or have no games) get a NULL rating. The pooled distribution behind each
+    z-score is stored in Metric_Distributions under ALL_SEASONS and read back from there while the pool is
+    unchanged (stats['reused']); stats['historical'] maps each metric to the (mean, std) used.
+    """
+    spec, qualification = RATING_TABLES[table], PERCENTILE_TABLES[table]
+    start = time.time()
+    metrics = list(spec['weights'])
+    cursor.execute(f"SELECT playerId, year, {spec['rating']}, player_game_count, {qualification['qualifier']}, "
+                   f"{', '.join(metrics)} FROM {table}")
+    rows = cursor.fetchall()
+    stats = {'rating': spec['rating'], 'rows': len(rows), 'rated': 0, 'written': 0, 'historical': {}, 'reused': False,
+             'seconds': 1e-6}
+    if not rows:
+        return stats
+
+    keys = [row[:2] for row in rows]
+    # None becomes NaN, and NaN fails every comparison below
+    matrix = np.array([row[3:] for row in rows], dtype='float64')
+    games, qualifier, raw = matrix[:, 0], matrix[:, 1], matrix[:, 2:]
+    qualified = qualifier >= qualification['threshold']
+    has_games = games > 0
+
+    per_game = np.array([metric in spec['per_game'] for metric in metrics])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scored = np.where(per_game, raw / games[:, None], raw)
+    # Every qualified season is pooled; per-game metrics also need games > 0
+    pooled = np.where(qualified[:, None] & (has_games[:, None] | ~per_game), scored, np.nan)
+    ensure_distributions_table(cursor)
+    summary, written = refresh_distributions(cursor, position_of(table), ALL_SEASONS, "rating",
+                                             [rating_rule(table, flag) for flag in per_game], metrics, pooled)
+    stats['reused'] = written is None
+
+    weighted_z = np.zeros(len(rows))
+    for j, metric in enumerate(metrics):
+        # An empty pool scores against mean 0; a missing or non-positive std falls back to 1
+        mean = summary['mean'][j] if summary['count'][j] else 0.0
+        std = summary['std'][j] if summary['std'][j] > 0 else 1.0
+        stats['historical'][metric] = (float(mean), float(std))
+        z = (scored[:, j] - mean) / std
+        # Metrics summed one at a time, in weight order, so totals match the old per-row loop exactly
+        weighted_z += spec['weights'][metric] * np.where(np.isnan(z), 0.0, z)
+
+    rated = qualified & has_games
+    ratings = np.clip((weighted_z + Z_RANGE) / (2 * Z_RANGE) * 100, 0, 100)
+    cells = ratings.astype(object)
+    cells[~rated] = None
+    # Only ratings that change are written: every UPDATE rewrites the whole (very wide) row
+    changed = [(rating, *key) for rating, key, row in zip(cells.tolist(), keys, rows) if rating != row[2]]
+    cursor.executemany(f"UPDATE {table} SET {spec['rating']} = ? WHERE playerId = ? AND year = ?", changed)
+    stats['rated'], stats['written'] = int(rated.sum()), len(changed)
+    stats['seconds'] = max(time.time() - start, 1e-6)
+    return stats
+
+
+def main(tables=None, bulk=True):
+    """Recompute the ratings of the requested tables (every registered table by default)."""
+    tables = tables or list(RATING_TABLES)
+    unknown = [table for table in tables if table not in RATING_TABLES]
+    if unknown:
+        raise ValueError(f"Unknown rating table(s): {', '.join(unknown)}")
+
+    conn = connect(DB_FILE, bulk=bulk)
+    cursor = conn.cursor()
+
+    print("=" * 80)
+    print(f"RATING ENGINE - {len(tables)} TABLE(S)")
+    print("=" * 80)
+
+    total = time.time()
+    try:
+        for table in tables:
+            if not table_exists(cursor, table):
+                print(f"  ✗ {table} does not exist; run its populate_full_percentiles script first")
+                continue
+            stats = compute_ratings(cursor, table)
+            conn.commit()
+            print(f"  ✓ {table}: {stats['rating']} for {stats['rated']:,} of {stats['rows']:,} rows "
+                  f"({stats['written']:,} changed{', stored stats' if stats['reused'] else ''}) in {stats['seconds']:.2f}s")
+        if bulk:
+            finish_bulk(conn)
+    finally:
+        conn.close()
+
+    print("\n" + "=" * 80)
+    print(f"✓ RATINGS COMPLETE in {time.time() - total:.1f}s")
+    print("=" * 80)
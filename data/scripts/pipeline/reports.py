@@ -0,0 +1,624 @@
+# Registry of PFF report definitions consumed by the weekly and season loader engines and the percentile and rating engines.
+#
+# Each entry describes one Players_*_Weekly table:
+#   family        - top-level PFF_Data folder (Passing, Rushing, Receiving, Blocking, Defense)
+#   folder        - sub-folder under <family>/WeeklyReports ("" when files sit directly in it)
+#   recursive     - glob nested folders as well (some exports were dropped into per-season folders)
+#   table         - target table name
+#   positions     - Players_Basic positions eligible for the report
+#   excluded_cols - CSV columns that are not stored as metrics
+#   required_cols - columns we expect to see (warning only)
+#   adjustment    - opponent-strength adjustment applied to grade columns (None, "defense" or "offense")
+#   projection    - optional {'include': globs, 'exclude': globs} (fnmatch) narrowing the metric columns;
+#                   projected-out columns are never decoded from the CSV nor stored (see catalog.projected)
+
+# Identity columns PFF ships with every export
+PFF_EXCLUDED_COLS = {"player", "player_id", "position", "team_name", "player_game_count", "franchise_id", "declined_penalties", "penalties"}
+# Older loaders only stripped the keys we write ourselves, so position/team_name/franchise_id live on as metric columns
+LEGACY_EXCLUDED_COLS = {"playerId", "year", "week", "seasonType", "player", "team", "teamID", "player_game_count", "player_id"}
+
+QB_POSITIONS = ['QB']
+PASSING_POSITIONS = ['QB', 'TE', 'WR']
+RUSHING_POSITIONS = ['QB', 'RB', 'FB', 'HB']
+RECEIVING_POSITIONS = ['WR', 'TE', 'RB', 'FB', 'HB']
+BLOCKING_POSITIONS = ['RB', 'TE', 'G', 'C', 'T', 'OT', 'OG', 'OC', 'OL', 'FB', 'WR']
+DEFENSE_POSITIONS = ['S', 'CB', 'LB', 'DB', 'DE', 'DL', 'EDGE', 'DT', 'FS', 'SS', 'ILB', 'OLB', 'DI']
+DEFENSE_POSITIONS_ED = DEFENSE_POSITIONS + ['ED']
+
+# PFF ships the receiver and defender grade families on every passing export, split by situation (blitz_,
+# pressure_, screen_, pa_, less_/more_ ...). They do not grade the passer, Master_Players_Passing_Weekly
+# already dropped them and no team script reads them, so the passing tables never parse or store them
+# (their *_adjusted twins go with them).
+PASSING_PROJECTION = {
+    "exclude": (
+        "*grades_coverage_defense", "*grades_defense", "*grades_defense_penalty", "*grades_hands_drop",
+        "*grades_overall_tackle", "*grades_pass_route", "*grades_pass_rush_defense", "*grades_run_defense",
+        "*grades_tackle",
+    ),
+}
+
+# Opponent-strength adjustments: offense reports are scaled by the opponent's defense rating and vice versa.
+# direction -1 means a stronger-than-average opponent rating shrinks the grade, +1 means it inflates it.
+ADJUSTMENTS = {
+    "defense": {"rating_col": "opponent_defense_rating", "source_col": "defense_rating", "default": 40.0, "direction": -1},
+    "offense": {"rating_col": "opponent_offense_rating", "source_col": "offense_rating", "default": 10.0, "direction": 1},
+}
+
+WEEKLY_REPORTS = {
+    # Passing
+    "PassingConcept": {
+        "family": "Passing",
+        "folder": "PassingConcept",
+        "table": "Players_PassingConcept_Weekly",
+        "positions": QB_POSITIONS,
+        "excluded_cols": PFF_EXCLUDED_COLS,
+        "projection": PASSING_PROJECTION,
+        "adjustment": "defense",
+    },
+    "PassingDepth": {
+        "family": "Passing",
+        "folder": "PassingDepth",
+        "recursive": True,
+        "table": "Players_PassingDepth_Weekly",
+        "positions": QB_POSITIONS,
+        "excluded_cols": PFF_EXCLUDED_COLS,
+        "adjustment": "defense",
+    },
+    "PassingGrades": {
+        "family": "Passing",
+        "folder": "PassingGrades",
+        "table": "Players_PassingGrades_Weekly",
+        "positions": PASSING_POSITIONS,
+        "excluded_cols": PFF_EXCLUDED_COLS,
+        "adjustment": None,
+    },
+    "PassingPressure": {
+        "family": "Passing",
+        "folder": "PassingPressure",
+        "table": "Players_PassingPressure_Weekly",
+        "positions": QB_POSITIONS,
+        "excluded_cols": PFF_EXCLUDED_COLS,
+        "required_cols": {"blitz_grades_pass", "no_pressure_qb_rating", "pressure_yards"},
+        "projection": PASSING_PROJECTION,
+        "adjustment": "defense",
+    },
+    "PassingTimeInPocket": {
+        "family": "Passing",
+        "folder": "TimeInPocket",
+        "table": "Players_PassingTimeInPocket_Weekly",
+        "positions": QB_POSITIONS,
+        "excluded_cols": PFF_EXCLUDED_COLS,
+        "required_cols": {"avg_time_to_throw", "less_avg_time_to_throw", "more_avg_time_to_throw"},
+        "projection": PASSING_PROJECTION,
+        "adjustment": "defense",
+    },
+    # Rushing
+    "RushingGrades": {
+        "family": "Rushing",
+        "folder": "",
+        "table": "Players_RushingGrades_Weekly",
+        "positions": RUSHING_POSITIONS,
+        "excluded_cols": PFF_EXCLUDED_COLS,
+        "required_cols": {"yards", "attempts"},
+        "adjustment": "defense",
+    },
+    # Receiving
+    "ReceivingConcept": {
+        "family": "Receiving",
+        "folder": "ReceivingConcept",
+        "table": "Players_ReceivingConcept_Weekly",
+        "positions": RECEIVING_POSITIONS,
+        "excluded_cols": PFF_EXCLUDED_COLS,
+        "required_cols": {"yards"},
+        "adjustment": "defense",
+    },
+    "ReceivingDepth": {
+        "family": "Receiving",
+        "folder": "ReceivingDepth",
+        "recursive": True,
+        "table": "Players_ReceivingDepth_Weekly",
+        "positions": RECEIVING_POSITIONS,
+        "excluded_cols": PFF_EXCLUDED_COLS,
+        "adjustment": "defense",
+    },
+    "ReceivingGrades": {
+        "family": "Receiving",
+        "folder": "ReceivingGrades",
+        "table": "Players_ReceivingGrades_Weekly",
+        "positions": ['WR', 'TE', 'RB', 'FB'],
+        "excluded_cols": LEGACY_EXCLUDED_COLS,
+        "adjustment": None,
+    },
+    "ReceivingScheme": {
+        "family": "Receiving",
+        "folder": "ReceivingScheme",
+        "table": "Players_ReceivingScheme_Weekly",
+        "positions": RECEIVING_POSITIONS,
+        "excluded_cols": PFF_EXCLUDED_COLS,
+        "required_cols": {"yards"},
+        "adjustment": "defense",
+    },
+    # Blocking
+    "BlockingGrades": {
+        "family": "Blocking",
+        "folder": "BlockingGrades",
+        "table": "Players_BlockingGrades_Weekly",
+        "positions": BLOCKING_POSITIONS,
+        "excluded_cols": LEGACY_EXCLUDED_COLS,
+        "adjustment": "defense",
+    },
+    "PassBlocking": {
+        "family": "Blocking",
+        "folder": "PassBlocking",
+        "table": "Players_BlockingPass_Weekly",
+        "positions": BLOCKING_POSITIONS,
+        "excluded_cols": LEGACY_EXCLUDED_COLS,
+        "adjustment": None,
+    },
+    "RunBlocking": {
+        "family": "Blocking",
+        "folder": "RunBlocking",
+        "table": "Players_BlockingRun_Weekly",
+        "positions": BLOCKING_POSITIONS,
+        "excluded_cols": LEGACY_EXCLUDED_COLS,
+        "adjustment": None,
+    },
+    # Defense
+    "CoverageGrades": {
+        "family": "Defense",
+        "folder": "CoverageGrades",
+        "table": "Players_DefenseCoverageGrades_Weekly",
+        "positions": DEFENSE_POSITIONS,
+        "excluded_cols": LEGACY_EXCLUDED_COLS,
+        "adjustment": None,
+    },
+    "CoverageScheme": {
+        "family": "Defense",
+        "folder": "CoverageScheme",
+        "table": "Players_DefenseCoverageScheme_Weekly",
+        "positions": DEFENSE_POSITIONS_ED,
+        "excluded_cols": LEGACY_EXCLUDED_COLS,
+        "adjustment": "offense",
+    },
+    "DefenseGrades": {
+        "family": "Defense",
+        "folder": "DefenseGrades",
+        "table": "Players_DefenseGrades_Weekly",
+        "positions": DEFENSE_POSITIONS_ED,
+        "excluded_cols": LEGACY_EXCLUDED_COLS,
+        "adjustment": "offense",
+    },
+    "PassRush": {
+        "family": "Defense",
+        "folder": "PassRush",
+        "table": "Players_DefensePassRush_Weekly",
+        "positions": DEFENSE_POSITIONS,
+        "excluded_cols": LEGACY_EXCLUDED_COLS,
+        "adjustment": None,
+    },
+    "RunDefense": {
+        "family": "Defense",
+        "folder": "RunDefense",
+        "table": "Players_DefenseRunDefense_Weekly",
+        "positions": DEFENSE_POSITIONS,
+        "excluded_cols": LEGACY_EXCLUDED_COLS,
+        "adjustment": None,
+    },
+    "SlotCoverage": {
+        "family": "Defense",
+        "folder": "SlotCoverage",
+        "table": "Players_DefenseSlotCoverage_Weekly",
+        "positions": DEFENSE_POSITIONS_ED,
+        "excluded_cols": LEGACY_EXCLUDED_COLS,
+        "adjustment": "offense",
+    },
+}
+
+
+# Each SEASON_REPORTS entry describes one Players_*_Season table, fed by <family>/SeasonReports/{year}_<name>.csv:
+#   family, table, positions, excluded_cols, required_cols, projection - as above
+#   game_count    - store player_game_count as a base INTEGER column (0 when missing) instead of a metric
+#   fill_value    - value written for metrics the export left empty (None keeps them NULL)
+
+# Season tables keep franchise_id, penalties and player_game_count as metric columns
+SEASON_EXCLUDED_COLS = {"player", "player_id", "position", "team_name"}
+
+SEASON_RUSHING_POSITIONS = ['QB', 'RB']
+SEASON_RECEIVING_POSITIONS = ['WR', 'TE', 'RB']
+SEASON_BLOCKING_POSITIONS = ['RB', 'TE', 'G', 'C', 'T', 'OT', 'OG', 'OC', 'OL']
+SEASON_DEFENSE_POSITIONS = ['S', 'CB', 'LB', 'DB', 'DE', 'DL', 'EDGE', 'DT']
+
+SEASON_REPORTS = {
+    # Passing
+    "PassingConcept": {
+        "family": "Passing",
+        "table": "Players_PassingConcept_Season",
+        "positions": QB_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"play_action_grades_pass", "screen_qb_rating", "vertical_yards"},
+    },
+    "PassingDepth": {
+        "family": "Passing",
+        "table": "Players_PassingDepth_Season",
+        "positions": QB_POSITIONS,
+        "excluded_cols": PFF_EXCLUDED_COLS,
+        "game_count": True,
+    },
+    "PassingGrades": {
+        "family": "Passing",
+        "table": "Players_PassingGrades_Season",
+        "positions": QB_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"grades_pass", "grades_run", "grades_offense"},
+    },
+    "PassingPressure": {
+        "family": "Passing",
+        "table": "Players_PassingPressure_Season",
+        "positions": QB_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"blitz_grades_pass", "no_pressure_qb_rating", "pressure_yards"},
+    },
+    "PassingTimeInPocket": {
+        "family": "Passing",
+        "table": "Players_PassingTimeInPocket_Season",
+        "positions": QB_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"avg_time_to_throw", "less_avg_time_to_throw", "more_avg_time_to_throw"},
+    },
+    # Rushing
+    "RushingGrades": {
+        "family": "Rushing",
+        "table": "Players_RushingGrades_Season",
+        "positions": SEASON_RUSHING_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"yards"},
+    },
+    # Receiving
+    "ReceivingConcept": {
+        "family": "Receiving",
+        "table": "Players_ReceivingConcept_Season",
+        "positions": SEASON_RECEIVING_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"yards"},
+    },
+    "ReceivingDepth": {
+        "family": "Receiving",
+        "table": "Players_ReceivingDepth_Season",
+        "positions": SEASON_RECEIVING_POSITIONS,
+        "excluded_cols": PFF_EXCLUDED_COLS,
+        "game_count": True,
+    },
+    "ReceivingGrades": {
+        "family": "Receiving",
+        "table": "Players_ReceivingGrades_Season",
+        "positions": SEASON_RECEIVING_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"yards"},
+    },
+    "ReceivingScheme": {
+        "family": "Receiving",
+        "table": "Players_ReceivingScheme_Season",
+        "positions": SEASON_RECEIVING_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"yards"},
+    },
+    # Blocking
+    "BlockingGrades": {
+        "family": "Blocking",
+        "table": "Players_BlockingGrades_Season",
+        "positions": SEASON_BLOCKING_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"player_game_count"},
+    },
+    "PassBlocking": {
+        "family": "Blocking",
+        "table": "Players_BlockingPass_Season",
+        "positions": SEASON_BLOCKING_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"player_game_count"},
+    },
+    "RunBlocking": {
+        "family": "Blocking",
+        "table": "Players_BlockingRun_Season",
+        "positions": SEASON_BLOCKING_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"player_game_count"},
+    },
+    # Defense: empty cells were always stored as 0
+    "CoverageGrades": {
+        "family": "Defense",
+        "table": "Players_DefenseCoverageGrades_Season",
+        "positions": SEASON_DEFENSE_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"player_game_count"},
+        "fill_value": 0,
+    },
+    "CoverageScheme": {
+        "family": "Defense",
+        "table": "Players_DefenseCoverageScheme_Season",
+        "positions": SEASON_DEFENSE_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"player_game_count"},
+        "fill_value": 0,
+    },
+    "DefenseGrades": {
+        "family": "Defense",
+        "table": "Players_DefenseGrades_Season",
+        "positions": SEASON_DEFENSE_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"player_game_count"},
+        "fill_value": 0,
+    },
+    "PassRush": {
+        "family": "Defense",
+        "table": "Players_DefensePassRush_Season",
+        "positions": SEASON_DEFENSE_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"player_game_count"},
+        "fill_value": 0,
+    },
+    "RunDefense": {
+        "family": "Defense",
+        "table": "Players_DefenseRunDefense_Season",
+        "positions": SEASON_DEFENSE_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"player_game_count"},
+        "fill_value": 0,
+    },
+    "SlotCoverage": {
+        "family": "Defense",
+        "table": "Players_DefenseSlotCoverage_Season",
+        "positions": SEASON_DEFENSE_POSITIONS,
+        "excluded_cols": SEASON_EXCLUDED_COLS,
+        "required_cols": {"player_game_count"},
+        "fill_value": 0,
+    },
+}
+
+
+# Each PERCENTILE_TABLES entry describes one Players_Full_Percentiles_* table (built by the
+# populate/<family>/season/populate_full_percentiles_*.py scripts); pipeline/percentiles.py fills every
+# percentile_<metric> column from it:
+#   qualifier     - volume column a player-season must exceed to be ranked (and to get percentiles at all)
+#   threshold     - qualifier > threshold qualifies
+#   digits        - decimals percentiles are rounded to
+#   flat_value    - percentile given when every qualified value of a metric is equal (None leaves them NULL)
+#   mode          - optional; "min_max" (default) scales (x - min) * 100 / (max - min), "rank" places each
+#                   value by its rank among the qualified values of its year
+#   ties          - optional, rank mode only; "mid" (default) gives tied values the average of their ranks,
+#                   "min"/"max" the lowest/highest
+# In rank mode the metrics in LOWER_IS_BETTER_METRICS (and split variants such as deep_twp_rate) are ranked in
+# reverse, so the best value scores 100.
+
+LOWER_IS_BETTER_METRICS = ("twp_rate", "sack_percent", "missed_tackle_rate")
+
+PERCENTILE_TABLES = {
+    # Passing
+    "Players_Full_Percentiles_QB": {"qualifier": "attempts", "threshold": 40, "digits": 2, "flat_value": None},
+    # Rushing
+    "Players_Full_Percentiles_RB_Rushing": {"qualifier": "total_touches", "threshold": 20, "digits": 0, "flat_value": 50},
+    # Receiving
+    "Players_Full_Percentiles_RB_Receiving": {"qualifier": "targets", "threshold": 20, "digits": 0, "flat_value": 50},
+    "Players_Full_Percentiles_TE_Receiving": {"qualifier": "targets", "threshold": 6, "digits": 2, "flat_value": None},
+    "Players_Full_Percentiles_WR": {"qualifier": "targets", "threshold": 20, "digits": 2, "flat_value": None},
+    # Blocking
+    "Players_Full_Percentiles_C_Blocking": {"qualifier": "snap_counts_block", "threshold": 20, "digits": 0, "flat_value": 50},
+    "Players_Full_Percentiles_G_Blocking": {"qualifier": "snap_counts_block", "threshold": 20, "digits": 0, "flat_value": 50},
+    "Players_Full_Percentiles_T_Blocking": {"qualifier": "snap_counts_block", "threshold": 20, "digits": 0, "flat_value": 50},
+    "Players_Full_Percentiles_RB_Blocking": {"qualifier": "snap_counts_block", "threshold": 20, "digits": 0, "flat_value": 50},
+    "Players_Full_Percentiles_TE_Blocking": {"qualifier": "snap_counts_block", "threshold": 20, "digits": 0, "flat_value": 50},
+    # Defense
+    "Players_Full_Percentiles_CB": {"qualifier": "snap_counts_defense", "threshold": 40, "digits": 0, "flat_value": 50},
+    "Players_Full_Percentiles_DB": {"qualifier": "snap_counts_defense", "threshold": 40, "digits": 0, "flat_value": 50},
+    "Players_Full_Percentiles_DL": {"qualifier": "snap_counts_defense", "threshold": 40, "digits": 0, "flat_value": 50},
+    "Players_Full_Percentiles_LBE": {"qualifier": "snap_counts_defense", "threshold": 40, "digits": 0, "flat_value": 50},
+    "Players_Full_Percentiles_S": {"qualifier": "snap_counts_defense", "threshold": 40, "digits": 0, "flat_value": 50},
+}
+
+# Each PERCENTILE_SOURCES entry says where a Players_Full_Percentiles_* table's metrics come from;
+# pipeline/percentile_loader.py reads the exports and (re)builds the table from them:
+#   family        - PFF_Data folder whose SeasonReports/{year}_<report>.csv exports all feed the table
+#   positions     - Players_Basic positions loaded
+#   excluded_cols - CSV columns that are not stored as metrics
+#   by_season     - optional; match export rows on (player_id_PFF, year) instead of the player's last
+#                   Players_Basic row
+#   team_id       - optional; False for tables without a teamID column
+#   projection    - optional projection spec narrowing the metric columns, as in SEASON_REPORTS
+# The table stores every metric column of its exports' schema catalogs, with the catalog's types.
+# Metrics from several exports of one season are merged per player; where exports share a column, the
+# family's <family>Grades export wins.
+
+PERCENTILE_EXCLUDED_COLS = {"player", "player_id", "position", "team_name", "franchise_id", "declined_penalties", "penalties"}
+
+PERCENTILE_SOURCES = {
+    # Passing
+    "Players_Full_Percentiles_QB": {
+        "family": "Passing",
+        "positions": ["QB"],
+        "excluded_cols": PERCENTILE_EXCLUDED_COLS,
+        "projection": PASSING_PROJECTION,
+        "by_season": True,
+        "team_id": False,
+    },
+    # Rushing
+    "Players_Full_Percentiles_RB_Rushing": {
+        "family": "Rushing",
+        "positions": ["RB"],
+        "excluded_cols": PERCENTILE_EXCLUDED_COLS,
+    },
+    # Receiving
+    "Players_Full_Percentiles_RB_Receiving": {
+        "family": "Receiving",
+        "positions": ["RB"],
+        "excluded_cols": PERCENTILE_EXCLUDED_COLS,
+    },
+    "Players_Full_Percentiles_TE_Receiving": {
+        "family": "Receiving",
+        "positions": ["TE"],
+        "excluded_cols": PERCENTILE_EXCLUDED_COLS,
+        "by_season": True,
+        "team_id": False,
+    },
+    "Players_Full_Percentiles_WR": {
+        "family": "Receiving",
+        "positions": ["WR"],
+        "excluded_cols": PERCENTILE_EXCLUDED_COLS,
+        "by_season": True,
+        "team_id": False,
+    },
+    # Blocking
+    "Players_Full_Percentiles_C_Blocking": {
+        "family": "Blocking",
+        "positions": ["C"],
+        "excluded_cols": PERCENTILE_EXCLUDED_COLS,
+    },
+    "Players_Full_Percentiles_G_Blocking": {
+        "family": "Blocking",
+        "positions": ["G"],
+        "excluded_cols": PERCENTILE_EXCLUDED_COLS,
+    },
+    "Players_Full_Percentiles_T_Blocking": {
+        "family": "Blocking",
+        "positions": ["T"],
+        "excluded_cols": PERCENTILE_EXCLUDED_COLS,
+    },
+    "Players_Full_Percentiles_RB_Blocking": {
+        "family": "Blocking",
+        "positions": ["RB"],
+        "excluded_cols": PERCENTILE_EXCLUDED_COLS | {"player_game_count"},
+    },
+    "Players_Full_Percentiles_TE_Blocking": {
+        "family": "Blocking",
+        "positions": ["TE"],
+        "excluded_cols": PERCENTILE_EXCLUDED_COLS | {"player_game_count"},
+    },
+    # Defense
+    "Players_Full_Percentiles_CB": {
+        "family": "Defense",
+        "positions": ["CB"],
+        "excluded_cols": PERCENTILE_EXCLUDED_COLS,
+    },
+    "Players_Full_Percentiles_DB": {
+        "family": "Defense",
+        "positions": ["DB"],
+        "excluded_cols": PERCENTILE_EXCLUDED_COLS,
+    },
+    "Players_Full_Percentiles_DL": {
+        "family": "Defense",
+        "positions": ["DL", "DT", "DE"],
+        "excluded_cols": PERCENTILE_EXCLUDED_COLS,
+    },
+    "Players_Full_Percentiles_LBE": {
+        "family": "Defense",
+        "positions": ["LB", "EDGE"],
+        "excluded_cols": PERCENTILE_EXCLUDED_COLS,
+    },
+    "Players_Full_Percentiles_S": {
+        "family": "Defense",
+        "positions": ["S"],
+        "excluded_cols": PERCENTILE_EXCLUDED_COLS,
+    },
+}
+
+# Each RATING_TABLES entry is the composite rating stored on a Players_Full_Percentiles_* table;
+# pipeline/ratings.py computes it. A player-season is rated when the table's PERCENTILE_TABLES qualifier
+# is >= its threshold and player_game_count > 0:
+#   rating        - column the rating is written to
+#   weights       - metric -> weight of its z-score (negative weights are penalties)
+#   per_game      - metrics divided by player_game_count before they are scored
+# Each z-score uses the mean and sample std of that metric over every qualified season (all years pooled,
+# so ratings are comparable across years). A missing metric scores 0. The weighted sum is mapped from
+# [-3, 3] onto 0-100 and clamped.
+
+RATING_TABLES = {
+    # Passing
+    "Players_Full_Percentiles_QB": {
+        "rating": "QBR",
+        "weights": {"grades_pass": 0.25, "accuracy_percent": 0.25, "big_time_throws": 0.10,
+                    "turnover_worthy_plays": -0.10, "yards": 0.40, "touchdowns": 0.25, "interceptions": -0.20},
+        "per_game": ("yards", "touchdowns", "interceptions"),
+    },
+    # Rushing
+    "Players_Full_Percentiles_RB_Rushing": {
+        "rating": "RBR",
+        "weights": {"grades_run": 0.18, "yards": 0.18, "yards_after_contact": 0.14, "avoided_tackles": 0.14,
+                    "ypa": 0.14, "elusive_rating": 0.09, "breakaway_percent": 0.05, "fumbles": -0.08},
+        "per_game": ("yards", "yards_after_contact", "avoided_tackles", "fumbles"),
+    },
+    # Receiving
+    "Players_Full_Percentiles_RB_Receiving": {
+        "rating": "RRR",
+        "weights": {"grades_pass_route": 0.20, "yprr": 0.20, "yards_after_catch": 0.15, "contested_catch_rate": 0.15,
+                    "drop_rate": -0.10, "first_downs": 0.15, "fumbles": -0.05},
+        "per_game": ("yards_after_catch", "first_downs", "fumbles"),
+    },
+    "Players_Full_Percentiles_TE_Receiving": {
+        "rating": "TER",
+        "weights": {"grades_pass_route": 0.25, "yprr": 0.10, "yards_after_catch": 0.20, "contested_catch_rate": 0.10,
+                    "drop_rate": -0.05, "fumbles": -0.05, "yards": 0.25, "targets": 0.10},
+        "per_game": ("yards_after_catch", "yards", "fumbles", "targets"),
+    },
+    "Players_Full_Percentiles_WR": {
+        "rating": "WRR",
+        "weights": {"grades_pass_route": 0.20, "yprr": 0.15, "yards_after_catch": 0.20, "contested_catch_rate": 0.15,
+                    "drop_rate": -0.15, "yards": 0.25, "fumbles": -0.05},
+        "per_game": ("yards_after_catch", "fumbles"),
+    },
+    # Blocking
+    "Players_Full_Percentiles_C_Blocking": {
+        "rating": "CR",
+        "weights": {"grades_pass_block": 0.45, "grades_run_block": 0.45, "pass_block_percent": 0.20,
+                    "block_percent": 0.20, "snap_counts_block": 0.20, "hurries_allowed": -0.05,
+                    "hits_allowed": -0.05, "sacks_allowed": -0.10, "pressures_allowed": -0.075},
+        "per_game": ("snap_counts_block", "hurries_allowed", "hits_allowed", "sacks_allowed", "pressures_allowed"),
+    },
+    "Players_Full_Percentiles_G_Blocking": {
+        "rating": "GR",
+        "weights": {"grades_pass_block": 0.45, "grades_run_block": 0.45, "pass_block_percent": 0.20,
+                    "block_percent": 0.20, "snap_counts_block": 0.20, "hurries_allowed": -0.05,
+                    "hits_allowed": -0.05, "sacks_allowed": -0.10, "pressures_allowed": -0.075},
+        "per_game": ("snap_counts_block", "hurries_allowed", "hits_allowed", "sacks_allowed", "pressures_allowed"),
+    },
+    "Players_Full_Percentiles_T_Blocking": {
+        "rating": "TR",
+        "weights": {"grades_offense": 0.75, "block_percent": 0.75, "snap_counts_block": 0.20, "hurries_allowed": 0.05,
+                    "hits_allowed": 0.05, "sacks_allowed": 0.00, "pressures_allowed": 0.05, "pbe": 0.0},
+        "per_game": ("snap_counts_block", "hurries_allowed", "hits_allowed", "sacks_allowed", "pressures_allowed"),
+    },
+    # Defense
+    "Players_Full_Percentiles_CB": {
+        "rating": "CBR",
+        "weights": {"grades_coverage_defense": 0.50, "forced_incompletion_rate": 0.15, "coverage_percent": 0.10,
+                    "pass_break_ups": 0.10, "interceptions": 0.15, "yards_per_coverage_snap": -0.10,
+                    "snap_counts_coverage": 0.25, "missed_tackle_rate": -0.05},
+        "per_game": ("snap_counts_coverage", "pass_break_ups", "interceptions"),
+    },
+    "Players_Full_Percentiles_DB": {
+        "rating": "DBR",
+        "weights": {"grades_coverage_defense": 0.50, "forced_incompletion_rate": 0.15, "coverage_percent": 0.10,
+                    "pass_break_ups": 0.10, "interceptions": 0.15, "yards_per_coverage_snap": -0.10,
+                    "snap_counts_coverage": 0.25, "missed_tackle_rate": -0.05},
+        "per_game": ("snap_counts_coverage", "pass_break_ups", "interceptions"),
+    },
+    "Players_Full_Percentiles_DL": {
+        "rating": "DLR",
+        "weights": {"grades_defense": 0.25, "pass_rush_win_rate": 0.10, "total_pressures": 0.05, "sacks": 0.10,
+                    "hurries": 0.05, "hits": 0.05, "tackles_for_loss": 0.05, "stop_percent": 0.10,
+                    "snap_counts_pass_rush": 0.05, "missed_tackle_rate": -0.05},
+        "per_game": ("total_pressures", "sacks", "hurries", "hits", "tackles_for_loss", "snap_counts_pass_rush"),
+    },
+    "Players_Full_Percentiles_LBE": {
+        "rating": "LBR",
+        "weights": {"grades_coverage_defense": 0.15, "grades_defense": 0.20, "grades_run_defense": 0.15,
+                    "stop_percent": 0.15, "pass_rush_win_rate": 0.20, "interceptions": 0.15, "pass_break_ups": 0.15,
+                    "hurries": 0.05, "sacks": 0.05, "missed_tackle_rate": -0.05},
+        "per_game": ("interceptions", "pass_break_ups", "hurries", "sacks"),
+    },
+    "Players_Full_Percentiles_S": {
+        "rating": "SR",
+        "weights": {"grades_coverage_defense": 0.50, "forced_incompletion_rate": 0.15, "coverage_percent": 0.10,
+                    "pass_break_ups": 0.10, "interceptions": 0.15, "yards_per_coverage_snap": -0.10,
+                    "snap_counts_coverage": 0.25, "missed_tackle_rate": -0.05},
+        "per_game": ("snap_counts_coverage", "pass_break_ups", "interceptions"),
+    },
+}
@@ -0,0 +1,303 @@
+import time
+from itertools import chain
+
+from pipeline.config import DB_FILE, PFF_DATA_DIR
+from pipeline.db import connect, deferred_indexes, finish_bulk, table_exists
+from pipeline.reports import SEASON_REPORTS
+from pipeline.catalog import (load_catalog, metric_columns, column_defs, parse_schema, table_version,
+                              record_table_version)
+from pipeline.identity import load_player_identity, select_players
+from pipeline.staging import StagingBuffer
+from pipeline.writer import write_rows, stream_batch_size, DEFAULT_BATCH_SIZE
+from pipeline.manifest import ensure_manifest_table, load_manifest, diff_files, record_files, reset_manifest
+from pipeline.weekly_loader import parse_report_file, projection_changed, verify_report
+
+# Columns every season table carries ahead of the metrics (game_count reports add player_game_count)
+SEASON_BASE_COLS = ['playerId', 'year', 'player', 'team', 'teamID']
+
+
+def season_dir(report):
+    """SeasonReports folder for a registry entry."""
+    return PFF_DATA_DIR / report['family'] / "SeasonReports"
+
+
+def season_files(name, report):
+    """Yield (csv_file, year) for every season export of a report, skipping bad filenames."""
+    for csv_file in sorted(season_dir(report).glob(f"*_{name}.csv")):
+        file_parts = csv_file.stem.split('_')
+        if len(file_parts) < 2 or file_parts[-1] != name:
+            print(f"  Skipping {csv_file.name}: Invalid filename format")
+            continue
+        try:
+            year = int(file_parts[0])
+        except ValueError:
+            print(f"  Skipping {csv_file.name}: Invalid year in filename")
+            continue
+        yield csv_file, year
+
+
+def manifest_key(name):
+    """Ingest_Manifest report key; season exports share report names with the weekly ones."""
+    return f"{name}_Season"
+
+
+def season_partition(year):
+    # Manifest partitions are (year, week, seasonType); a season export covers the whole year
+    return (year, None, None)
+
+
+def base_columns(report):
+    return SEASON_BASE_COLS + (['player_game_count'] if report.get('game_count') else [])
+
+
+# ============================================================================
+# Per-report steps
+# ============================================================================
+
+def players_for_season(identity, positions):
+    """Build the player_id_PFF -> player info lookup for one report; the last Players_Basic row wins."""
+    players_basic = {}
+    for player_id, pff_id, name, team, team_id in select_players(
+            identity, ("playerId", "player_id_PFF", "name", "team", "teamID"), positions):
+        players_basic[pff_id] = {
+            'playerId': player_id,
+            'name': name,
+            'team': team,
+            'teamID': team_id
+        }
+    return players_basic
+
+
+def stage_season_file(staged, result, players_basic, game_count):
+    """Resolve one parsed season file's players and overlay its metrics onto staged."""
+    year = result['year']
+    matched = []
+    staged_rows = []
+    for i, (pff_id, games) in enumerate(zip(result['player_ids'], result['game_counts'])):
+        player_info = players_basic.get(pff_id)
+        if player_info is None:
+            continue  # Player not eligible for this report
+        base_values = [player_info['playerId'], year, player_info['name'].lower(), player_info['team'],
+                       player_info['teamID']]
+        if game_count:
+            base_values.append(int(games) if games is not None and games >= 0 else 0)
+        matched.append(i)
+        staged_rows.append(staged.row_for((player_info['playerId'], year), base_values))
+    staged.merge(staged_rows, result['metric_cols'], result['values'][matched])
+
+
+def read_season(report, catalog, players_basic, files, stream=False):
+    """Parse the given season CSVs into StagingBuffers keyed (playerId, year); returns (batches, stats).
+
+    batches is a generator of buffers and stats is filled in as it is consumed: one buffer for every file,
+    or with stream=True one per season, dropped once the writer has taken its rows. files are
+    (csv_file, year) tuples from season_files(). Metrics no file supplied stay unstaged, so they are written
+    as the report's fill_value.
+    """
+    schema = parse_schema(catalog)
+    catalog_metric_cols = metric_columns(catalog, report['excluded_cols'], report.get('projection'))
+    game_count = report.get('game_count')
+    stats = {'files': 0, 'rows': 0, 'seconds': 1e-6, 'staged_bytes': 0}
+
+    def batches():
+        start = time.time()
+        metric_cols_seen = set()
+        unknown_cols = {}
+        records_added = 0
+        staged = StagingBuffer(base_columns(report), catalog_metric_cols)
+        season = None
+        staged_files = 0
+
+        for csv_file, year in sorted(files, key=lambda f: f[1]) if stream else files:
+            if stream and year != season:
+                if staged_files:
+                    records_added += len(staged)
+                    stats['staged_bytes'] = max(stats['staged_bytes'], staged.nbytes())
+                    yield staged
+                    staged = StagingBuffer(base_columns(report), catalog_metric_cols)
+                season = year
+                staged_files = 0
+            result = parse_report_file((csv_file, year, None, None, catalog_metric_cols, schema))
+            if result['error']:
+                print(f"  Skipping {csv_file.name}: {result['error']}")
+                continue
+            stats['files'] += 1
+            stats['rows'] += len(result['player_ids'])
+            metric_cols_seen.update(result['metric_cols'])
+            unknown_cols.update(dict.fromkeys(result['unknown_cols']))
+            stage_season_file(staged, result, players_basic, game_count)
+            staged_files += 1
+
+        records_added += len(staged)
+        stats['seconds'] = max(time.time() - start, 1e-6)
+        stats['staged_bytes'] = max(stats['staged_bytes'], staged.nbytes())
+        print(f"  ✓ Processed {stats['files']} CSV files" + (" (streamed season by season)" if stream else ""))
+        print(f"  ✓ Loaded {records_added} player-season records")
+        print(f"  ✓ Unique metric columns: {len(metric_cols_seen)}")
+
+        missing_required = report.get('required_cols', set()) - metric_cols_seen
+        if stats['files'] and missing_required:
+            print(f"  ⚠ Warning: Missing required columns: {missing_required}")
+        if unknown_cols:
+            print(f"  ⚠ Skipped {len(unknown_cols)} column(s) not in the {catalog['report']} catalog (v{catalog['version']}): "
+                  f"{', '.join(unknown_cols)}; rerun populate/build_schema_catalog.py to pick them up")
+        if staged_files:
+            yield staged
+
+    return batches(), stats
+
+
+def create_table(cursor, report, catalog, metric_cols):
+    """Drop and recreate the season table with the catalog's column types."""
+    table = report['table']
+    game_count_col = "player_game_count INTEGER,\n            " if report.get('game_count') else ""
+    cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            playerId INTEGER NOT NULL,
+            year INTEGER NOT NULL,
+            player TEXT NOT NULL,
+            team TEXT NOT NULL,
+            teamID INTEGER,
+            {game_count_col}{column_defs(catalog, metric_cols)},
+            PRIMARY KEY (playerId, year),
+            FOREIGN KEY (playerId) REFERENCES Players_Basic(playerId),
+            FOREIGN KEY (teamID) REFERENCES Teams(id)
+        )
+    """)
+    record_table_version(cursor, table, catalog)
+    print(f"  ✓ Created {table} with {len(metric_cols)} metric columns (catalog v{catalog['version']})")
+
+
+def delete_years(cursor, table, years):
+    cursor.execute(f"DELETE FROM {table} WHERE year IN ({', '.join('?' for _ in years)})", sorted(years))
+    print(f"  ✓ Cleared {cursor.rowcount} rows for {len(years)} changed season(s)")
+
+
+def insert_rows(cursor, report, batches, metric_cols, batch_size=DEFAULT_BATCH_SIZE):
+    """Write staged buffers through the shared batched writer: one INSERT OR REPLACE, columns in catalog order."""
+    fill_value = report.get('fill_value')
+    written = write_rows(cursor, report['table'], base_columns(report) + metric_cols,
+                         (row for staged in batches for row in staged.rows(fill_value)), batch_size)
+    print(f"  ✓ Upserted {written} records")
+
+
+def load_report(cursor, name, identity, full=False, batch_size=DEFAULT_BATCH_SIZE, years=None, stream=False):
+    """Run one season registry entry end to end: parse, write, verify. Returns parse stats.
+
+    Incremental by default: only seasons whose {year}_<name>.csv is new, changed or removed since the last run
+    (per the ingest manifest) are deleted and reloaded, so a mid-season refresh of the current year leaves
+    earlier seasons' rows alone. full=True drops and rebuilds the table from every file, as does a missing
+    table or one created from an older catalog version. years reloads just those seasons from their files,
+    whatever the manifest says. stream=True stages and writes one season at a time (see read_season).
+    """
+    report = SEASON_REPORTS[name]
+    table = report['table']
+    key = manifest_key(name)
+    directory = season_dir(report)
+    if not directory.exists():
+        print(f"  ✗ Directory not found: {directory}")
+        return None
+
+    all_files = list(season_files(name, report))
+    tracked = [(csv_file, season_partition(year)) for csv_file, year in all_files]
+    catalog = load_catalog(name)
+    metric_cols = metric_columns(catalog, report['excluded_cols'], report.get('projection'))
+    if not table_exists(cursor, table):
+        if not full:
+            print(f"  ℹ {table} does not exist yet; building it from every file")
+        full = True
+    elif not full and table_version(cursor, table) != catalog['version']:
+        print(f"  ℹ {table} predates {name} catalog v{catalog['version']}; rebuilding it from every file")
+        full = True
+    elif not full and projection_changed(cursor, table, catalog, report, metric_cols):
+        print(f"  ℹ {table} columns do not match the {name} projection; rebuilding it from every file")
+        full = True
+
+    if full:
+        reset_manifest(cursor, key)
+        entries, _, removed = diff_files({}, tracked)
+        files = all_files
+        changed_years = None
+    elif years:
+        files = [f for f in all_files if f[1] in years]
+        if not files:
+            print(f"  ℹ No {name} exports for {', '.join(map(str, sorted(years)))}")
+            return None
+        partitions = {season_partition(year) for year in years}
+        recorded = {path: entry for path, entry in load_manifest(cursor, key).items() if entry['partition'] in partitions}
+        entries, _, removed = diff_files(recorded, [(f[0], season_partition(f[1])) for f in files])
+        changed_years = {f[1] for f in files}
+        print(f"  ✓ Reloading {', '.join(map(str, sorted(changed_years)))} from {len(files)} file(s)")
+    else:
+        entries, partitions, removed = diff_files(load_manifest(cursor, key), tracked)
+        if not partitions:
+            record_files(cursor, key, entries, removed)
+            print(f"  ✓ Up to date ({len(all_files)} files unchanged)")
+            return {'files': 0, 'rows': 0, 'seconds': 1e-6}
+        changed_years = {year for year, _, _ in partitions}
+        files = [f for f in all_files if f[1] in changed_years]
+        print(f"  ✓ {len(changed_years)} changed season(s): {', '.join(map(str, sorted(changed_years)))}")
+
+    players_basic = players_for_season(identity, report['positions'])
+    batches, stats = read_season(report, catalog, players_basic, files, stream)
+    first = next(batches, None)
+    if full and first is None:
+        print(f"  ✗ No data found for {name}; leaving {table} untouched")
+        return stats
+    batches = chain([first], batches) if first is not None else batches
+    if stream:
+        batch_size = stream_batch_size(batch_size, base_columns(report) + metric_cols)
+
+    if full:
+        with deferred_indexes(cursor, table):
+            create_table(cursor, report, catalog, metric_cols)
+            insert_rows(cursor, report, batches, metric_cols, batch_size)
+    else:
+        delete_years(cursor, table, changed_years)
+        insert_rows(cursor, report, batches, metric_cols, batch_size)
+    record_files(cursor, key, entries, removed)
+    verify_report(cursor, report)
+    return stats
+
+
+def main(report_names=None, full=False, batch_size=DEFAULT_BATCH_SIZE, bulk=True, years=None, stream=False):
+    """Load the requested season reports (all registered reports by default) in a single pass.
+
+    full=True ignores the ingest manifest and rebuilds every table from scratch. years limits every report
+    to reloading those seasons. bulk=False skips the bulk-load session pragmas. stream=True keeps at most
+    one season of one report in memory.
+    """
+    report_names = report_names or list(SEASON_REPORTS)
+    unknown = [name for name in report_names if name not in SEASON_REPORTS]
+    if unknown:
+        raise ValueError(f"Unknown season report(s): {', '.join(unknown)}")
+
+    conn = connect(DB_FILE, bulk=bulk)
+    cursor = conn.cursor()
+
+    print("=" * 80)
+    print(f"PFF SEASON LOADER - {len(report_names)} REPORT(S)"
+          + (f", {', '.join(map(str, sorted(years)))} ONLY" if years else "") + (", STREAMING" if stream else ""))
+    print("=" * 80)
+
+    print("\n[SETUP] Loading shared lookups...")
+    identity = load_player_identity(cursor)
+    print(f"  ✓ Loaded player identity map ({identity['table'].num_rows} Players_Basic rows with a PFF id)")
+    ensure_manifest_table(cursor)
+
+    try:
+        for i, name in enumerate(report_names, 1):
+            start = time.time()
+            print(f"\n[{i}/{len(report_names)}] {name} -> {SEASON_REPORTS[name]['table']}")
+            load_report(cursor, name, identity, full, batch_size, years, stream)
+            conn.commit()
+            print(f"  ✓ Done in {time.time() - start:.1f}s")
+        if bulk:
+            finish_bulk(conn)
+    finally:
+        conn.close()
+
+    print("\n" + "=" * 80)
+    print("✓ POPULATION COMPLETE")
+    print("=" * 80)
@@ -0,0 +1,154 @@
+import numpy as np
+
+from pipeline.db import table_exists
+from pipeline.distributions import percentile_rule, position_of
+
+SKETCHES_TABLE = "Metric_Sketches"
+# t-digest compression (delta): a sketch keeps at most ~COMPRESSION / 2 centroids
+COMPRESSION = 200
+# conference of rows whose team is not in Team_Aliases, or not in Teams for that season
+UNKNOWN_CONFERENCE = "Unknown"
+
+
+class QuantileSketch:
+    """Mergeable t-digest of one metric's qualified values.
+
+    Values are grouped into weighted centroids so every centroid covers at most one unit of the k1 scale
+    function k(q) = delta / (2 pi) * asin(2q - 1). Centroids stay small near the tails (exact singletons
+    for small samples) and the rank error of a lookup stays bounded whatever the sample size. Sketches
+    merge by pooling their centroids, so seasons and conferences can be combined at query time.
+    """
+
+    def __init__(self, means, weights, minimum, maximum):
+        self.means = np.asarray(means, dtype='float64')
+        self.weights = np.asarray(weights, dtype='float64')
+        self.min, self.max = float(minimum), float(maximum)
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    @classmethod
+    def from_values(cls, values, compression=COMPRESSION):
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return None
+        means, weights = np.unique(values, return_counts=True)
+        return cls(means, weights, means[0], means[-1]).compressed(compression)
+
+    @classmethod
+    def merge(cls, sketches, compression=None):
+        """One sketch over every value of the given sketches (compressed again only when compression is set)."""
+        sketches = [sketch for sketch in sketches if sketch is not None]
+        if not sketches:
+            return None
+        means, inverse = np.unique(np.concatenate([sketch.means for sketch in sketches]), return_inverse=True)
+        weights = np.bincount(inverse, weights=np.concatenate([sketch.weights for sketch in sketches]))
+        merged = cls(means, weights, min(sketch.min for sketch in sketches), max(sketch.max for sketch in sketches))
+        return merged.compressed(compression) if compression else merged
+
+    def compressed(self, compression=COMPRESSION):
+        """Regroup sorted centroids into one centroid per unit of k(q), where q is each centroid's mid-rank."""
+        if len(self.means) <= compression // 2:
+            return self
+        total = self.weights.sum()
+        q = (np.cumsum(self.weights) - self.weights / 2) / total
+        bucket = np.floor(compression / (2 * np.pi) * np.arcsin(2 * q - 1)).astype(np.int64)
+        starts = np.flatnonzero(np.diff(bucket, prepend=bucket[0] - 1))
+        weights = np.add.reduceat(self.weights, starts)
+        means = np.add.reduceat(self.means * self.weights, starts) / weights
+        return QuantileSketch(means, weights, self.min, self.max)
+
+    def cdf(self, value):
+        """Share (0-1) of the sketched values below value, counting values equal to it as half."""
+        value = np.asarray(value, dtype='float64')
+        centers = np.cumsum(self.weights) - self.weights / 2
+        share = np.interp(value, self.means, centers) / self.count
+        return np.where(value < self.min, 0.0, np.where(value > self.max, 1.0, share))
+
+    def quantile(self, q):
+        """Value at share q (0-1) of the sketched values."""
+        centers = np.cumsum(self.weights) - self.weights / 2
+        xp = np.concatenate(([0.0], centers, [self.count]))
+        fp = np.concatenate(([self.min], self.means, [self.max]))
+        return np.interp(np.asarray(q, dtype='float64') * self.count, xp, fp)
+
+    def to_blob(self):
+        return np.concatenate(([self.min, self.max], self.means, self.weights)).astype('<f8').tobytes()
+
+    @classmethod
+    def from_blob(cls, blob):
+        cells = np.frombuffer(blob, dtype='<f8')
+        size = (len(cells) - 2) // 2
+        return cls(cells[2:2 + size], cells[2 + size:], cells[0], cells[1])
+
+
+# ============================================================================
+# Metric_Sketches: one QuantileSketch per (position, metric, rule, season, conference), written by the
+# percentile engine next to Metric_Distributions. All-time or custom-window percentiles merge the stored
+# sketches instead of rescanning every season of a Players_Full_Percentiles_* table.
+# ============================================================================
+
+def ensure_sketches_table(cursor):
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {SKETCHES_TABLE} (
+            position TEXT NOT NULL,
+            metric TEXT NOT NULL,
+            rule TEXT NOT NULL,
+            year INTEGER NOT NULL,
+            conference TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            sketch BLOB NOT NULL,
+            PRIMARY KEY (position, metric, rule, year, conference)
+        )
+    """)
+
+
+def team_conferences(cursor):
+    """(teamID, year) -> conference from Teams."""
+    if not table_exists(cursor, "Teams"):
+        return {}
+    cursor.execute("SELECT id, year, conference FROM Teams WHERE conference IS NOT NULL AND conference != ''")
+    return {(team_id, year): conference for team_id, year, conference in cursor.fetchall()}
+
+
+def store_sketches(cursor, position, year, rule, metrics, pool, conferences):
+    """Replace the sketches of one position-season: one per conference and metric with qualified values.
+
+    pool is the season's (rows x metrics) array with NaN for unqualified or null cells; conferences holds
+    each row's conference.
+    """
+    cursor.execute(f"DELETE FROM {SKETCHES_TABLE} WHERE position = ? AND rule = ? AND year = ?",
+                   (position, rule, year))
+    conferences = np.asarray(conferences, dtype=object)
+    rows = []
+    for conference in sorted(set(conferences.tolist())):
+        block = pool[conferences == conference]
+        for j in np.flatnonzero((~np.isnan(block)).any(axis=0)):
+            sketch = QuantileSketch.from_values(block[:, j])
+            rows.append((position, metrics[j], rule, year, conference, int(sketch.count), sketch.to_blob()))
+    cursor.executemany(f"INSERT INTO {SKETCHES_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+def load_sketch(cursor, table, metric, years=None, conferences=None, rule=None):
+    """Merged sketch of a metric over the given seasons and conferences (all stored ones when None).
+
+    rule defaults to the table's percentile rule. Returns None when nothing matches.
+    """
+    query = f"SELECT sketch FROM {SKETCHES_TABLE} WHERE position = ? AND metric = ? AND rule = ?"
+    params = [position_of(table), metric, rule or percentile_rule(table)]
+    for column, wanted in (("year", years), ("conference", conferences)):
+        if wanted is not None:
+            wanted = list(wanted)
+            query += f" AND {column} IN ({', '.join('?' * len(wanted))})"
+            params += wanted
+    cursor.execute(query, params)
+    return QuantileSketch.merge([QuantileSketch.from_blob(blob) for (blob,) in cursor.fetchall()])
+
+
+def percentile_against(cursor, table, metric, value, years=None, conferences=None):
+    """Percentile (0-100) of value among the qualified players of the given seasons and conferences."""
+    sketch = load_sketch(cursor, table, metric, years, conferences)
+    return None if sketch is None else float(sketch.cdf(value) * 100)
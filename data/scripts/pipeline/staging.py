@@ -0,0 +1,82 @@
+import numpy as np
+
+# Rows per metric block: the buffer grows one block at a time, so it never copies staged data and wastes
+# at most one partly filled block.
+BLOCK_ROWS = 4096
+# Cells converted back to Python objects per step when rows are written out (fewer rows for wider reports)
+WRITE_CHUNK_CELLS = 1 << 18
+
+
+class StagingBuffer:
+    """Column-oriented staging area for rows merged from several PFF files before they are written.
+
+    Replaces the old `pff_data[key] = {'playerId': ..., metric: value, ...}` dict-per-row staging. Base
+    columns (ids, names, counts) are one Python list per column; metrics live in column-major float64
+    blocks of BLOCK_ROWS rows with NaN meaning "no value staged". The key -> row id dict is the only
+    per-row object, so a 500-metric row costs 4 KB of array instead of a 500-entry dict plus 500 floats.
+    """
+
+    def __init__(self, base_cols, metric_cols):
+        self.base_cols = list(base_cols)
+        self.metric_cols = list(metric_cols)
+        self.metric_index = {col: j for j, col in enumerate(self.metric_cols)}
+        self.index = {}
+        self.base = [[] for _ in self.base_cols]
+        self.blocks = []
+
+    def __len__(self):
+        return len(self.index)
+
+    def row_for(self, key, base_values):
+        """Row id for key, appending a row with base_values (in base_cols order) the first time it is seen."""
+        row = self.index.get(key)
+        if row is None:
+            row = self.index[key] = len(self.index)
+            if row == len(self.blocks) * BLOCK_ROWS:
+                self.blocks.append(np.full((BLOCK_ROWS, len(self.metric_cols)), np.nan, order='F'))
+            for column, value in zip(self.base, base_values):
+                column.append(value)
+        return row
+
+    def merge(self, rows, cols, values):
+        """Overlay a (len(rows) x len(cols)) float matrix onto the staged rows.
+
+        NaN cells leave the staged value alone, so metrics accumulate across files the way
+        `record[col] = value` did for non-null cells. A row listed twice is applied in order.
+        """
+        if not len(rows):
+            return
+        rows = np.asarray(rows, dtype=np.intp)
+        if len(np.unique(rows)) != len(rows):
+            for i in range(len(rows)):
+                self.merge(rows[i:i + 1], cols, values[i:i + 1])
+            return
+        col_ids = np.fromiter((self.metric_index[col] for col in cols), dtype=np.intp, count=len(cols))
+        block_ids, offsets = np.divmod(rows, BLOCK_ROWS)
+        for block_id in np.unique(block_ids):
+            selected = block_ids == block_id
+            block = self.blocks[block_id]
+            cells = np.ix_(offsets[selected], col_ids)
+            incoming = values[selected]
+            block[cells] = np.where(np.isnan(incoming), block[cells], incoming)
+
+    def rows(self, fill_value=None):
+        """Yield each staged row as a list, base_cols then metric_cols, in insertion order.
+
+        Metrics never staged are written as fill_value.
+        """
+        chunk_rows = max(1, min(BLOCK_ROWS, WRITE_CHUNK_CELLS // max(len(self.metric_cols), 1)))
+        start = 0
+        while start < len(self):
+            block_id, offset = divmod(start, BLOCK_ROWS)
+            stop = start + min(chunk_rows, BLOCK_ROWS - offset, len(self) - start)
+            used = self.blocks[block_id][offset:offset + stop - start]
+            cells = used.astype(object)
+            cells[np.isnan(used)] = fill_value
+            for base_values, metrics in zip(zip(*(column[start:stop] for column in self.base)), cells.tolist()):
+                yield list(base_values) + metrics
+            start = stop
+
+    def nbytes(self):
+        """Bytes held by the metric blocks."""
+        return sum(block.nbytes for block in self.blocks)
@@ -0,0 +1,257 @@
+import json
+import re
+import unicodedata
+from functools import lru_cache
+
+from pipeline.db import table_exists
+
+TEAM_ALIASES_TABLE = "Team_Aliases"
+# Alias sources, strongest first: if two teams claim one alias the stronger source keeps it, and a tie
+# between different teams drops the alias as ambiguous
+ALIAS_SOURCES = ("school", "pff", "alternate", "abbreviation")
+
+# CFBD school (lower case) -> PFF team_name
+TEAM_MAPPING = {
+    "auburn": "AUBURN",
+    "uab": "UAB",
+    "south alabama": "S ALABAMA",
+    "missouri state": "MO STATE",
+    "delaware": "DELAWARE",
+    "arkansas": "ARKANSAS",
+    "arizona state": "ARIZONA ST",
+    "arizona": "ARIZONA",
+    "north carolina": "N CAROLINA",
+    "jacksonville state": "JVILLE ST",
+    "san josé state": "S JOSE ST",
+    "stanford": "STANFORD",
+    "california": "CAL",
+    "ucla": "UCLA",
+    "usc": "USC",
+    "colorado state": "COLO STATE",
+    "colorado": "COLORADO",
+    "uconn": "UCONN",
+    "florida state": "FLORIDA ST",
+    "florida international": "FIU",
+    "florida": "FLORIDA",
+    "wake forest": "WAKE",
+    "georgia tech": "GA TECH",
+    "georgia": "GEORGIA",
+    "hawai'i": "HAWAII",
+    "iowa state": "IOWA STATE",
+    "boise state": "BOISE ST",
+    "northwestern": "NWESTERN",
+    "indiana": "INDIANA",
+    "notre dame": "NOTRE DAME",
+    "kentucky": "KENTUCKY",
+    "louisville": "LOUISVILLE",
+    "western kentucky": "W KENTUCKY",
+    "lsu": "LSU",
+    "boston college": "BOSTON COL",
+    "massachusetts": "UMASS",
+    "maryland": "MARYLAND",
+    "michigan state": "MICH STATE",
+    "michigan": "MICHIGAN",
+    "minnesota": "MINNESOTA",
+    "missouri": "MISSOURI",
+    "ole miss": "OLE MISS",
+    "duke": "DUKE",
+    "east carolina": "E CAROLINA",
+    "nc state": "NC STATE",
+    "pittsburgh": "PITTSBURGH",
+    "nebraska": "NEBRASKA",
+    "south carolina": "S CAROLINA",
+    "new mexico state": "NEW MEX ST",
+    "new mexico": "NEW MEXICO",
+    "syracuse": "SYRACUSE",
+    "bowling green": "BOWL GREEN",
+    "miami (oh)": "MIAMI OH",
+    "baylor": "BAYLOR",
+    "ohio state": "OHIO STATE",
+    "ohio": "OHIO",
+    "oklahoma state": "OKLA STATE",
+    "oklahoma": "OKLAHOMA",
+    "tulsa": "TULSA",
+    "oregon state": "OREGON ST",
+    "penn state": "PENN STATE",
+    "temple": "TEMPLE",
+    "clemson": "CLEMSON",
+    "memphis": "MEMPHIS",
+    "vanderbilt": "VANDERBILT",
+    "rice": "RICE",
+    "texas a&m": "TEXAS A&M",
+    "houston": "HOUSTON",
+    "miami": "MIAMI FL",
+    "north texas": "N TEXAS",
+    "texas": "TEXAS",
+    "byu": "BYU",
+    "utah": "UTAH",
+    "james madison": "JAMES MAD",
+    "virginia": "VIRGINIA",
+    "virginia tech": "VA TECH",
+    "washington": "WASHINGTON",
+    "washington state": "WASH STATE",
+    "wisconsin": "WISCONSIN",
+    "marshall": "MARSHALL",
+    "west virginia": "W VIRGINIA",
+    "fresno state": "FRESNO ST",
+    "georgia southern": "GA SOUTHRN",
+    "old dominion": "DOMINION",
+    "louisiana": "LA LAFAYET",
+    "coastal carolina": "COAST CAR",
+    "texas state": "TEXAS ST",
+    "utah state": "UTAH ST",
+    "alabama": "ALABAMA",
+    "kennesaw state": "KENNESAW",
+    "mississippi state": "MISS STATE",
+    "army": "ARMY",
+    "illinois": "ILLINOIS",
+    "air force": "AIR FORCE",
+    "akron": "AKRON",
+    "app state": "APP STATE",
+    "arkansas state": "ARK STATE",
+    "ball state": "BALL ST",
+    "buffalo": "BUFFALO",
+    "ucf": "UCF",
+    "central michigan": "C MICHIGAN",
+    "cincinnati": "CINCINNATI",
+    "eastern michigan": "E MICHIGAN",
+    "florida atlantic": "FAU",
+    "fiu": "FIU",
+    "georgia state": "GA STATE",
+    "iowa": "IOWA",
+    "kansas": "KANSAS",
+    "kansas state": "KANSAS ST",
+    "kent state": "KENT STATE",
+    "liberty": "LIBERTY",
+    "louisiana tech": "LA TECH",
+    "middle tennessee": "MIDDLE TN",
+    "navy": "NAVY",
+    "charlotte": "CHARLOTTE",
+    "ul monroe": "LA MONROE",
+    "unlv": "UNLV",
+    "nevada": "NEVADA",
+    "northern illinois": "N ILLINOIS",
+    "oregon": "OREGON",
+    "purdue": "PURDUE",
+    "sam houston": "SM HOUSTON",
+    "smu": "SMU",
+    "southern miss": "SO MISS",
+    "tcu": "TCU",
+    "tennessee": "TENNESSEE",
+    "utsa": "UTSA",
+    "utep": "UTEP",
+    "texas tech": "TEXAS TECH",
+    "toledo": "TOLEDO",
+    "troy": "TROY",
+    "tulane": "TULANE",
+    "western michigan": "W MICHIGAN",
+    "wyoming": "WYOMING",
+    "rutgers": "RUTGERS", 
+    "san diego state": "S DIEGO ST",
+    "south florida": "USF"
+}
+
+
+# ============================================================================
+# Team identity: every name a team goes by (CFBD school, abbreviation and alternate names from Teams, PFF
+# team_name from TEAM_MAPPING) is stored once in Team_Aliases under its team_key() and mapped to Teams.id.
+# Loaders resolve names through the in-memory index from load_team_index() and stamp teamID at ingest, so
+# later joins and lookups are integer-keyed instead of LOWER(...) scans and per-row mapping loops.
+# ============================================================================
+
+@lru_cache(maxsize=None)
+def team_key(name):
+    """Normalized alias: accents, apostrophes and periods dropped, other punctuation to spaces, case-folded.
+
+    'San José State', "Hawai'i" and 'MIAMI (OH)' become 'san jose state', 'hawaii' and 'miami oh'.
+    """
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().casefold()
+    return " ".join(re.sub(r"[^a-z0-9&]+", " ", re.sub(r"['.]", "", text)).split())
+
+
+def ensure_team_aliases_table(cursor):
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TEAM_ALIASES_TABLE} (
+            alias TEXT PRIMARY KEY,
+            teamID INTEGER NOT NULL,
+            source TEXT NOT NULL,
+            name TEXT NOT NULL,
+            FOREIGN KEY (teamID) REFERENCES Teams(id)
+        ) WITHOUT ROWID
+    """)
+
+
+def _team_names(cursor):
+    """(teamID, source, name) for every school, abbreviation and alternate name in Teams, newest season first."""
+    cursor.execute("PRAGMA table_info(Teams)")
+    columns = {row[1] for row in cursor.fetchall()}
+    alternates = "alternateNames" if "alternateNames" in columns else "NULL"
+    cursor.execute(f"SELECT id, school, abbreviation, {alternates} FROM Teams WHERE id IS NOT NULL ORDER BY year DESC")
+    for team_id, school, abbreviation, alternate_names in cursor.fetchall():
+        if school:
+            yield team_id, "school", school
+        if abbreviation:
+            yield team_id, "abbreviation", abbreviation
+        try:
+            names = json.loads(alternate_names) if alternate_names else []
+        except ValueError:
+            names = []
+        for name in names if isinstance(names, list) else []:
+            if isinstance(name, str) and name:
+                yield team_id, "alternate", name
+
+
+def build_team_aliases(cursor):
+    """Rebuild Team_Aliases from Teams and TEAM_MAPPING; returns a stats dict.
+
+    PFF names reach a team through the CFBD school TEAM_MAPPING pairs them with; a PFF name whose school is
+    not in Teams is left out and counted under 'unmapped'.
+    """
+    ensure_team_aliases_table(cursor)
+    claims = {}  # alias -> {source: {teamID: first name seen}}
+    schools = {}
+
+    def claim(team_id, source, name):
+        key = team_key(name)
+        if key:
+            claims.setdefault(key, {}).setdefault(source, {}).setdefault(team_id, name)
+
+    if table_exists(cursor, "Teams"):
+        for team_id, source, name in _team_names(cursor):
+            claim(team_id, source, name)
+            if source == "school":
+                schools.setdefault(team_key(name), team_id)
+    unmapped = []
+    for school, pff_team in TEAM_MAPPING.items():
+        if team_key(school) in schools:
+            claim(schools[team_key(school)], "pff", pff_team)
+        else:
+            unmapped.append(pff_team)
+
+    rows, ambiguous = [], []
+    for key, by_source in claims.items():
+        source = next(source for source in ALIAS_SOURCES if source in by_source)
+        if len(by_source[source]) > 1:
+            ambiguous.append(key)
+            continue
+        (team_id, name), = by_source[source].items()
+        rows.append((key, team_id, source, name))
+
+    cursor.execute(f"DELETE FROM {TEAM_ALIASES_TABLE}")
+    cursor.executemany(f"INSERT INTO {TEAM_ALIASES_TABLE} VALUES (?, ?, ?, ?)", rows)
+    return {'aliases': len(rows), 'teams': len({row[1] for row in rows}), 'ambiguous': sorted(ambiguous),
+            'unmapped': sorted(unmapped)}
+
+
+def load_team_index(cursor):
+    """{team_key: teamID} from Team_Aliases, building the table first if it is missing or empty."""
+    if not table_exists(cursor, TEAM_ALIASES_TABLE) or not cursor.execute(
+            f"SELECT 1 FROM {TEAM_ALIASES_TABLE} LIMIT 1").fetchone():
+        build_team_aliases(cursor)
+    cursor.execute(f"SELECT alias, teamID FROM {TEAM_ALIASES_TABLE}")
+    return dict(cursor.fetchall())
+
+
+def resolve_team(index, name):
+    """Teams.id of any known name of a team (school, abbreviation, alternate or PFF name), else None."""
+    return index.get(team_key(name)) if name else None
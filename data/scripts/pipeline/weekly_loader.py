@@ -0,0 +1,571 @@
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+
+import pyarrow as pa
+
+from pipeline.config import DB_FILE, PFF_DATA_DIR
+from pipeline.db import connect, deferred_indexes, finish_bulk, table_exists
+from pipeline.reports import WEEKLY_REPORTS, ADJUSTMENTS
+from pipeline.parsing import read_header, read_typed, numeric_block, parse_week_token
+from pipeline.columnar import read_season_export
+from pipeline.catalog import (load_catalog, metric_columns, column_defs, parse_schema, unknown_columns,
+                              table_version, record_table_version)
+from pipeline.opponents import ensure_team_game_opponents, load_opponent_index, refresh_opponent_ids
+from pipeline.identity import load_player_identity, select_players
+from pipeline.staging import StagingBuffer
+from pipeline.writer import write_rows, stream_batch_size, DEFAULT_BATCH_SIZE
+from pipeline.manifest import ensure_manifest_table, load_manifest, diff_files, record_files, reset_manifest
+
+# Columns every weekly table carries ahead of the metrics
+BASE_COLS = ['playerId', 'player_id_PFF', 'year', 'week', 'seasonType', 'opponentID',
+             'player', 'team', 'teamID', 'player_game_count']
+# Streaming mode: files decoded ahead of the writer when parsing in worker processes
+STREAM_WINDOW = 8
+
+
+def report_dir(report):
+    """WeeklyReports folder for a registry entry."""
+    base = PFF_DATA_DIR / report['family'] / "WeeklyReports"
+    return base / report['folder'] if report['folder'] else base
+
+
+def report_files(name, report):
+    """Yield (csv_file, year, week, seasonType) for every weekly export of a report, skipping bad filenames."""
+    pattern = f"**/*_{name}.csv" if report.get('recursive') else f"*_{name}.csv"
+    for csv_file in sorted(report_dir(report).glob(pattern)):
+        file_parts = csv_file.stem.split('_')
+        if len(file_parts) < 3 or file_parts[-1] != name:
+            print(f"  Skipping {csv_file.name}: Invalid filename format")
+            continue
+        try:
+            year = int(file_parts[0])
+        except ValueError:
+            print(f"  Skipping {csv_file.name}: Invalid year in filename")
+            continue
+        parsed = parse_week_token(file_parts[1])
+        if parsed is None:
+            print(f"  Skipping {csv_file.name}: Unsupported game type {file_parts[1]}")
+            continue
+        week, seasonType = parsed
+        yield csv_file, year, week, seasonType
+
+
+# ============================================================================
+# Shared lookups (loaded once per run)
+# ============================================================================
+
+# Players_Basic columns each report's lookup is built from
+PLAYER_COLUMNS = ("playerId", "player_id_PFF", "name", "team", "teamID", "year")
+
+
+def players_for_report(identity, positions):
+    """Build the (player_id_PFF, year) -> player info lookup for one report's position filter."""
+    players_basic = {}
+    for player_id, pff_id, name, team, team_id, year in select_players(identity, PLAYER_COLUMNS, positions):
+        players_basic[(pff_id, year)] = {
+            'playerId': player_id,
+            'name': name,
+            'team': team,
+            'teamID': team_id
+        }
+    return players_basic
+
+
+# ============================================================================
+# Per-report steps
+# ============================================================================
+
+def parse_report_file(task):
+    """Decode one weekly CSV into typed rows. Runs in pool workers, so it touches no database state.
+
+    Returns {'file', 'year', 'week', 'seasonType', 'metric_cols', 'unknown_cols', 'player_ids', 'game_counts',
+    'values', 'error'} where metric_cols are the catalog metrics present in this file, player_ids and
+    game_counts are per-row lists (game count None when missing) and values is the (rows x metric_cols)
+    float64 matrix with NaN for null cells. unknown_cols are export columns the catalog does not declare.
+    Only player_id, player_game_count and catalog_metric_cols (already narrowed by the report's projection)
+    are decoded; every other export column is skipped by the reader.
+    """
+    csv_file, year, week, seasonType, catalog_metric_cols, schema = task
+    result = {'file': csv_file, 'year': year, 'week': week, 'seasonType': seasonType,
+              'metric_cols': [], 'unknown_cols': [], 'player_ids': [], 'game_counts': [], 'values': None,
+              'error': None}
+    try:
+        header = dict.fromkeys(read_header(csv_file))
+        if "player_id" not in header:
+            result['error'] = "Missing player_id column"
+            return result
+        result['unknown_cols'] = unknown_columns(schema, header)
+        metric_cols = [col for col in catalog_metric_cols if col in header]
+        if not metric_cols:
+            result['error'] = "No metric columns found"
+            return result
+        # Season reports keep player_game_count as a metric as well, so dedupe
+        columns = dict.fromkeys(["player_id"] + (["player_game_count"] if "player_game_count" in header else []) + metric_cols)
+        try:
+            # Season exports come from the columnar mirror when it is current; weekly files stay on the CSV
+            table = (read_typed(csv_file, schema, list(columns)) if week is not None
+                     else read_season_export(csv_file, schema, list(columns)))
+        except pa.ArrowInvalid as e:
+            result['error'] = str(e)
+            return result
+
+        player_ids = table.column("player_id").to_pylist()
+        if "player_game_count" in table.column_names:
+            game_counts = [None if count != count else count
+                           for count in numeric_block(table, ["player_game_count"])[:, 0].tolist()]
+        else:
+            game_counts = [None] * table.num_rows
+        result['metric_cols'] = metric_cols
+        result['player_ids'] = player_ids
+        result['game_counts'] = game_counts
+        result['values'] = numeric_block(table, metric_cols)
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def parsed_files(tasks, executor=None, window=0):
+    """parse_report_file over tasks, in order.
+
+    With an executor and a window, at most window files are decoded ahead of the consumer, so a slow
+    writer holds parsing back instead of letting parsed files pile up in memory (backpressure).
+    """
+    if not executor:
+        yield from map(parse_report_file, tasks)
+    elif not window:
+        yield from executor.map(parse_report_file, tasks, chunksize=4)
+    else:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(parse_report_file, task))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def stage_file(staged, result, players_basic):
+    """Resolve one parsed file's players and overlay its metrics onto staged; returns the rows matched."""
+    year, week, seasonType = result['year'], result['week'], result['seasonType']
+    matched = []
+    staged_rows = []
+    for i, (pff_id, game_count) in enumerate(zip(result['player_ids'], result['game_counts'])):
+        player_info = players_basic.get((pff_id, year))
+        if player_info is None:
+            continue  # Player not eligible for this report/year
+        matched.append(i)
+        staged_rows.append(staged.row_for((player_info['playerId'], year, week, seasonType), (
+            player_info['playerId'],
+            pff_id,
+            year,
+            week,
+            seasonType,
+            None,
+            player_info['name'].lower(),
+            player_info['team'],
+            player_info['teamID'],
+            int(game_count) if game_count is not None and game_count >= 0 else 0
+        )))
+    staged.merge(staged_rows, result['metric_cols'], result['values'][matched])
+    return len(matched)
+
+
+def read_report(report, catalog, players_basic, files, executor=None, stream=False):
+    """Parse the given weekly CSVs into StagingBuffers keyed (playerId, year, week, seasonType).
+
+    Returns (batches, stats): batches is a generator of buffers and stats is filled in as it is consumed.
+    By default every file is merged into one buffer. stream=True yields one buffer per (year, week,
+    seasonType) partition instead and drops it once the writer has taken its rows, so memory stays at one
+    week of one report however many seasons PFF_Data holds; with an executor only STREAM_WINDOW files are
+    decoded ahead of the writer.
+
+    Only the catalog's metric columns are read, with the catalog's types. Each buffer's base columns are
+    BASE_COLS (opponentID is resolved at write time) and its metric columns are the catalog's.
+    files are (csv_file, year, week, seasonType) tuples from report_files(). With an executor the files are
+    decoded in worker processes; merging always happens here in the writer process, in filename order
+    within a partition, so every mode produces the same rows.
+    """
+    schema = parse_schema(catalog)
+    catalog_metric_cols = metric_columns(catalog, report['excluded_cols'], report.get('projection'))
+    if stream:
+        files = sorted(files, key=lambda f: (f[1], f[2], f[3]))
+    tasks = [(csv_file, year, week, seasonType, catalog_metric_cols, schema)
+             for csv_file, year, week, seasonType in files]
+    stats = {'files': 0, 'rows': 0, 'seconds': 1e-6, 'staged_bytes': 0}
+
+    def batches():
+        start = time.time()
+        metric_cols_seen = set()
+        unknown_cols = {}
+        records_added = 0
+        staged = StagingBuffer(BASE_COLS, catalog_metric_cols)
+        partition = None
+        staged_files = 0
+
+        for result in parsed_files(tasks, executor, STREAM_WINDOW if stream else 0):
+            if stream and (result['year'], result['week'], result['seasonType']) != partition:
+                if staged_files:
+                    stats['staged_bytes'] = max(stats['staged_bytes'], staged.nbytes())
+                    yield staged
+                    staged = StagingBuffer(BASE_COLS, catalog_metric_cols)
+                partition = (result['year'], result['week'], result['seasonType'])
+                staged_files = 0
+            if result['error']:
+                print(f"  Skipping {result['file'].name}: {result['error']}")
+                continue
+            stats['files'] += 1
+            stats['rows'] += len(result['player_ids'])
+            metric_cols_seen.update(result['metric_cols'])
+            unknown_cols.update(dict.fromkeys(result['unknown_cols']))
+            records_added += stage_file(staged, result, players_basic)
+            staged_files += 1
+
+        stats['seconds'] = max(time.time() - start, 1e-6)
+        stats['staged_bytes'] = max(stats['staged_bytes'], staged.nbytes())
+        print(f"  ✓ Processed {stats['files']} CSV files" + (" (streamed week by week)" if stream else ""))
+        print(f"  ✓ Loaded {records_added} player-week records")
+        print(f"  ✓ Unique metric columns: {len(metric_cols_seen)}")
+        print(f"  ✓ {'Stream' if stream else 'Parse'} throughput: {stats['files'] / stats['seconds']:.1f} files/sec, "
+              f"{stats['rows'] / stats['seconds']:,.0f} rows/sec")
+
+        missing_required = report.get('required_cols', set()) - metric_cols_seen
+        if missing_required:
+            print(f"  ⚠ Warning: Missing required columns: {missing_required}")
+        if unknown_cols:
+            print(f"  ⚠ Skipped {len(unknown_cols)} column(s) not in the {catalog['report']} catalog (v{catalog['version']}): "
+                  f"{', '.join(unknown_cols)}; rerun populate/build_schema_catalog.py to pick them up")
+        if staged_files:
+            yield staged
+
+    return batches(), stats
+
+
+def grade_columns(report, metric_cols):
+    """Metric columns that get an opponent-adjusted *_adjusted twin."""
+    if not ADJUSTMENTS.get(report['adjustment']):
+        return []
+    return [col for col in metric_cols if "grades" in col]
+
+
+def create_table(cursor, report, catalog, metric_cols):
+    """Drop and recreate the report table with the catalog's column types; returns the adjusted grade columns."""
+    table = report['table']
+    adjustment = ADJUSTMENTS.get(report['adjustment'])
+    grades_cols = grade_columns(report, metric_cols)
+
+    extra_cols = ""
+    if adjustment:
+        extra_cols = f",\n        {adjustment['rating_col']} REAL"
+        extra_cols += ''.join(f",\n        {col}_adjusted REAL" for col in grades_cols)
+
+    cursor.execute(f"DROP TABLE IF EXISTS {table}")
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table} (
+            playerId INTEGER NOT NULL,
+            player_id_PFF TEXT,
+            year INTEGER NOT NULL,
+            week INTEGER NOT NULL,
+            seasonType TEXT NOT NULL,
+            opponentID INTEGER,
+            player TEXT NOT NULL,
+            team TEXT NOT NULL,
+            teamID INTEGER,
+            player_game_count INTEGER,
+            {column_defs(catalog, metric_cols)}{extra_cols},
+            PRIMARY KEY (playerId, year, week, seasonType),
+            FOREIGN KEY (playerId) REFERENCES Players_Basic(playerId),
+            FOREIGN KEY (teamID) REFERENCES Teams(id),
+            FOREIGN KEY (opponentID) REFERENCES Teams(id)
+        )
+    """)
+    record_table_version(cursor, table, catalog)
+    print(f"  ✓ Created {table} with {len(metric_cols)} metric columns (catalog v{catalog['version']})")
+    if grades_cols:
+        print(f"  ✓ Created {len(grades_cols)} adjusted grade columns")
+    return grades_cols
+
+
+def projection_changed(cursor, table, catalog, report, metric_cols):
+    """Whether the table stores a different set of the catalog's metrics than the report's projection keeps."""
+    stored = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    return stored & set(metric_columns(catalog, report['excluded_cols'])) != set(metric_cols)
+
+
+def partition_filter(partitions):
+    """WHERE fragment + named params restricting a statement to (year, week, seasonType) partitions."""
+    params = {}
+    values = []
+    for i, (year, week, seasonType) in enumerate(sorted(partitions)):
+        params.update({f"y{i}": year, f"w{i}": week, f"s{i}": seasonType})
+        values.append(f"(:y{i}, :w{i}, :s{i})")
+    return f"(year, week, seasonType) IN (VALUES {', '.join(values)})", params
+
+
+def delete_partitions(cursor, table, partitions):
+    clause, params = partition_filter(partitions)
+    cursor.execute(f"DELETE FROM {table} WHERE {clause}", params)
+    print(f"  ✓ Cleared {cursor.rowcount} rows across {len(partitions)} changed partition(s)")
+
+
+def insert_rows(cursor, report, batches, metric_cols, opponents, batch_size=DEFAULT_BATCH_SIZE):
+    """Stream every staged buffer through the shared batched writer, resolving opponentID from the game index."""
+    matched = 0
+    opponent_pos = BASE_COLS.index('opponentID')
+    team_pos, year_pos, week_pos, type_pos = (BASE_COLS.index(col) for col in ('teamID', 'year', 'week', 'seasonType'))
+
+    def rows():
+        nonlocal matched
+        for staged in batches:
+            for row in staged.rows():
+                opponent_id = opponents.get((row[team_pos], row[year_pos], row[week_pos], row[type_pos]))
+                if opponent_id is not None:
+                    matched += 1
+                row[opponent_pos] = opponent_id
+                yield row
+
+    written = write_rows(cursor, report['table'], BASE_COLS + metric_cols, rows(), batch_size)
+    print(f"  ✓ Inserted {written} records ({matched} with opponentID)")
+
+
+def apply_adjustment(cursor, report, grades_cols, partitions=None):
+    """Stamp the opponent rating and scale every grade column by opponent strength in one UPDATE.
+
+    partitions limits the adjusted-grade pass to freshly loaded weeks (None = whole table).
+    """
+    adjustment = ADJUSTMENTS.get(report['adjustment'])
+    if not adjustment:
+        return
+    table = report['table']
+    rating_col = adjustment['rating_col']
+    source_col = adjustment['source_col']
+    default = adjustment['default']
+
+    cursor.execute(f"""
+        UPDATE {table}
+        SET {rating_col} = COALESCE((
+            SELECT trs.{source_col}
+            FROM Teams_Ratings_SP trs
+            WHERE trs.teamID = {table}.opponentID
+              AND trs.year = {table}.year
+            LIMIT 1
+        ), {default})
+        WHERE {rating_col} IS NULL
+    """)
+    print(f"  ✓ Updated {cursor.rowcount} records with {rating_col}")
+
+    if not grades_cols:
+        print("  ℹ No grade columns found in data")
+        return
+
+    cursor.execute(f"SELECT {source_col} FROM Teams_Ratings_SP WHERE team = 'nationalAverages' LIMIT 1")
+    mean_row = cursor.fetchone()
+    mean_rating = float(mean_row[0]) if mean_row else default
+    print(f"  Using national average {source_col}: {mean_rating}")
+
+    # Above-average rating: scale by (1 + direction * ...); below-average: the opposite way
+    above = "+" if adjustment['direction'] > 0 else "-"
+    below = "-" if adjustment['direction'] > 0 else "+"
+    rating = f"COALESCE({rating_col}, :mean)"
+    set_clause = ',\n            '.join(
+        f"""{col}_adjusted = CASE
+                WHEN {rating} > :mean THEN {col} * (1 {above} (SQRT(({rating} - :mean) / :mean) * 0.10))
+                WHEN {rating} < :mean THEN {col} * (1 {below} (SQRT((:mean - {rating}) / :mean) * 0.10))
+                ELSE {col}
+            END"""
+        for col in grades_cols
+    )
+    where, params = "", {"mean": mean_rating}
+    if partitions:
+        clause, partition_params = partition_filter(partitions)
+        where = f" WHERE {clause}"
+        params.update(partition_params)
+    cursor.execute(f"UPDATE {table} SET {set_clause}{where}", params)
+    print(f"  ✓ Updated {cursor.rowcount} records with {len(grades_cols)} adjusted metrics")
+
+
+def verify_report(cursor, report):
+    """Per-year summary of the freshly loaded table."""
+    cursor.execute(f"""
+        SELECT year, COUNT(*) as records, COUNT(DISTINCT playerId) as players,
+               COUNT(DISTINCT teamID) as teams
+        FROM {report['table']}
+        GROUP BY year
+        ORDER BY year
+    """)
+    print("  Year | Records | Players | Teams")
+    print("  " + "-" * 40)
+    for row in cursor.fetchall():
+        print(f"  {row[0]:4d} | {row[1]:7d} | {row[2]:7d} | {row[3]:5d}")
+
+
+def refresh_opponents(cursor, report, grades_cols):
+    """After Team_Game_Opponents was rebuilt, re-resolve opponentID in place and re-adjust grades if any moved."""
+    table = report['table']
+    changed = refresh_opponent_ids(cursor, table)
+    print(f"  ✓ Re-resolved opponentID on {changed} existing rows")
+    adjustment = ADJUSTMENTS.get(report['adjustment'])
+    if changed and adjustment:
+        cursor.execute(f"UPDATE {table} SET {adjustment['rating_col']} = NULL")
+        apply_adjustment(cursor, report, grades_cols)
+
+
+def format_partition(partition):
+    year, week, seasonType = partition
+    return f"{year} wk{week} {seasonType}"
+
+
+def load_report(cursor, name, identity, opponents, executor=None, full=False, batch_size=DEFAULT_BATCH_SIZE,
+                opponents_rebuilt=False, partition=None, stream=False):
+    """Run one registry entry end to end: parse, write, adjust, verify. Returns parse stats.
+
+    Incremental by default: files whose size/mtime/content hash match the manifest are skipped and only
+    the (year, week, seasonType) partitions fed by new, changed or removed files are deleted and reloaded.
+    full=True drops and rebuilds the table from every file, as does a missing table or one created from an older
+    version of the report's schema catalog (the single schema check per run). opponents_rebuilt means
+    Teams_Games changed since the last run, so rows kept from earlier runs get their opponentID refreshed.
+    partition=(year, week, seasonType) reloads just that week from its files, whatever the manifest says.
+    stream=True parses, stages and writes one week at a time (see read_report) instead of staging every file.
+    """
+    report = WEEKLY_REPORTS[name]
+    table = report['table']
+    directory = report_dir(report)
+    if not directory.exists():
+        print(f"  ✗ Directory not found: {directory}")
+        return None
+
+    all_files = list(report_files(name, report))
+    tracked = [(csv_file, (year, week, seasonType)) for csv_file, year, week, seasonType in all_files]
+    catalog = load_catalog(name)
+    metric_cols = metric_columns(catalog, report['excluded_cols'], report.get('projection'))
+    if not table_exists(cursor, table):
+        if not full:
+            print(f"  ℹ {table} does not exist yet; building it from every file")
+        full = True
+    elif not full and table_version(cursor, table) != catalog['version']:
+        print(f"  ℹ {table} predates {name} catalog v{catalog['version']}; rebuilding it from every file")
+        full = True
+    elif not full and projection_changed(cursor, table, catalog, report, metric_cols):
+        print(f"  ℹ {table} columns do not match the {name} projection; rebuilding it from every file")
+        full = True
+    if opponents_rebuilt and not full:
+        refresh_opponents(cursor, report, grade_columns(report, metric_cols))
+
+    if full:
+        reset_manifest(cursor, name)
+        entries, _, removed = diff_files({}, tracked)
+        files = all_files
+        partitions = None
+    elif partition:
+        files = [f for f in all_files if (f[1], f[2], f[3]) == partition]
+        if not files:
+            print(f"  ℹ No {name} exports for {format_partition(partition)}")
+            return None
+        recorded = {path: entry for path, entry in load_manifest(cursor, name).items() if entry['partition'] == partition}
+        entries, _, removed = diff_files(recorded, [(f[0], partition) for f in files])
+        partitions = {partition}
+        print(f"  ✓ Reloading {format_partition(partition)} from {len(files)} file(s)")
+    else:
+        entries, partitions, removed = diff_files(load_manifest(cursor, name), tracked)
+        if not partitions:
+            record_files(cursor, name, entries, removed)
+            print(f"  ✓ Up to date ({len(all_files)} files unchanged)")
+            return {'files': 0, 'rows': 0, 'seconds': 1e-6}
+        files = [f for f in all_files if (f[1], f[2], f[3]) in partitions]
+        print(f"  ✓ {len(partitions)} changed partition(s): {', '.join(format_partition(p) for p in sorted(partitions))}")
+
+    players_basic = players_for_report(identity, report['positions'])
+    batches, stats = read_report(report, catalog, players_basic, files, executor, stream)
+    first = next(batches, None)
+    if full and first is None:
+        print(f"  ✗ No data found for {name}; leaving {table} untouched")
+        return stats
+    batches = chain([first], batches) if first is not None else batches
+    if stream:
+        batch_size = stream_batch_size(batch_size, BASE_COLS + metric_cols)
+
+    if full:
+        # Full rebuilds drop the table, so secondary indexes are saved, skipped during the load and
+        # recreated at the end; incremental loads touch a few weeks and just maintain them.
+        with deferred_indexes(cursor, table):
+            grades_cols = create_table(cursor, report, catalog, metric_cols)
+            insert_rows(cursor, report, batches, metric_cols, opponents, batch_size)
+            apply_adjustment(cursor, report, grades_cols)
+    else:
+        delete_partitions(cursor, table, partitions)
+        grades_cols = grade_columns(report, metric_cols)
+        # The table matches the catalog, so every catalog metric is written; ones these files lack stay NULL
+        insert_rows(cursor, report, batches, metric_cols, opponents, batch_size)
+        apply_adjustment(cursor, report, grades_cols, partitions)
+    record_files(cursor, name, entries, removed)
+    verify_report(cursor, report)
+    return stats
+
+
+def print_throughput(all_stats):
+    """Files/sec and rows/sec per report for the parse phase, plus the staged metric matrix size."""
+    print("\n  Report               | Files | Rows      | Files/sec | Rows/sec   | Staged MB")
+    print("  " + "-" * 80)
+    for name, stats in all_stats.items():
+        seconds = stats['seconds']
+        print(f"  {name:<20} | {stats['files']:5d} | {stats['rows']:9,d} | {stats['files'] / seconds:9.1f} | "
+              f"{stats['rows'] / seconds:10,.0f} | {stats.get('staged_bytes', 0) / 1e6:9.1f}")
+
+
+def main(report_names=None, workers=0, full=False, batch_size=DEFAULT_BATCH_SIZE, bulk=True, partition=None,
+         stream=False):
+    """Load the requested weekly reports (all registered reports by default) in a single pass.
+
+    workers > 0 decodes CSVs in that many worker processes; this process stays the only SQLite writer.
+    full=True ignores the ingest manifest and rebuilds every table from scratch.
+    batch_size is the number of rows per executemany call in the writer. bulk=False skips the bulk-load
+    session pragmas (kept for before/after comparisons). partition=(year, week, seasonType) is the in-season
+    mode: every report reloads only that week's exports and leaves all other rows alone. stream=True keeps
+    at most one week of one report in memory (for full-history rebuilds on small machines).
+    """
+    report_names = report_names or list(WEEKLY_REPORTS)
+    unknown = [name for name in report_names if name not in WEEKLY_REPORTS]
+    if unknown:
+        raise ValueError(f"Unknown weekly report(s): {', '.join(unknown)}")
+
+    conn = connect(DB_FILE, bulk=bulk)
+    cursor = conn.cursor()
+
+    print("=" * 80)
+    print(f"PFF WEEKLY LOADER - {len(report_names)} REPORT(S)" + (f", {workers} PARSE WORKERS" if workers else "")
+          + (f", {format_partition(partition).upper()} ONLY" if partition else "") + (", STREAMING" if stream else ""))
+    print("=" * 80)
+
+    print("\n[SETUP] Loading shared lookups...")
+    identity = load_player_identity(cursor)
+    print(f"  ✓ Loaded player identity map ({identity['table'].num_rows} Players_Basic rows with a PFF id)")
+    opponents_rebuilt = ensure_team_game_opponents(cursor)
+    opponents = load_opponent_index(cursor)
+    print(f"  ✓ Indexed {len(opponents)} team-game opponents")
+    ensure_manifest_table(cursor)
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers else None
+    all_stats = {}
+    try:
+        for i, name in enumerate(report_names, 1):
+            start = time.time()
+            print(f"\n[{i}/{len(report_names)}] {name} -> {WEEKLY_REPORTS[name]['table']}")
+            stats = load_report(cursor, name, identity, opponents, executor, full, batch_size, opponents_rebuilt,
+                                partition, stream)
+            if stats:
+                all_stats[name] = stats
+            conn.commit()
+            print(f"  ✓ Done in {time.time() - start:.1f}s")
+        if bulk:
+            finish_bulk(conn)
+    finally:
+        if executor:
+            executor.shutdown()
+        conn.close()
+
+    print_throughput(all_stats)
+
+    print("\n" + "=" * 80)
+    print("✓ POPULATION COMPLETE")
+    print("=" * 80)
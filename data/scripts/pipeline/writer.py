@@ -0,0 +1,61 @@
+import sqlite3
+import time
+from functools import lru_cache
+from itertools import islice
+
+# Rows per executemany call: large enough to amortise the per-call overhead, small enough that a batch
+# of the widest tables (~500 columns) stays a few MB in memory.
+DEFAULT_BATCH_SIZE = 5000
+# Streaming loads cap a batch at this many values, so a 500-column table writes ~500 rows per call
+STREAM_BATCH_CELLS = 1 << 18
+
+
+@lru_cache(maxsize=None)
+def insert_statement(table, columns, verb="INSERT OR REPLACE"):
+    """INSERT SQL for a table and column tuple, built once per table/column set."""
+    return f"{verb} INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})"
+
+
+def stream_batch_size(batch_size, columns):
+    """batch_size capped so one batch of a table with these columns holds at most STREAM_BATCH_CELLS values."""
+    return max(1, min(batch_size, STREAM_BATCH_CELLS // max(len(columns), 1)))
+
+
+def write_rows(cursor, table, columns, rows, batch_size=DEFAULT_BATCH_SIZE, verb="INSERT OR REPLACE"):
+    """Stream rows (sequences aligned with columns) into a table through one compiled statement.
+
+    rows may be any iterable, including a generator; batches of batch_size go through executemany inside
+    one transaction (opened here if none is active) and the caller commits. A batch that fails is rolled
+    back to its savepoint and replayed row by row, so bad rows are reported and skipped as the old per-row
+    loops did. Returns the number of rows written.
+    """
+    query = insert_statement(table, tuple(columns), verb)
+    if not cursor.connection.in_transaction:
+        cursor.execute("BEGIN")
+
+    start = time.time()
+    written = failed = 0
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        cursor.execute("SAVEPOINT write_rows")
+        try:
+            cursor.executemany(query, batch)
+            written += len(batch)
+        except sqlite3.Error:
+            cursor.execute("ROLLBACK TO write_rows")
+            for row in batch:
+                try:
+                    cursor.execute(query, row)
+                    written += 1
+                except sqlite3.Error as e:
+                    failed += 1
+                    print(f"  Error inserting {dict(zip(columns[:2], row[:2]))} into {table}: {e}")
+        cursor.execute("RELEASE write_rows")
+
+    elapsed = max(time.time() - start, 1e-6)
+    print(f"  ✓ Wrote {written:,} rows to {table} in {elapsed:.2f}s ({written / elapsed:,.0f} rows/sec)"
+          + (f", {failed} failed" if failed else ""))
+    return written
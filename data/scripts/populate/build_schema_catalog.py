@@ -0,0 +1,37 @@
+import sys
+import argparse
+from collections import defaultdict
+from pathlib import Path
+
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipeline.config import PFF_DATA_DIR
+from pipeline.columnar import discover_exports
+from pipeline.catalog import SCHEMA_DIR, infer_column_types, write_catalog, load_catalog
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Regenerate the per-report schema catalog (pipeline/schemas) from the PFF exports.")
+    parser.add_argument("reports", nargs="*", help="Report names to catalog, e.g. DefenseGrades (default: all)")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("PFF SCHEMA CATALOG")
+    print("=" * 80)
+    print(f"  Source: {PFF_DATA_DIR}")
+    print(f"  Target: {SCHEMA_DIR}")
+
+    # Weekly and season exports of a report share one catalog
+    exports = defaultdict(list)
+    for export in discover_exports(PFF_DATA_DIR):
+        if not args.reports or export['report'] in args.reports:
+            exports[export['report']].append(export['path'])
+
+    SCHEMA_DIR.mkdir(exist_ok=True)
+    for report, csv_files in sorted(exports.items()):
+        previous = load_catalog(report)['version'] if (SCHEMA_DIR / f"{report}.json").exists() else None
+        columns = infer_column_types(csv_files)
+        version = write_catalog(report, columns)
+        integers = sum(1 for sql_type in columns.values() if sql_type == "INTEGER")
+        status = "unchanged" if version == previous else f"written (v{version})"
+        print(f"  ✓ {report:<22} {len(columns):4d} columns, {integers:4d} INTEGER, {status}")
@@ -0,0 +1,29 @@
+import sys
+import argparse
+import time
+from pathlib import Path
+
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipeline.config import PFF_DATA_DIR, PFF_COLUMNAR_DIR
+from pipeline.columnar import convert_all, read_columns
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mirror PFF_Data CSVs into memory-mappable Arrow files partitioned by report/year/week.")
+    parser.add_argument("reports", nargs="*", help="Report names to convert, e.g. DefenseGrades (default: all)")
+    parser.add_argument("--force", action="store_true", help="Reconvert partitions even if they are newer than the CSV")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("PFF COLUMNAR MIRROR")
+    print("=" * 80)
+    print(f"  Source: {PFF_DATA_DIR}")
+    print(f"  Target: {PFF_COLUMNAR_DIR}")
+    convert_all(set(args.reports) or None, force=args.force)
+
+    # Quick sanity read: one season of DefenseGrades, two columns
+    start = time.time()
+    table = read_columns("DefenseGrades", columns=["player_id", "grades_defense"], years=[2024])
+    if table is not None:
+        print(f"  ✓ Sample read: {table.num_rows} DefenseGrades rows (2024, 2 columns) in {(time.time() - start) * 1000:.1f} ms")
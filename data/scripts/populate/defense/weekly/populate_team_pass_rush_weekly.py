@@ -1,10 +1,15 @@
-import sqlite3
 import pandas as pd
 from pathlib import Path
+import sys
+
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from pipeline.db import connect
 
 # Database connection
 DB_FILE = Path("/Users/christianberry/Desktop/Perennial Data/perennial-data-app/server/data/db/cfb_database.db")
-conn = sqlite3.connect(DB_FILE)
+conn = connect(DB_FILE)
 
 print("=" * 80)
 print("TEAM DEFENSE PASS RUSH AGGREGATION - FIXED VERSION")
@@ -1,9 +1,14 @@
-import sqlite3
 from pathlib import Path
 from collections import defaultdict
+import sys
+
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from pipeline.db import connect
 
 DB_FILE = Path("/Users/christianberry/Desktop/Perennial Data/perennial-data-app/server/data/db/cfb_database.db")
-conn = sqlite3.connect(DB_FILE)
+conn = connect(DB_FILE)
 cursor = conn.cursor()
 
 print("=" * 80)
@@ -14,102 +19,33 @@ print("=" * 80)
 # DEFINE EXCLUSIONS
 # ============================================================================
 
-# Comprehensive list of columns to exclude
+# Columns to exclude. The receiver/defender grade families (pa_grades_pass_route, less_grades_tackle, ...)
+# never reach the weekly tables: PASSING_PROJECTION in pipeline/reports.py skips them at ingest.
 EXCLUDED_COLUMNS = {
     # All _adjusted variants
     'no_pressure_grades_pass_adjusted', 'blitz_grades_hands_fumble_adjusted',
     'no_pressure_grades_run_adjusted', 'pressure_grades_pass_adjusted',
-    'pressure_grades_coverage_defense_adjusted', 'no_blitz_grades_offense_penalty_adjusted',
-    'no_pressure_grades_hands_drop_adjusted', 'pressure_grades_offense_penalty_adjusted',
-    'no_pressure_grades_pass_rush_defense_adjusted', 'no_blitz_grades_defense_penalty_adjusted',
-    'pressure_grades_defense_adjusted', 'no_pressure_grades_overall_tackle_adjusted',
-    'blitz_grades_offense_penalty_adjusted', 'no_blitz_grades_tackle_adjusted',
-    'pressure_grades_pass_route_adjusted', 'pressure_grades_run_adjusted',
+    'no_blitz_grades_offense_penalty_adjusted', 'pressure_grades_offense_penalty_adjusted',
+    'blitz_grades_offense_penalty_adjusted', 'pressure_grades_run_adjusted',
     'grades_pass_adjusted', 'pressure_grades_offense_adjusted',
-    'pressure_grades_hands_drop_adjusted', 'no_blitz_grades_overall_tackle_adjusted',
-    'pressure_grades_hands_fumble_adjusted', 'pressure_grades_tackle_adjusted',
-    'blitz_grades_hands_drop_adjusted', 'grades_offense_adjusted',
-    'no_blitz_grades_coverage_defense_adjusted', 'no_pressure_grades_pass_route_adjusted',
-    'pressure_grades_defense_penalty_adjusted', 'blitz_grades_overall_tackle_adjusted',
-    'blitz_grades_defense_adjusted', 'blitz_grades_defense_penalty_adjusted',
-    'no_pressure_grades_hands_fumble_adjusted', 'no_pressure_grades_tackle_adjusted',
-    'no_pressure_grades_defense_adjusted', 'no_blitz_grades_pass_rush_defense_adjusted',
-    'no_pressure_grades_coverage_defense_adjusted', 'no_blitz_grades_defense_adjusted',
-    'no_blitz_grades_pass_adjusted', 'no_pressure_grades_offense_adjusted',
-    'no_blitz_grades_run_adjusted', 'no_pressure_grades_defense_penalty_adjusted',
-    'pressure_grades_overall_tackle_adjusted', 'no_pressure_grades_offense_penalty_adjusted',
-    'pressure_grades_pass_rush_defense_adjusted', 'no_blitz_grades_offense_adjusted',
-    'blitz_grades_coverage_defense_adjusted', 'blitz_grades_tackle_adjusted',
-    'no_blitz_grades_hands_drop_adjusted', 'blitz_grades_pass_rush_defense_adjusted',
+    'pressure_grades_hands_fumble_adjusted', 'grades_offense_adjusted',
+    'no_pressure_grades_hands_fumble_adjusted', 'no_blitz_grades_pass_adjusted',
+    'no_pressure_grades_offense_adjusted', 'no_blitz_grades_run_adjusted',
+    'no_pressure_grades_offense_penalty_adjusted', 'no_blitz_grades_offense_adjusted',
     'grades_hands_fumble_adjusted', 'no_blitz_grades_hands_fumble_adjusted',
-    'grades_run_adjusted', 'no_blitz_grades_pass_route_adjusted',
-    'blitz_grades_pass_route_adjusted', 'blitz_grades_offense_adjusted',
+    'grades_run_adjusted', 'blitz_grades_offense_adjusted',
     'blitz_grades_run_adjusted', 'blitz_grades_pass_adjusted',
     
     # Screen variants
-    'no_screen_grades_coverage_defense', 'no_screen_grades_defense',
-    'no_screen_grades_defense_penalty', 'no_screen_grades_hands_drop',
-    'no_screen_grades_overall_tackle', 'no_screen_grades_pass_route',
-    'no_screen_grades_pass_rush_defense', 'no_screen_grades_run_defense',
-    'no_screen_grades_tackle', 'npa_grades_coverage_defense',
-    'npa_grades_defense', 'npa_grades_defense_penalty',
-    'npa_grades_hands_drop', 'npa_grades_overall_tackle',
-    'npa_grades_pass_route', 'npa_grades_pass_rush_defense',
-    'npa_grades_run_defense', 'npa_grades_tackle',
-    'pa_grades_coverage_defense', 'pa_grades_defense',
-    'pa_grades_defense_penalty', 'pa_grades_hands_drop',
-    'pa_grades_overall_tackle', 'pa_grades_pass_route',
-    'pa_grades_pass_rush_defense', 'pa_grades_run_defense',
-    'pa_grades_tackle', 'screen_grades_coverage_defense',
-    'screen_grades_defense', 'screen_grades_defense_penalty',
-    'screen_grades_hands_drop', 'screen_grades_overall_tackle',
-    'screen_grades_pass_route', 'screen_grades_pass_rush_defense',
-    'screen_grades_run', 'screen_grades_run_defense',
-    'screen_grades_tackle', 'screen_pressure_to_sack_rate',
-    'screen_grades_overall_tackle_adjusted', 'npa_grades_tackle_adjusted',
-    'screen_grades_defense_penalty_adjusted', 'no_screen_grades_defense_penalty_adjusted',
-    'screen_grades_run_defense_adjusted', 'no_screen_grades_pass_route_adjusted',
-    'npa_grades_pass_route_adjusted', 'pa_grades_defense_penalty_adjusted',
-    'screen_grades_pass_rush_defense_adjusted', 'npa_grades_defense_adjusted',
-    'pa_grades_tackle_adjusted', 'pa_grades_overall_tackle_adjusted',
-    'pa_grades_pass_rush_defense_adjusted', 'screen_grades_coverage_defense_adjusted',
-    'pa_grades_coverage_defense_adjusted', 'screen_grades_pass_route_adjusted',
-    'pa_grades_hands_drop_adjusted', 'no_screen_grades_coverage_defense_adjusted',
-    'npa_grades_hands_drop_adjusted', 'screen_grades_defense_adjusted',
-    'no_screen_grades_defense_adjusted', 'npa_grades_pass_rush_defense_adjusted',
-    'no_screen_grades_tackle_adjusted', 'no_screen_grades_run_defense_adjusted',
-    'screen_grades_tackle_adjusted', 'screen_grades_run_adjusted',
-    'npa_grades_run_defense_adjusted', 'no_screen_grades_overall_tackle_adjusted',
-    'screen_grades_hands_drop_adjusted', 'no_screen_grades_pass_rush_defense_adjusted',
-    'npa_grades_overall_tackle_adjusted', 'pa_grades_run_defense_adjusted',
-    'npa_grades_defense_penalty_adjusted', 'pa_grades_defense_adjusted',
-    'npa_grades_coverage_defense_adjusted', 'no_screen_grades_hands_drop_adjusted',
-    'pa_grades_pass_route_adjusted',
+    'screen_grades_run', 'screen_pressure_to_sack_rate',
+    'screen_grades_run_adjusted',
     
     # Duplicate grades columns
     'grades_grades_hands_fumble', 'grades_grades_offense',
     'grades_grades_pass', 'grades_grades_run',
     
     # Less/More time to throw variants
-    'less_grades_coverage_defense', 'less_grades_defense',
-    'less_grades_defense_penalty', 'less_grades_hands_drop',
-    'less_grades_overall_tackle', 'less_grades_pass_route',
-    'less_grades_pass_rush_defense', 'less_grades_run',
-    'less_grades_run_defense', 'less_grades_tackle',
-    'more_grades_coverage_defense', 'more_grades_defense',
-    'more_grades_defense_penalty', 'more_grades_hands_drop',
-    'more_grades_overall_tackle', 'more_grades_pass_route',
-    'more_grades_pass_rush_defense', 'more_grades_run_defense',
-    'more_grades_tackle', 'less_grades_overall_tackle_adjusted',
-    'more_grades_pass_route_adjusted', 'more_grades_tackle_adjusted',
-    'less_grades_coverage_defense_adjusted', 'less_grades_pass_rush_defense_adjusted',
-    'less_grades_tackle_adjusted', 'less_grades_defense_adjusted',
-    'more_grades_pass_rush_defense_adjusted', 'more_grades_defense_adjusted',
-    'less_grades_hands_drop_adjusted', 'more_grades_coverage_defense_adjusted',
-    'less_grades_run_defense_adjusted', 'less_grades_run_adjusted',
-    'more_grades_defense_penalty_adjusted', 'less_grades_pass_route_adjusted',
-    'less_grades_defense_penalty_adjusted', 'more_grades_overall_tackle_adjusted',
-    'more_grades_run_defense_adjusted', 'more_grades_hands_drop_adjusted',
+    'less_grades_run', 'less_grades_run_adjusted',
     
     # Directional/depth variants
     'behind_los_pressure_to_sack_rate', 'center_behind_los_pressure_to_sack_rate',
@@ -146,24 +82,8 @@ EXCLUDED_COLUMNS = {
     'right_deep_grades_pass_adjusted',
     
     # Blitz/pressure base variants
-    'blitz_grades_coverage_defense', 'blitz_grades_defense',
-    'blitz_grades_defense_penalty', 'blitz_grades_hands_drop',
-    'blitz_grades_overall_tackle', 'blitz_grades_pass_route',
-    'blitz_grades_pass_rush_defense', 'blitz_grades_run',
-    'blitz_grades_tackle', 'no_blitz_grades_coverage_defense',
-    'no_blitz_grades_defense', 'no_blitz_grades_defense_penalty',
-    'no_blitz_grades_hands_drop', 'no_blitz_grades_overall_tackle',
-    'no_blitz_grades_pass_route', 'no_blitz_grades_pass_rush_defense',
-    'no_blitz_grades_tackle', 'no_pressure_grades_coverage_defense',
-    'no_pressure_grades_defense', 'no_pressure_grades_defense_penalty',
-    'no_pressure_grades_hands_drop', 'no_pressure_grades_overall_tackle',
-    'no_pressure_grades_pass_route', 'no_pressure_grades_pass_rush_defense',
-    'no_pressure_grades_run', 'no_pressure_grades_tackle',
-    'no_pressure_pressure_to_sack_rate', 'pressure_grades_coverage_defense',
-    'pressure_grades_defense', 'pressure_grades_defense_penalty',
-    'pressure_grades_hands_drop', 'pressure_grades_overall_tackle',
-    'pressure_grades_pass_route', 'pressure_grades_pass_rush_defense',
-    'pressure_grades_tackle',
+    'blitz_grades_run', 'no_pressure_grades_run',
+    'no_pressure_pressure_to_sack_rate',
     
     # Metadata to exclude
     'player',  # Keep only playerId and player_id_PFF
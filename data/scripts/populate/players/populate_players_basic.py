@@ -1,23 +1,31 @@
-import sqlite3
 import os
 import json
 from pathlib import Path
 from dotenv import load_dotenv
 import requests
-from fuzzywuzzy import fuzz
-import csv
 import time
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
-from functools import lru_cache
+import sys
+
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pipeline.db import connect
+from pipeline.headshots import validate_headshots
+from pipeline.matching import load_pff_candidates, match_team, normalize_name
+from pipeline.identity import build_player_identity
+from pipeline.teams import load_team_index, resolve_team
 
 # Load environment variables
 load_dotenv()
 API_KEY = os.getenv("API_KEY", "xPVVHT3+7AMkH/gk2Rbnpin03CxVlm6HyGgL2yNiPL1riWLPRUQGS5nE1AXEBMmV")
+# HEADSHOT_STUB=1 checks headshots against the offline stub instead of espncdn (scratch databases only)
+HEADSHOT_STUB = os.getenv("HEADSHOT_STUB") == "1"
 
 # Database connection
 DB_FILE = Path("/Users/christianberry/Desktop/Perennial Data/perennial-data-app/server/data/db/cfb_database.db")
-conn = sqlite3.connect(DB_FILE)
+conn = connect(DB_FILE)
 cursor = conn.cursor()
 
 # Check and add headshotURL column if it doesn't exist
@@ -70,308 +78,24 @@ def fetch_team_roster(team, year):
         print(f"No roster data for {team}, year {year}")
         return []
 
-def fetch_team_id(team_name, year):
-    """Fetch team ID from Teams table based on school (lowercase match)."""
-    cursor.execute("SELECT id FROM Teams WHERE LOWER(school) = ? AND year = ?", (team_name.lower(), year))
-    result = cursor.fetchone()
-    return result[0] if result else None
-
-def fetch_headshot_url(player_id):
-    """Fetch headshot URL for a given playerId."""
-    headshot_url = f"https://a.espncdn.com/combiner/i?img=/i/headshots/college-football/players/full/{player_id}.png&w=350&h=254"
-    try:
-        response = session.head(headshot_url, timeout=5)
-        response.raise_for_status()
-        return headshot_url
-    except requests.RequestException:
-        return None
-
-# ============================================================================
-# OPTIMIZATION 1: Cache team mapping as a module-level constant
-# ============================================================================
-TEAM_MAPPING = {
-    "auburn": "AUBURN",
-    "uab": "UAB",
-    "south alabama": "S ALABAMA",
-    "missouri state": "MO STATE",
-    "delaware": "DELAWARE",
-    "arkansas": "ARKANSAS",
-    "arizona state": "ARIZONA ST",
-    "arizona": "ARIZONA",
-    "north carolina": "N CAROLINA",
-    "jacksonville state": "JVILLE ST",
-    "san josé state": "S JOSE ST",
-    "stanford": "STANFORD",
-    "california": "CAL",
-    "ucla": "UCLA",
-    "usc": "USC",
-    "colorado state": "COLO STATE",
-    "colorado": "COLORADO",
-    "uconn": "UCONN",
-    "florida state": "FLORIDA ST",
-    "florida international": "FIU",
-    "florida": "FLORIDA",
-    "wake forest": "WAKE",
-    "georgia tech": "GA TECH",
-    "georgia": "GEORGIA",
-    "hawai'i": "HAWAII",
-    "iowa state": "IOWA STATE",
-    "boise state": "BOISE ST",
-    "northwestern": "NWESTERN",
-    "indiana": "INDIANA",
-    "notre dame": "NOTRE DAME",
-    "kentucky": "KENTUCKY",
-    "louisville": "LOUISVILLE",
-    "western kentucky": "W KENTUCKY",
-    "lsu": "LSU",
-    "boston college": "BOSTON COL",
-    "massachusetts": "UMASS",
-    "maryland": "MARYLAND",
-    "michigan state": "MICH STATE",
-    "michigan": "MICHIGAN",
-    "minnesota": "MINNESOTA",
-    "missouri": "MISSOURI",
-    "ole miss": "OLE MISS",
-    "duke": "DUKE",
-    "east carolina": "E CAROLINA",
-    "nc state": "NC STATE",
-    "pittsburgh": "PITTSBURGH",
-    "nebraska": "NEBRASKA",
-    "south carolina": "S CAROLINA",
-    "new mexico state": "NEW MEX ST",
-    "new mexico": "NEW MEXICO",
-    "syracuse": "SYRACUSE",
-    "bowling green": "BOWL GREEN",
-    "miami (oh)": "MIAMI OH",
-    "baylor": "BAYLOR",
-    "ohio state": "OHIO STATE",
-    "ohio": "OHIO",
-    "oklahoma state": "OKLA STATE",
-    "oklahoma": "OKLAHOMA",
-    "tulsa": "TULSA",
-    "oregon state": "OREGON ST",
-    "penn state": "PENN STATE",
-    "temple": "TEMPLE",
-    "clemson": "CLEMSON",
-    "memphis": "MEMPHIS",
-    "vanderbilt": "VANDERBILT",
-    "rice": "RICE",
-    "texas a&m": "TEXAS A&M",
-    "houston": "HOUSTON",
-    "miami": "MIAMI FL",
-    "north texas": "N TEXAS",
-    "texas": "TEXAS",
-    "byu": "BYU",
-    "utah": "UTAH",
-    "james madison": "JAMES MAD",
-    "virginia": "VIRGINIA",
-    "virginia tech": "VA TECH",
-    "washington": "WASHINGTON",
-    "washington state": "WASH STATE",
-    "wisconsin": "WISCONSIN",
-    "marshall": "MARSHALL",
-    "west virginia": "W VIRGINIA",
-    "fresno state": "FRESNO ST",
-    "georgia southern": "GA SOUTHRN",
-    "old dominion": "DOMINION",
-    "louisiana": "LA LAFAYET",
-    "coastal carolina": "COAST CAR",
-    "texas state": "TEXAS ST",
-    "utah state": "UTAH ST",
-    "alabama": "ALABAMA",
-    "kennesaw state": "KENNESAW",
-    "mississippi state": "MISS STATE",
-    "army": "ARMY",
-    "illinois": "ILLINOIS",
-    "air force": "AIR FORCE",
-    "akron": "AKRON",
-    "app state": "APP STATE",
-    "arkansas state": "ARK STATE",
-    "ball state": "BALL ST",
-    "buffalo": "BUFFALO",
-    "ucf": "UCF",
-    "central michigan": "C MICHIGAN",
-    "cincinnati": "CINCINNATI",
-    "eastern michigan": "E MICHIGAN",
-    "florida atlantic": "FAU",
-    "fiu": "FIU",
-    "georgia state": "GA STATE",
-    "iowa": "IOWA",
-    "kansas": "KANSAS",
-    "kansas state": "KANSAS ST",
-    "kent state": "KENT STATE",
-    "liberty": "LIBERTY",
-    "louisiana tech": "LA TECH",
-    "middle tennessee": "MIDDLE TN",
-    "navy": "NAVY",
-    "charlotte": "CHARLOTTE",
-    "ul monroe": "LA MONROE",
-    "unlv": "UNLV",
-    "nevada": "NEVADA",
-    "northern illinois": "N ILLINOIS",
-    "oregon": "OREGON",
-    "purdue": "PURDUE",
-    "sam houston": "SM HOUSTON",
-    "smu": "SMU",
-    "southern miss": "SO MISS",
-    "tcu": "TCU",
-    "tennessee": "TENNESSEE",
-    "utsa": "UTSA",
-    "utep": "UTEP",
-    "texas tech": "TEXAS TECH",
-    "toledo": "TOLEDO",
-    "troy": "TROY",
-    "tulane": "TULANE",
-    "western michigan": "W MICHIGAN",
-    "wyoming": "WYOMING",
-    "rutgers": "RUTGERS", 
-    "san diego state": "S DIEGO ST",
-    "south florida": "USF"
-}
-
-POSITION_ALIASES = {
-    "hb": ["rb", "hb"],
-    "rb": ["rb", "hb"],
-    "ol": ["ol", "c", "g", "t", "og", "ot"],
-    "c": ["c", "ol"], "g": ["g", "ol", "og"],
-    "t": ["t", "ol", "ot"], "og": ["og", "g", "ol"],
-    "ot": ["ot", "t", "ol"],
-    "qb": ["qb", "te"],
-    "wr": ["wr", "qb"],
-    "te": ["te", "qb", "wr"],
-    "fb": ["fb"],
-    "lb": ["lb", "ilb", "olb"],
-    "ilb": ["ilb", "lb"],
-    "olb": ["olb", "lb"],
-    "s": ["s", "fs", "ss"],
-    "fs": ["fs", "s"],
-    "ss": ["ss", "s"],
-    "cb": ["cb"],
-    "db": ["db", "cb", "s"],
-    "de": ["ed"],
-    "dt": ["dt", "di"],
-    "dl": ["dl", "de", "dt", "di"],
-    "k": ["k"],
-    "p": ["p"],
-    "edge": ["ed"]
-}
-
-# ============================================================================
-# OPTIMIZATION 2: Cache normalized names to avoid repeated string operations
-# ============================================================================
-@lru_cache(maxsize=10000)
-def normalize_name(name):
-    """Normalize a player name for fuzzy matching."""
-    return tuple(
-        name.lower().strip()
-        .replace(".", "").replace("'", "").replace("-", " ")
-        .replace("jr", "").replace("sr", "")
-        .replace("ii", "").replace("iii", "")
-        .replace("dj ", "d j ").replace("aj ", "a j ")
-        .replace("ollie ", "o ")
-        .split()
-    )
-
-# ============================================================================
-# OPTIMIZATION 3: Load PFF data ONCE and cache it globally
-# ============================================================================
-_PFF_DATA_CACHE = {}
-
-def load_pff_data_for_year(year):
-    """Load all PFF data for a given year into memory once."""
-    if year in _PFF_DATA_CACHE:
-        return _PFF_DATA_CACHE[year]
-    
-    print(f"Loading PFF data for year {year}...")
-    start_time = time.time()
-    
-    csv_paths = [
-        Path(f"/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/PFF_Data/Rushing/SeasonReports/{year}_RushingGrades.csv"),
-        Path(f"/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/PFF_Data/Passing/SeasonReports/{year}_PassingGrades.csv"),
-        Path(f"/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/PFF_Data/Receiving/SeasonReports/{year}_ReceivingGrades.csv"),
-        Path(f"/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/PFF_Data/Blocking/SeasonReports/{year}_BlockingGrades.csv"),
-        Path(f"/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/PFF_Data/Defense/SeasonReports/{year}_DefenseGrades.csv")
-    ]
-    
-    # OPTIMIZATION: Use dictionaries with better lookup structure
-    # Structure: pff_data[team_lower][position] = [(normalized_name, pff_id), ...]
-    pff_data = {}
-    
-    for csv_path in csv_paths:
-        if not csv_path.exists():
-            continue
-            
-        with open(csv_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            if not {"player", "team_name", "player_id", "position"}.issubset(reader.fieldnames):
-                print(f"Invalid CSV format in {csv_path}: missing required columns")
-                continue
-                
-            for row in reader:
-                player_name = row.get("player", "").strip()
-                if not player_name:
-                    continue
-                    
-                player_id = row.get("player_id")
-                team_name = row.get("team_name", "").lower().strip()
-                position = row.get("position", "").lower().strip()
-                
-                if not (player_id and position and team_name):
-                    continue
-                
-                # Map PFF team name to API team name
-                pff_team_mapped = next(
-                    (api_team for api_team, pff_team in TEAM_MAPPING.items() 
-                     if pff_team.lower() == team_name.lower()), 
-                    team_name
-                ).lower()
-                
-                # Normalize name once
-                player_name_normalized = normalize_name(player_name)
-                
-                # Store in nested dict for faster lookup
-                if pff_team_mapped not in pff_data:
-                    pff_data[pff_team_mapped] = {}
-                if position not in pff_data[pff_team_mapped]:
-                    pff_data[pff_team_mapped][position] = []
-                
-                pff_data[pff_team_mapped][position].append({
-                    'normalized_name': player_name_normalized,
-                    'name_str': " ".join(player_name_normalized),
-                    'pff_id': player_id,
-                    'position': position
-                })
-    
-    elapsed = time.time() - start_time
-    print(f"  ✓ Loaded PFF data in {elapsed:.2f}s")
-    
-    _PFF_DATA_CACHE[year] = pff_data
-    return pff_data
-
-# ============================================================================
-# OPTIMIZATION 4: Batch database operations and smarter matching
-# ============================================================================
-def attach_pff_ids(team, year):
-    """Attach PFF IDs to players with optimized matching."""
+def attach_pff_ids(team, team_id, year, team_index):
+    """Attach PFF IDs to a team's players with the blocked, optimal-assignment matcher (pipeline/matching.py)."""
     start_time = time.time()
     
-    # Load PFF data once for this year
-    pff_data = load_pff_data_for_year(year)
-    team_lower = team.lower()
+    # Load PFF data once for this year, keyed by teamID
+    pff_data = load_pff_candidates(year, team_index)
     
     # Get team's PFF data
-    if team_lower not in pff_data:
+    if team_id not in pff_data:
         print(f"No PFF data found for {team}")
         return 0
     
-    team_pff_data = pff_data[team_lower]
-    
     # Fetch all players for this team/year in ONE query
     cursor.execute(
         """SELECT playerId, name, team, year, position, player_id_PFF 
            FROM Players_Basic 
-           WHERE year = ? AND team = ?""",
-        (year, team_lower)
+           WHERE year = ? AND teamID = ?""",
+        (year, team_id)
     )
     players = cursor.fetchall()
     
@@ -379,77 +103,35 @@ def attach_pff_ids(team, year):
         print(f"No players found in database for {team}, year {year}")
         return 0
     
-    # Prepare batch updates
-    updates = []
-    used_pff_ids = set()
-    matched_count = 0
+    matches = match_team([(player_id, " ".join(normalize_name(name)), position)
+                          for player_id, name, _, _, position, _ in players], pff_data[team_id])
     
+    updates = []
     for player_id, name, team_db, year_db, player_position, current_pff_id in players:
-        name_normalized = normalize_name(name)
-        name_str = " ".join(name_normalized)
-        player_pos_normalized = player_position.lower().strip() if player_position else "unknown"
-        
-        # Get all possible positions this player could match
-        possible_positions = POSITION_ALIASES.get(player_pos_normalized, [player_pos_normalized])
-        
-        best_match = None
-        best_score = 0
+        if player_id not in matches:
+            continue
+        matched_pff_id, matched_pff_position, _ = matches[player_id]
         
-        # OPTIMIZATION: Only search relevant positions
-        for pos in possible_positions:
-            if pos not in team_pff_data:
-                continue
-            
-            for pff_player in team_pff_data[pos]:
-                pff_id = pff_player['pff_id']
-                
-                # Skip if already used (unless it's the current ID)
-                if pff_id in used_pff_ids and pff_id != current_pff_id:
-                    continue
-                
-                # Calculate fuzzy match score
-                score = fuzz.ratio(name_str, pff_player['name_str'])
-                
-                # OPTIMIZATION: Early exit on exact or near-exact matches
-                if score >= 95:
-                    best_match = pff_player
-                    best_score = score
-                    break
-                
-                if score > best_score and score >= 80:
-                    best_match = pff_player
-                    best_score = score
-            
-            if best_score >= 95:  # Found excellent match, no need to check other positions
-                break
+        # Override position if API position is "OL" and PFF position is "C", "G", or "T"
+        new_position = player_position
+        if player_position and player_position.lower() in ["ol", "ot"] and matched_pff_position in ["c", "g", "t"]:
+            new_position = matched_pff_position.upper()
         
-        # Apply match if score is good enough
-        if best_match and best_score >= 80:
-            matched_pff_id = best_match['pff_id']
-            matched_pff_position = best_match['position']
-            used_pff_ids.add(matched_pff_id)
-            
-            # Override position if API position is "OL" and PFF position is "C", "G", or "T"
-            new_position = player_position
-            if player_position and player_position.lower() in ["ol", "ot"] and matched_pff_position in ["c", "g", "t"]:
-                new_position = matched_pff_position.upper()
-            
-            updates.append((matched_pff_id, new_position, player_id, team_db, year_db))
-            matched_count += 1
+        updates.append((matched_pff_id, new_position, player_id, year_db))
     
-    # OPTIMIZATION: Execute all updates in a batch
+    # Execute all updates in a batch
     if updates:
         cursor.executemany(
             """UPDATE Players_Basic 
                SET player_id_PFF = ?, position = ? 
-               WHERE playerId = ? AND team = ? AND year = ?""",
+               WHERE playerId = ? AND year = ?""",
             updates
         )
     
     elapsed = time.time() - start_time
-    print(f"  Matched {matched_count}/{len(players)} players for {team} in {elapsed:.2f}s")
+    print(f"  Matched {len(updates)}/{len(players)} players for {team} in {elapsed:.2f}s")
     
-    return matched_count
+    return len(updates)
 
 def main():
     try:
@@ -464,7 +146,16 @@ def main():
         if not roster:
             return
         
-        player_count = 0
+        # Resolve the team once through Team_Aliases; every player row is stamped with its teamID
+        team_index = load_team_index(cursor)
+        team_id = resolve_team(team_index, team)
+        cursor.execute("SELECT school FROM Teams WHERE id = ? AND year = ?", (team_id, year))
+        team_data = cursor.fetchone()
+        school = team_data[0] if team_data else team.lower()
+        if team_id is None:
+            print(f"  ⚠ {team} is not in Team_Aliases; players are saved without a teamID")
+        
+        rows = []
         for player in roster:
             player_id = player.get("playerId") or player.get("id")
             if not player_id:
@@ -483,36 +174,36 @@ def main():
             jersey = player.get("jersey")
             redshirt = player.get("redshirt", None) if isinstance(player.get("redshirt"), bool) else None
             
-            # Map team to school and get teamID
-            team_from_roster = team.lower()
-            cursor.execute("SELECT school, id FROM Teams WHERE LOWER(school) = ? AND year = ?", (team_from_roster, year))
-            team_data = cursor.fetchone()
-            school = team_data[0] if team_data else team_from_roster
-            team_id = team_data[1] if team_data else None
-            
-            # Fetch headshot URL
-            headshot_url = fetch_headshot_url(player_id)
-            
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO Players_Basic (
-                    playerId, year, name, team, school, teamID, position, height, weight, homeCity, homeState,
-                    homeCountry, homeProvince, homeLatitude, homeLongitude, jersey, redshirt, player_id_PFF, headshotURL
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (player_id, year, name, team.lower(), school, team_id, position, height, weight, home_city, home_state,
-                 home_country, None, home_latitude, home_longitude, jersey, redshirt, None, headshot_url)
-            )
-            player_count += cursor.rowcount
+            rows.append([player_id, year, name, team.lower(), school, team_id, position, height, weight, home_city,
+                         home_state, home_country, None, home_latitude, home_longitude, jersey, redshirt, None])
+        
+        # Check every headshot in one concurrent pass; players cached in Headshot_Cache are not re-requested
+        headshots, stats = validate_headshots(cursor, [row[0] for row in rows], stub=HEADSHOT_STUB)
+        print(f"  ✓ Headshots: {stats['found']} found, {stats['missing']} missing, {stats['failed']} failed, "
+              f"{stats['cached']} cached in {stats['seconds']:.2f}s")
+        
+        cursor.executemany(
+            """
+            INSERT OR REPLACE INTO Players_Basic (
+                playerId, year, name, team, school, teamID, position, height, weight, homeCity, homeState,
+                homeCountry, homeProvince, homeLatitude, homeLongitude, jersey, redshirt, player_id_PFF, headshotURL
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [row + [headshots[str(row[0])]] for row in rows]
+        )
+        player_count = len(rows)
         
         print(f"\n[1/2] Saved {player_count} players")
         
         # Attach PFF IDs
         print(f"[2/2] Matching PFF IDs...")
-        attach_pff_ids(team, year)
+        attach_pff_ids(team, team_id, year, team_index)
         
         conn.commit()
         
+        # Refresh the shared (player_id_PFF, year) identity map the PFF loaders read
+        build_player_identity(cursor)
+        
         print(f"\n{'='*80}")
         print(f"✓ COMPLETE")
         print(f"{'='*80}\n")
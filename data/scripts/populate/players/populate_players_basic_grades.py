@@ -1,8 +1,18 @@
-import sqlite3
-import os
-import csv
+import sys
+import time
+import argparse
 from pathlib import Path
 
+import numpy as np
+
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pipeline.config import DB_FILE, PFF_DATA_DIR
+from pipeline.db import connect, finish_bulk, table_exists
+from pipeline.parsing import numeric_block, read_header
+from pipeline.columnar import read_season_export
+
 # Configuration for position-specific CSV and stat mappings
 GRADE_CONFIG = {
     "QB": {
@@ -184,156 +194,180 @@ GRADE_CONFIG = {
     }
 }
 
-# Database connection with absolute path
-DB_FILE = Path("/Users/christianberry/Desktop/Perennial Data/perennial-data-app/server/data/db/cfb_database.db")
-conn = sqlite3.connect(DB_FILE)
-cursor = conn.cursor()
-
-# Dynamically determine new columns from GRADE_CONFIG
-new_columns = set()
-for config in GRADE_CONFIG.values():
-    new_columns.update(config.get("extra_columns", []))
-    for field in config.get("additional_db_fields", []):
-        new_columns.add(field["name"])
-
-# Check if table exists and alter it to add new columns if needed
-cursor.execute("PRAGMA table_info(Players_Basic_Grades)")
-existing_columns = {row[1] for row in cursor.fetchall()}  # Set of column names
-if new_columns - existing_columns:
-    real_cols = ['completion_percent', 'yards', 'ypa', 'yards_per_reception', 'RBR']  # Add RBR as REAL
-    for col in new_columns - existing_columns:
-        col_type = 'REAL' if col in real_cols else 'INTEGER'
-        cursor.execute(f"ALTER TABLE Players_Basic_Grades ADD COLUMN {col} {col_type}")
-
-# Ensure school, teamID, and grades_defense are added if not present
-if {'school', 'teamID', 'grades_defense'} - existing_columns:
-    if 'school' not in existing_columns:
-        cursor.execute("ALTER TABLE Players_Basic_Grades ADD COLUMN school TEXT")
-    if 'teamID' not in existing_columns:
-        cursor.execute("ALTER TABLE Players_Basic_Grades ADD COLUMN teamID INTEGER")
-    if 'grades_defense' not in existing_columns:
-        cursor.execute("ALTER TABLE Players_Basic_Grades ADD COLUMN grades_defense REAL")
-
-# Create Players_Basic_Grades table if it doesn't exist (with all columns)
-cursor.execute("""
-CREATE TABLE IF NOT EXISTS Players_Basic_Grades (
-    playerId TEXT NOT NULL,
-    year INTEGER NOT NULL,
-    name TEXT NOT NULL,
-    team TEXT NOT NULL,
-    position TEXT NOT NULL,
-    player_id_PFF TEXT,
-    grades_pass REAL,
-    grades_run REAL,
-    grades_pass_route REAL,
-    grades_offense REAL,
-    grades_defense REAL,
-    school TEXT,
-    teamID INTEGER,
-    player_game_count INTEGER,
-    completion_percent REAL,
-    yards INTEGER,
-    ypa REAL,
-    touchdowns INTEGER,
-    interceptions INTEGER,
-    fumbles INTEGER,
-    yards_per_reception REAL,
-    receptions INTEGER,
-    attempts INTEGER,
-    RBR REAL,
-    PRIMARY KEY (playerId, year),
-    FOREIGN KEY (playerId, year) REFERENCES Players_Basic(playerId, year)
-)
-""")
-
-def fetch_pff_grades_for_position(year):
-    """Fetch grades and extra stats for all positions from Players_Basic and match with PFF CSV."""
-    # Fetch all players from Players_Basic
-    cursor.execute("SELECT playerId, year, name, team, position, player_id_PFF, school, teamID FROM Players_Basic WHERE year = ?", (year,))
-    players_basic = {row[5]: row for row in cursor.fetchall()}  # Map player_id_PFF to (playerId, year, name, team, pos, pff_id, school, teamID)
-    for position in GRADE_CONFIG.keys():
-        config = GRADE_CONFIG.get(position)
-        csv_path = Path(f"/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/PFF_Data/{config['csv_dir']}/{year}_{config['csv_file']}")
+GRADES_TABLE = "Players_Basic_Grades"
+# Temp table holding one season CSV while every position that reads it is written
+STAGED_TABLE = "temp.staged_grades"
+# Columns added from GRADE_CONFIG are INTEGER unless listed here
+REAL_COLUMNS = ['completion_percent', 'yards', 'ypa', 'yards_per_reception', 'RBR']
+DEFAULT_YEAR = 2025
+
+
+# ============================================================================
+# Single-pass rebuild: each season CSV is read once and staged in a temp table, then every position that
+# uses it is written with one INSERT ... SELECT that joins Players_Basic and the position's
+# Players_Full_Percentiles_* table. The old loop parsed every CSV once per position (twice over, since
+# main() called it per position too) and ran a SELECT per player for each additional_db_fields entry.
+# ============================================================================
+
+def ensure_grades_table(cursor):
+    """Create Players_Basic_Grades if needed and add any GRADE_CONFIG column it is missing."""
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {GRADES_TABLE} (
+        playerId TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        team TEXT NOT NULL,
+        position TEXT NOT NULL,
+        player_id_PFF TEXT,
+        grades_pass REAL,
+        grades_run REAL,
+        grades_pass_route REAL,
+        grades_offense REAL,
+        grades_defense REAL,
+        school TEXT,
+        teamID INTEGER,
+        player_game_count INTEGER,
+        completion_percent REAL,
+        yards INTEGER,
+        ypa REAL,
+        touchdowns INTEGER,
+        interceptions INTEGER,
+        fumbles INTEGER,
+        yards_per_reception REAL,
+        receptions INTEGER,
+        attempts INTEGER,
+        RBR REAL,
+        PRIMARY KEY (playerId, year),
+        FOREIGN KEY (playerId, year) REFERENCES Players_Basic(playerId, year)
+    )
+    """)
+    cursor.execute(f"PRAGMA table_info({GRADES_TABLE})")
+    existing_columns = {row[1] for row in cursor.fetchall()}
+    new_columns = {'school': 'TEXT', 'teamID': 'INTEGER', 'grades_defense': 'REAL'}
+    for config in GRADE_CONFIG.values():
+        for col in config["extra_columns"] + [field["name"] for field in config["additional_db_fields"]]:
+            new_columns.setdefault(col, 'REAL' if col in REAL_COLUMNS else 'INTEGER')
+    for col, col_type in new_columns.items():
+        if col not in existing_columns:
+            cursor.execute(f"ALTER TABLE {GRADES_TABLE} ADD COLUMN {col} {col_type}")
+
+
+def grade_columns(config):
+    """CSV columns a position writes: its stat column, then its extra columns (each once)."""
+    return list(dict.fromkeys([config["stat_column"]] + config["extra_columns"]))
+
+
+def stage_csv(cursor, csv_path, columns):
+    """Load player_id and the given columns of one PFF CSV into STAGED_TABLE; returns the staged row count.
+
+    Cells that are not numbers are staged as NULL. A player_id listed twice keeps its last row.
+    """
+    table = read_season_export(csv_path, columns=["player_id"] + columns)
+    block = numeric_block(table, columns)
+    cells = block.astype(object)
+    cells[np.isnan(block)] = None
+    rows = [(player_id, *values) for player_id, values in zip(table.column("player_id").to_pylist(), cells.tolist())
+            if player_id]
+    cursor.execute(f"DROP TABLE IF EXISTS {STAGED_TABLE}")
+    cursor.execute(f"CREATE TABLE {STAGED_TABLE} (player_id TEXT PRIMARY KEY, {', '.join(f'{col} REAL' for col in columns)})")
+    cursor.executemany(f"INSERT OR REPLACE INTO {STAGED_TABLE} VALUES ({', '.join('?' * (len(columns) + 1))})", rows)
+    return len(rows)
+
+
+def additional_field_sources(cursor, config):
+    """(join clauses, {column: expression}) for a position's additional_db_fields.
+
+    Players_Basic fields come straight from the pb alias; every other table is LEFT JOINed once on
+    (playerId, year). A table or column that does not exist yet is written as NULL.
+    """
+    joins, tables, expressions = [], {}, {}
+    for field in config["additional_db_fields"]:
+        name, table = field["name"], field["table"]
+        if table == "Players_Basic":
+            alias = "pb"
+        elif table in tables:
+            alias = tables[table]
+        elif table_exists(cursor, table):
+            alias = tables[table] = f"t{len(tables)}"
+            joins.append(f"LEFT JOIN {table} {alias} ON {alias}.playerId = pb.playerId AND {alias}.year = pb.year")
+        else:
+            print(f"  ⚠ {table} does not exist; {name} left NULL")
+            expressions[name] = "NULL"
+            continue
+        cursor.execute(f"PRAGMA table_info({table})")
+        if name in {row[1] for row in cursor.fetchall()}:
+            expressions[name] = f"{alias}.{name}"
+        else:
+            print(f"  ⚠ {table} has no {name} column; left NULL")
+            expressions[name] = "NULL"
+    return joins, expressions
+
+
+def write_position(cursor, position, config, year):
+    """Upsert the grades of one position-season from STAGED_TABLE; returns the number of rows written.
+
+    Existing rows keep their name, team and position; the grade, school, teamID and every configured
+    column are replaced.
+    """
+    joins, additional = additional_field_sources(cursor, config)
+    # An additional field that shares a CSV column's name wins, as the rightmost SET did before
+    values = {col: f"s.{col}" for col in grade_columns(config)}
+    values.update(additional)
+    values = {'school': "COALESCE(pb.school, LOWER(pb.team))", 'teamID': "pb.teamID", **values}
+    cursor.execute(f"""
+        INSERT INTO {GRADES_TABLE} (playerId, year, name, team, position, player_id_PFF, {', '.join(values)})
+        SELECT pb.playerId, pb.year, pb.name, pb.team, pb.position, pb.player_id_PFF, {', '.join(values.values())}
+        FROM Players_Basic pb
+        JOIN {STAGED_TABLE} s ON s.player_id = pb.player_id_PFF
+        {' '.join(joins)}
+        WHERE pb.year = ? AND pb.position = ?
+        ON CONFLICT (playerId, year) DO UPDATE SET {', '.join(f'{col} = excluded.{col}' for col in values)}
+    """, (year, position))
+    return cursor.rowcount
+
+
+def build_grades(cursor, year):
+    """Rebuild every position's grades for one season, reading each CSV once; returns {position: rows}."""
+    by_file = {}
+    for position, config in GRADE_CONFIG.items():
+        by_file.setdefault(PFF_DATA_DIR / config["csv_dir"] / f"{year}_{config['csv_file']}", []).append(position)
+
+    written = {}
+    for csv_path, positions in by_file.items():
         if not csv_path.exists():
-            print(f"CSV not found for {position}: {csv_path}")
+            print(f"  ⚠ CSV not found for {', '.join(positions)}: {csv_path}")
+            continue
+        header = set(read_header(csv_path))
+        valid = []
+        for position in positions:
+            if {"player_id", *grade_columns(GRADE_CONFIG[position])} <= header:
+                valid.append(position)
+            else:
+                print(f"  ⚠ Invalid CSV format for {position} in {csv_path}: missing required columns")
+        if not valid:
             continue
-        with open(csv_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            required_columns = {"player_id", config["stat_column"]}
-            if config["extra_columns"]:
-                required_columns.update(config["extra_columns"])
-            if not required_columns.issubset(reader.fieldnames):
-                print(f"Invalid CSV format for {position} in {csv_path}: missing required columns")
-                continue
-            pff_data = {}
-            for row in reader:
-                player_id_pff = row["player_id"]
-                if player_id_pff in players_basic:
-                    stat_value = row.get(config["stat_column"], "").strip()
-                    if stat_value and stat_value.replace(".", "").replace("-", "").replace("+", "").isdigit():
-                        pff_data[player_id_pff] = {"grade": float(stat_value)}
-                    else:
-                        pff_data[player_id_pff] = {"grade": None}  # Allow NULL for invalid values
-                    for col in config["extra_columns"]:
-                        value = row.get(col, "").strip()
-                        if value and value.replace(".", "").replace("-", "").replace("+", "").isdigit():
-                            pff_data[player_id_pff][col] = float(value) if "." in value else int(value)
-                        else:
-                            pff_data[player_id_pff][col] = None  # Allow NULL for invalid values
-            # Update or insert data
-            for player_id_pff, (player_id, year, name, team, pos, _, school, team_id) in players_basic.items():
-                if player_id_pff in pff_data and pos == position:  # Match position from Players_Basic
-                    data = pff_data[player_id_pff]
-                    grade_value = data.get("grade")
-                    school = school if school is not None else team.lower()  # Fallback to lowercase team if school is null
-                    team_id = team_id if team_id is not None else None  # Keep teamID as is, or None if not set
-                    extra_values = [data.get(col) for col in config["extra_columns"]]
-                    # Fetch additional DB fields if defined
-                    additional_values = []
-                    additional_columns = []
-                    if "additional_db_fields" in config:
-                        for field in config["additional_db_fields"]:
-                            cursor.execute(f"SELECT {field['name']} FROM {field['table']} WHERE playerId = ? AND year = ?", (player_id, year))
-                            result = cursor.fetchone()
-                            additional_values.append(result[0] if result else None)
-                            additional_columns.append(field['name'])
-                    if config["extra_columns"] or additional_columns:
-                        # Update existing row
-                        set_clause = f"{config['stat_column']} = ?, school = ?, teamID = ?, {', '.join(f'{col} = ?' for col in config['extra_columns'] + additional_columns)}"
-                        update_query = f"UPDATE Players_Basic_Grades SET {set_clause} WHERE playerId = ? AND year = ?"
-                        update_params = [grade_value, school, team_id] + extra_values + additional_values + [player_id, year]
-                        cursor.execute(update_query, update_params)
-                        if cursor.rowcount == 0:
-                            # Insert if not exists
-                            insert_columns = ["playerId", "year", "name", "team", "position", "player_id_PFF", config["stat_column"], "school", "teamID"]
-                            insert_columns.extend(config["extra_columns"])
-                            insert_columns.extend(additional_columns)
-                            insert_params = [player_id, year, name, team, pos or 'Unknown', player_id_pff, grade_value, school, team_id] + extra_values + additional_values
-                            insert_query = f"INSERT INTO Players_Basic_Grades ({', '.join(insert_columns)}) VALUES ({'?,' * (len(insert_columns) - 1)}?)"
-                            cursor.execute(insert_query, insert_params)
-                    else:
-                        # Update existing row with the correct stat column
-                        cursor.execute(
-                            f"UPDATE Players_Basic_Grades SET {config['stat_column']} = ?, school = ?, teamID = ? WHERE playerId = ? AND year = ?",
-                            (grade_value, school, team_id, player_id, year)
-                        )
-                        if cursor.rowcount == 0:
-                            # Insert if not exists
-                            cursor.execute(
-                                f"""
-                                    INSERT INTO Players_Basic_Grades (playerId, year, name, team, position, player_id_PFF, {config['stat_column']}, school, teamID)
-                                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                                    """,
-                                (player_id, year, name, team, pos or 'Unknown', player_id_pff, grade_value, school, team_id)
-                            )
-
-def main(year):
+        stage_csv(cursor, csv_path, list(dict.fromkeys(col for position in valid
+                                                       for col in grade_columns(GRADE_CONFIG[position]))))
+        for position in valid:
+            written[position] = write_position(cursor, position, GRADE_CONFIG[position], year)
+    cursor.execute(f"DROP TABLE IF EXISTS {STAGED_TABLE}")
+    return written
+
+
+def main(years, bulk=True):
+    conn = connect(DB_FILE, bulk=bulk)
+    cursor = conn.cursor()
     try:
-        # Process all positions
-        for position in GRADE_CONFIG.keys():
-            fetch_pff_grades_for_position(year)
-        conn.commit()
-        print(f"Population of Players_Basic_Grades completed for all positions in year {year}")
+        ensure_grades_table(cursor)
+        for year in years:
+            start = time.time()
+            written = build_grades(cursor, year)
+            conn.commit()
+            counts = ", ".join(f"{position} {rows:,}" for position, rows in written.items() if rows)
+            print(f"  ✓ {year}: {sum(written.values()):,} rows in {time.time() - start:.2f}s ({counts or 'none'})")
+        if bulk:
+            finish_bulk(conn)
+        print(f"Population of Players_Basic_Grades completed for all positions in {', '.join(map(str, years))}")
     except Exception as e:
         print(f"Error: {e}")
         conn.rollback()
@@ -341,5 +375,12 @@ def main(year):
         conn.close()
 
 if __name__ == "__main__":
-    year = 2025
-    main(year)
\ No newline at end of file
+    parser = argparse.ArgumentParser(
+        description="Rebuild Players_Basic_Grades (the /api/playerdashboard table) from the PFF season grade "
+                    "CSVs, Players_Basic and the Players_Full_Percentiles_* ratings.")
+    parser.add_argument("--year", type=int, action="append", dest="years",
+                        help=f"Season to rebuild (repeatable, default: {DEFAULT_YEAR})")
+    parser.add_argument("--no-bulk", action="store_true", help="Use a default connection instead of the bulk-load session")
+    args = parser.parse_args()
+
+    main(args.years or [DEFAULT_YEAR], bulk=not args.no_bulk)
@@ -0,0 +1,20 @@
+import sys
+import argparse
+from pathlib import Path
+
+# Make the shared pipeline package importable when run as a plain script (python3 populate_full_percentiles.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipeline.reports import PERCENTILE_TABLES
+from pipeline.percentiles import PERCENTILE_MODES, main
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Recompute the percentile_* columns of the Players_Full_Percentiles_* tables in place "
+                    "(the per-position populate_full_percentiles_*.py scripts load the metrics).")
+    parser.add_argument("tables", nargs="*", help=f"Tables to recompute (default: all). Choices: {', '.join(PERCENTILE_TABLES)}")
+    parser.add_argument("--mode", choices=PERCENTILE_MODES, help="Override every table's registered percentile mode for this run")
+    parser.add_argument("--no-bulk", action="store_true", help="Use a default connection instead of the bulk-load session")
+    args = parser.parse_args()
+
+    main(args.tables, bulk=not args.no_bulk, mode=args.mode)
@@ -0,0 +1,19 @@
+import sys
+import argparse
+from pathlib import Path
+
+# Make the shared pipeline package importable when run as a plain script (python3 populate_full_ratings.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipeline.reports import RATING_TABLES
+from pipeline.ratings import main
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Recompute the composite ratings (QBR, WRR, CBR, ...) of the Players_Full_Percentiles_* tables "
+                    "in place from RATING_TABLES in pipeline/reports.py.")
+    parser.add_argument("tables", nargs="*", help=f"Tables to recompute (default: all). Choices: {', '.join(RATING_TABLES)}")
+    parser.add_argument("--no-bulk", action="store_true", help="Use a default connection instead of the bulk-load session")
+    args = parser.parse_args()
+
+    main(args.tables, bulk=not args.no_bulk)
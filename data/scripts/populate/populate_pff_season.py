@@ -0,0 +1,28 @@
+import sys
+import argparse
+from pathlib import Path
+
+# Make the shared pipeline package importable when run as a plain script (python3 populate_pff_season.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipeline.reports import SEASON_REPORTS
+from pipeline.season_loader import main
+from pipeline.writer import DEFAULT_BATCH_SIZE
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Populate Players_*_Season tables from PFF season exports.")
+    parser.add_argument("reports", nargs="*", help=f"Reports to load (default: all). Choices: {', '.join(SEASON_REPORTS)}")
+    parser.add_argument("--full", action="store_true", help="Ignore the ingest manifest and rebuild every table")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per executemany batch when writing")
+    parser.add_argument("--no-bulk", action="store_true", help="Use a default connection instead of the bulk-load session")
+    parser.add_argument("--stream", action="store_true",
+                        help="Stage and write one season at a time so memory stays flat as PFF_Data grows")
+    parser.add_argument("--year", type=int, action="append", dest="years",
+                        help="Reload only this season (repeatable), whatever the manifest says")
+    args = parser.parse_args()
+
+    if args.full and args.years:
+        parser.error("--full cannot be combined with --year")
+
+    main(args.reports, full=args.full, batch_size=args.batch_size, bulk=not args.no_bulk,
+         years=set(args.years) if args.years else None, stream=args.stream)
@@ -0,0 +1,41 @@
+import sys
+import argparse
+from pathlib import Path
+
+# Make the shared pipeline package importable when run as a plain script (python3 populate_pff_weekly.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipeline.reports import WEEKLY_REPORTS
+from pipeline.weekly_loader import main, parse_week_token
+from pipeline.writer import DEFAULT_BATCH_SIZE
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Populate Players_*_Weekly tables from PFF weekly exports.")
+    parser.add_argument("reports", nargs="*", help=f"Reports to load (default: all). Choices: {', '.join(WEEKLY_REPORTS)}")
+    parser.add_argument("--workers", type=int, default=0, help="Decode CSVs in N worker processes (0 = in-process)")
+    parser.add_argument("--full", action="store_true", help="Ignore the ingest manifest and rebuild every table")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per executemany batch when writing")
+    parser.add_argument("--no-bulk", action="store_true", help="Use a default connection instead of the bulk-load session")
+    parser.add_argument("--stream", action="store_true",
+                        help="Parse, stage and write one week at a time so memory stays flat as PFF_Data grows")
+    parser.add_argument("--year", type=int, help="With --week: reload only this season's week")
+    parser.add_argument("--week", help="Week token as in the filenames (8, CC, 2ndPO...); requires --year")
+    parser.add_argument("--seasonType", choices=["regular", "postseason"], help="Override the season type implied by --week")
+    args = parser.parse_args()
+
+    partition = None
+    if args.year is not None or args.week is not None:
+        if args.year is None or args.week is None:
+            parser.error("--year and --week must be given together")
+        if args.full:
+            parser.error("--full cannot be combined with --year/--week")
+        parsed = parse_week_token(args.week)
+        if parsed is None:
+            parser.error(f"Unsupported week {args.week}")
+        week, seasonType = parsed
+        partition = (args.year, week, args.seasonType or seasonType)
+    elif args.seasonType:
+        parser.error("--seasonType requires --year and --week")
+
+    main(args.reports, workers=args.workers, full=args.full, batch_size=args.batch_size, bulk=not args.no_bulk,
+         partition=partition, stream=args.stream)
@@ -1,10 +1,16 @@
-import sqlite3
 import os
 import requests
 import json
 from pathlib import Path
 from dotenv import load_dotenv
 import time
+import sys
+
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pipeline.db import connect
+from pipeline.teams import build_team_aliases
 
 # Load environment variables
 load_dotenv()
@@ -12,7 +18,7 @@ API_KEY = os.getenv("API_KEY", "xPVVHT3+7AMkH/gk2Rbnpin03CxVlm6HyGgL2yNiPL1riWLP
 
 # Database connection
 DB_FILE = Path("/Users/christianberry/Desktop/Perennial Data/perennial-data-app/server/data/db/cfb_database.db")
-conn = sqlite3.connect(DB_FILE)
+conn = connect(DB_FILE)
 cursor = conn.cursor()
 
 print("=" * 80)
@@ -241,6 +247,17 @@ if missing:
         venue_str = f" - {venue}" if venue else ""
         print(f"  {school} ({year}){venue_str}")
 
+# ============================================================================
+# STEP 4: Rebuild the team alias index from the fresh Teams rows
+# ============================================================================
+print("\n[STEP 4] Rebuilding Team_Aliases...")
+alias_stats = build_team_aliases(cursor)
+print(f"  ✓ Team_Aliases: {alias_stats['aliases']:,} aliases for {alias_stats['teams']} teams")
+if alias_stats['ambiguous']:
+    print(f"  ⚠ {len(alias_stats['ambiguous'])} ambiguous alias(es) left out: {', '.join(alias_stats['ambiguous'])}")
+if alias_stats['unmapped']:
+    print(f"  ℹ {len(alias_stats['unmapped'])} PFF team(s) without a Teams school: {', '.join(alias_stats['unmapped'])}")
+
 # Final commit and close
 conn.commit()
 conn.close()
@@ -2,16 +2,23 @@ import sqlite3
 import os
 import requests
 import json
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 import time
 
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pipeline.opponents import rebuild_team_game_opponents
+from pipeline.db import connect
+
 load_dotenv()
 API_KEY = os.getenv("API_KEY", "xPVVHT3+7AMkH/gk2Rbnpin03CxVlm6HyGgL2yNiPL1riWLPRUQGS5nE1AXEBMmV")
 YEAR = 2025  # Hard-coded year
 
 DB_FILE = Path("/Users/christianberry/Desktop/Perennial Data/perennial-data-app/server/data/db/cfb_database.db")
-conn = sqlite3.connect(DB_FILE)
+conn = connect(DB_FILE)
 cursor = conn.cursor()
 
 print("=" * 80)
@@ -239,6 +246,10 @@ for WEEK in range(1, 2):
     if WEEK < 15:
         time.sleep(1)
 
+# Keep the opponent lookup used by the weekly loaders in step with the games just written
+print(f"\n[OPPONENTS] Rebuilding team-game opponent index...")
+rebuild_team_game_opponents(cursor)
+conn.commit()
 conn.close()
 
 print(f"\n{'='*80}")
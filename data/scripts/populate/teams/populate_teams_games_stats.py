@@ -1,4 +1,3 @@
-import sqlite3
 import os
 import requests
 from pathlib import Path
@@ -6,6 +5,11 @@ from dotenv import load_dotenv
 import sys
 import time
 
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pipeline.db import connect
+
 # Load environment variables
 load_dotenv()
 API_KEY = os.getenv("API_KEY", "xPVVHT3+7AMkH/gk2Rbnpin03CxVlm6HyGgL2yNiPL1riWLPRUQGS5nE1AXEBMmV")
@@ -24,7 +28,7 @@ print("=" * 80)
 print(f"TEAMS GAMES STATS POPULATION - YEAR {year}, WEEKS 1-15")
 print("=" * 80)
 
-conn = sqlite3.connect(DB_FILE)
+conn = connect(DB_FILE)
 cursor = conn.cursor()
 
 # Define all columns, including new advanced stats from both endpoints
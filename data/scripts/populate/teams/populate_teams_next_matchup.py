@@ -4,6 +4,12 @@ import requests
 from pathlib import Path
 from dotenv import load_dotenv
 from datetime import datetime
+import sys
+
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pipeline.db import connect
 
 # Load environment variables
 load_dotenv()
@@ -12,7 +18,7 @@ YEAR = int(os.getenv("YEAR", 2024))
 
 # Database connection
 DB_FILE = Path("/Users/christianberry/Desktop/Perennial Data/perennial-data-app/server/data/db/cfb_database.db")
-conn = sqlite3.connect(DB_FILE)
+conn = connect(DB_FILE)
 cursor = conn.cursor()
 
 # Create Teams_Matchup table with logo columns
@@ -1,10 +1,14 @@
-import sqlite3
 import os
 import requests
 import json
 from pathlib import Path
 import sys
 
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from pipeline.db import connect
+
 # Configuration file path
 CONFIG_FILE = Path("/Users/christianberry/Desktop/Perennial Data/perennial-data-app/data/config/config.json")
 
@@ -23,7 +27,7 @@ except json.JSONDecodeError:
 
 # Database connection
 DB_FILE = Path("/Users/christianberry/Desktop/Perennial Data/perennial-data-app/server/data/db/cfb_database.db")
-conn = sqlite3.connect(DB_FILE)
+conn = connect(DB_FILE)
 cursor = conn.cursor()
 
 # Create Teams_Stats_Season table
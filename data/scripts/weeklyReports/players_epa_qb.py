@@ -1,4 +1,3 @@
-import sqlite3
 import os
 import requests
 from pathlib import Path
@@ -6,6 +5,12 @@ from dotenv import load_dotenv
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 import time
+import sys
+
+# Make the shared pipeline package importable when run as a plain script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from pipeline.db import connect
 
 # Minimum passing snaps threshold
 MIN_PASSING_SNAPS = 50
@@ -16,7 +21,7 @@ API_KEY = os.getenv("API_KEY", "xPVVHT3+7AMkH/gk2Rbnpin03CxVlm6HyGgL2yNiPL1riWLP
 
 # Database connection
 DB_FILE = Path("/Users/christianberry/Desktop/Perennial Data/perennial-data-app/server/data/db/cfb_database.db")
-conn = sqlite3.connect(DB_FILE)
+conn = connect(DB_FILE)
 cursor = conn.cursor()
 
 # Alter Players_PPA_QB table to add teamID column if it doesn't exist
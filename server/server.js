@@ -695,14 +695,17 @@ app.get('/api/player_metadata/:year/:playerId', (req, res) => {
 
 app.get('/api/player_games/:year/:playerId', (req, res) => {
   const { playerId, year } = req.params;
-  db.get('SELECT team FROM Players_Basic WHERE playerId = ? AND year = ?', [playerId, year], (err, row) => {
+  db.get('SELECT team, teamID FROM Players_Basic WHERE playerId = ? AND year = ?', [playerId, year], (err, row) => {
     if (err) {
       res.status(500).send(err.message);
     } else if (!row) {
       res.status(404).send('Player not found');
     } else {
-      const team = row.team.toLowerCase();
-      db.all('SELECT * FROM Teams_Games WHERE LOWER(team) = ? AND season = ?', [team, year], (err, rows) => {
+      // teamID is stamped at ingest; the team-name scan is only for rows loaded before it was
+      const [sql, params] = row.teamID != null
+        ? ['SELECT * FROM Teams_Games WHERE (homeId = ? OR awayId = ?) AND season = ?', [row.teamID, row.teamID, year]]
+        : ['SELECT * FROM Teams_Games WHERE LOWER(team) = ? AND season = ?', [row.team.toLowerCase(), year]];
+      db.all(sql, params, (err, rows) => {
         if (err) {
           res.status(500).send(err.message);
         } else {
@@ -839,6 +842,50 @@ app.get('/api/team_passing_weekly/:teamId/:year/:week/:seasonType', (req, res) =
   });
 });
 
+// Stored distribution of a metric (Metric_Distributions, written by the pipeline's percentile and rating
+// engines): one primary-key read. position is the table suffix (QB, WR, RB_Rushing, ...); year 0 holds the
+// pooled all-season stats behind the ratings. ?rule= picks a qualification rule (default: the percentile rule),
+// ?value= adds that value's percentile (read off the quantile grid) and z-score.
+const QUANTILE_GRID = Array.from({ length: 21 }, (_, i) => i * 5);
+
+const percentileFromGrid = (quantiles, value) => {
+  if (value <= quantiles[0]) return QUANTILE_GRID[0];
+  if (value >= quantiles[quantiles.length - 1]) return QUANTILE_GRID[QUANTILE_GRID.length - 1];
+  const i = quantiles.findIndex(q => q > value);
+  const [low, high] = [quantiles[i - 1], quantiles[i]];
+  return QUANTILE_GRID[i - 1] + (QUANTILE_GRID[i] - QUANTILE_GRID[i - 1]) * (value - low) / (high - low);
+};
+
+app.get('/api/metric_distribution/:position/:metric/:year', (req, res) => {
+  const { position, metric, year } = req.params;
+  const { rule } = req.query;
+  const value = req.query.value !== undefined ? Number(req.query.value) : null;
+  if (value !== null && Number.isNaN(value)) {
+    return res.status(400).send('value must be a number');
+  }
+  db.get(
+    `SELECT rule, count, mean, std, min, max, quantiles FROM Metric_Distributions
+     WHERE position = ? AND metric = ? AND year = ? ${rule ? 'AND rule = ?' : "AND rule LIKE '% > %'"}`,
+    rule ? [position, metric, year, rule] : [position, metric, year],
+    (err, row) => {
+      if (err) {
+        console.error('Database query error:', err.message);
+        res.status(500).send('Internal server error');
+      } else if (!row) {
+        res.status(404).send('No stored distribution for this metric');
+      } else {
+        const distribution = { ...row, quantiles: JSON.parse(row.quantiles) };
+        if (value !== null) {
+          distribution.value = value;
+          distribution.percentile = row.min === row.max ? 50 : percentileFromGrid(distribution.quantiles, value);
+          distribution.z = row.std ? (value - row.mean) / row.std : 0;
+        }
+        res.json(distribution);
+      }
+    }
+  );
+});
+
 app.get('/api/player_percentiles_QB/:playerId/:year', (req, res) => {
   const { playerId, year } = req.params;
   db.get(